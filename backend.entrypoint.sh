@@ -17,6 +17,8 @@ echo "PostgreSQL ist bereit - fahre fort..."
 python manage.py collectstatic --noinput
 python manage.py makemigrations
 python manage.py migrate
+python manage.py backfill_search_vectors
+python manage.py backfill_video_status
 
 # Create a superuser using environment variables
 # (Dein Superuser-Erstellungs-Code bleibt gleich)
@@ -38,6 +40,12 @@ else:
     print(f"Superuser '{username}' already exists.")
 EOF
 
-python manage.py rqworker default &
+# Quick jobs (probing, thumbnails, finalizing) get their own worker, so a long
+# transcode never delays them; TRANSCODE_WORKERS workers share the heavy encodes,
+# small uploads (transcode_high) first.
+python manage.py rqworker high thumbnails default --with-scheduler &
+for worker in $(seq "${TRANSCODE_WORKERS:-1}"); do
+  python manage.py rqworker transcode_high transcode high --with-scheduler &
+done
 
 exec gunicorn core.wsgi:application --bind 0.0.0.0:8000 --reload
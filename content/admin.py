@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.contrib import admin, messages
 from django.core.exceptions import ValidationError
+from .deduplication import assign_hls_key, compute_content_hash
 from .models import Video
+from .storage import get_hls_storage
 
 @admin.register(Video)
 class VideoAdmin(admin.ModelAdmin):
@@ -10,4 +13,7 @@ class VideoAdmin(admin.ModelAdmin):
             raise ValidationError(
                 {"video_file": "Video file is required."}
             )
+        if not change and settings.HLS_DEDUPLICATION and get_hls_storage().supports_links:
+            obj.content_hash = compute_content_hash(obj.video_file)
+            obj.hls_key = assign_hls_key(obj.content_hash)
         super().save_model(request, obj, form, change)
\ No newline at end of file
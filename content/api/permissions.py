@@ -1,5 +1,10 @@
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import BasePermission
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+
+from content.api.signing import verify_segment_signature
+
 
 class CookieJWTAuthentication(JWTAuthentication):
     """
@@ -19,7 +24,58 @@ class CookieJWTAuthentication(JWTAuthentication):
         request.META['HTTP_AUTHORIZATION'] = f'Bearer {access_token}'
 
         return super().authenticate(request)
-    
+
+
+class CookieJWTStatelessAuthentication(CookieJWTAuthentication, JWTStatelessUserAuthentication):
+    """
+    Cookie JWT authentication that trusts the validated access token instead of
+    loading its user from the database, for the segment requests a player sends
+    every few seconds. Like a signed URL, the token stays valid until it expires.
+    """
+
+
+class SignedSegmentUser:
+    """
+    Lightweight authenticated user built from a valid segment signature.
+    Carries only the signing user's id, so no database lookup is needed.
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id):
+        self.id = self.pk = user_id
+
+
+class SignedSegmentAuthentication(BaseAuthentication):
+    """
+    Authentication class for HLS segments requested via signed URLs.
+    Verifies one HMAC over (user, movie_id, resolution, expiry) instead of
+    decoding and validating a JWT on every segment request.
+    """
+    def authenticate(self, request):
+        """
+        Returns `None` if the request carries no signature, so the next
+        authentication class (cookie JWT) is used. Raises AuthenticationFailed
+        if the signature is invalid, expired or scoped to another rendition.
+        """
+        if "sig" not in request.query_params:
+            return None
+
+        kwargs = request.parser_context["kwargs"]
+        user_id = verify_segment_signature(
+            request.query_params,
+            kwargs["movie_id"],
+            kwargs["resolution"],
+        )
+        if user_id is None:
+            raise AuthenticationFailed("Invalid or expired segment signature.")
+
+        return SignedSegmentUser(user_id), None
+
+    def authenticate_header(self, request):
+        return CookieJWTAuthentication().authenticate_header(request)
+
+
 class IsOwner(BasePermission):
     """
     Permission class that grants access only if the requesting user
@@ -0,0 +1,135 @@
+import os
+import re
+import secrets
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from rest_framework import status
+
+
+RANGE_SPEC = re.compile(r"^(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+MAX_RANGES = 16
+
+
+def parse_range_header(header: str, size: int):
+    """
+    Parse an HTTP Range header (RFC 9110) into inclusive (start, end) byte ranges.
+
+    - Returns None if the header is missing, malformed or asks for more than
+      MAX_RANGES ranges (serve the full file, RFC 9110 section 14.2).
+    - Overlapping and adjacent ranges are merged, so no byte is sent twice.
+    - Returns an empty list if no range is satisfiable (answer 416).
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+
+    specs = header[len("bytes="):].split(",")
+    if len(specs) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for spec in specs:
+        match = RANGE_SPEC.match(spec.strip())
+        if not match or match.groups() == ("", ""):
+            return None
+        byte_range = _resolve_range(*match.groups(), size)
+        if byte_range:
+            ranges.append(byte_range)
+    return _merge_ranges(ranges)
+
+
+def _resolve_range(first: str, last: str, size: int):
+    if not first:
+        suffix = int(last)
+        return (max(size - suffix, 0), size - 1) if suffix and size else None
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def _merge_ranges(ranges: list) -> list:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def iter_file_range(path: str, start: int, end: int):
+    """
+    Yield only the bytes start..end (inclusive) of a file in chunks.
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def build_file_response(path: str, content_type: str, range_header: str = None) -> HttpResponse:
+    """
+    Return a file as 200, a single-range 206, a multipart/byteranges 206
+    or a 416 response, depending on the Range header.
+    Raises OSError if the file cannot be opened.
+    """
+    size = os.path.getsize(path)
+    ranges = parse_range_header(range_header, size)
+
+    if ranges is None:
+        response = FileResponse(open(path, "rb"), content_type=content_type, status=status.HTTP_200_OK)
+    elif not ranges:
+        response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        response["Content-Range"] = f"bytes */{size}"
+    elif len(ranges) == 1:
+        response = _single_range_response(path, content_type, size, *ranges[0])
+    else:
+        response = _multi_range_response(path, content_type, size, ranges)
+
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def _single_range_response(path: str, content_type: str, size: int, start: int, end: int):
+    response = StreamingHttpResponse(
+        iter_file_range(path, start, end),
+        content_type=content_type,
+        status=status.HTTP_206_PARTIAL_CONTENT,
+    )
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(end - start + 1)
+    return response
+
+
+def _multi_range_response(path: str, content_type: str, size: int, ranges: list):
+    boundary = secrets.token_hex(16)
+    headers = [
+        (f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+         f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n").encode()
+        for start, end in ranges
+    ]
+    closing = f"\r\n--{boundary}--\r\n".encode()
+    separators = 2 * (len(ranges) - 1)
+    length = sum(len(header) + end - start + 1 for header, (start, end) in zip(headers, ranges))
+
+    response = StreamingHttpResponse(
+        _iter_multipart(path, ranges, headers, closing),
+        content_type=f"multipart/byteranges; boundary={boundary}",
+        status=status.HTTP_206_PARTIAL_CONTENT,
+    )
+    response["Content-Length"] = str(length + separators + len(closing))
+    return response
+
+
+def _iter_multipart(path: str, ranges: list, headers: list, closing: bytes):
+    for index, (header, (start, end)) in enumerate(zip(headers, ranges)):
+        yield (b"\r\n" if index else b"") + header
+        yield from iter_file_range(path, start, end)
+    yield closing
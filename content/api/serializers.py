@@ -1,12 +1,36 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
 from content.models import Video
 
 
+def get_row_value(row, name: str):
+    """
+    Read a field from a model instance or from a .values() dict.
+    """
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def build_thumbnail_urls(thumbnails: list, build_url) -> list:
+    """
+    Turn the stored thumbnail names into URLs, smallest width first:
+    [{'width': 160, 'jpg': url, 'webp': url}, ...].
+    """
+    return [
+        {key: value if key == 'width' else build_url(value) for key, value in thumbnail.items()}
+        for thumbnail in sorted(thumbnails or [], key=lambda thumbnail: thumbnail['width'])
+    ]
+
+
 class VideoListSerializer(serializers.ModelSerializer):
     """
-    Serialize Video objects with standard fields and a fully qualified thumbnail URL.
+    Serialize Video objects with standard fields, a fully qualified thumbnail URL
+    and all generated thumbnail sizes, so clients pick the smallest that fits.
     """
     thumbnail_url = serializers.SerializerMethodField()
+    thumbnails = serializers.SerializerMethodField()
+    model_field_sources = {'thumbnail_url': 'thumbnail'}
 
     class Meta:
         model = Video
@@ -16,10 +40,42 @@ class VideoListSerializer(serializers.ModelSerializer):
             'title',
             'description',
             'thumbnail_url',
+            'thumbnails',
             'category',
             'video_file',
+            'duration',
+            'status',
+            'progress',
         ]
 
+    def __init__(self, *args, **kwargs):
+        """
+        Accept an optional `fields` list to only render a subset of fields.
+        """
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def get_projection(cls, fields_param: str):
+        """
+        Parse a comma-separated `fields` query parameter.
+        Returns (serializer fields, model fields to load with .only()),
+        or (None, None) if no projection was requested.
+        """
+        if not fields_param:
+            return None, None
+
+        fields = [name.strip() for name in fields_param.split(',') if name.strip()]
+        unknown = set(fields) - set(cls.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+
+        model_fields = {cls.model_field_sources.get(name, name) for name in fields}
+        return fields, sorted(model_fields | {'id', 'created_at'})
+
     def get_thumbnail_url(self, obj):
         """
         Return absolute URL of the thumbnail if it exists, otherwise None.
@@ -32,4 +88,76 @@ class VideoListSerializer(serializers.ModelSerializer):
             return None
 
         request = self.context.get('request')
-        return request.build_absolute_uri(url) if request else url
\ No newline at end of file
+        return request.build_absolute_uri(url) if request else url
+
+    def get_thumbnails(self, obj):
+        """
+        Return absolute URLs of every generated thumbnail size and format.
+        """
+        return build_thumbnail_urls(obj.thumbnails, self.build_media_url)
+
+    def build_media_url(self, name: str) -> str:
+        url = default_storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class VideoListValuesSerializer:
+    """
+    Lightweight read-only serializer producing the same output as
+    VideoListSerializer from .values() rows, without model instances or
+    per-field DRF introspection. Builds the absolute media base once per request.
+    """
+    value_fields = [
+        'id',
+        'created_at',
+        'title',
+        'description',
+        'thumbnail',
+        'thumbnails',
+        'category',
+        'video_file',
+        'duration',
+        'status',
+        'progress',
+    ]
+
+    def __init__(self, rows, many=True, fields=None, context=None):
+        self.rows = rows
+        self.fields = fields or VideoListSerializer.Meta.fields
+        request = (context or {}).get('request')
+        self.media_base = request.build_absolute_uri(settings.MEDIA_URL) if request else settings.MEDIA_URL
+
+    @classmethod
+    def get_values(cls, queryset, model_fields: list = None):
+        """
+        Turn a Video queryset into a .values() queryset with the needed columns.
+        """
+        return queryset.values(*(model_fields or cls.value_fields))
+
+    @property
+    def data(self) -> list:
+        converters = [(name, self.get_converter(name)) for name in self.fields]
+        return [
+            {name: convert(row) for name, convert in converters}
+            for row in self.rows
+        ]
+
+    def get_converter(self, name: str):
+        if name == 'created_at':
+            return lambda row: row['created_at'].isoformat()
+        if name == 'thumbnail_url':
+            return lambda row: self.get_media_url(row['thumbnail'])
+        if name == 'thumbnails':
+            return lambda row: build_thumbnail_urls(row['thumbnails'], self.get_media_url)
+        if name == 'video_file':
+            return lambda row: self.get_media_url(row['video_file'])
+        return lambda row: row[name]
+
+    def get_media_url(self, name: str):
+        """
+        Return the absolute URL of a stored file, or None if there is no file.
+        """
+        if not name:
+            return None
+        return self.media_base + filepath_to_uri(name)
@@ -0,0 +1,64 @@
+import time
+from urllib.parse import urlencode
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+
+SEGMENT_SIGNATURE_SALT = "content.api.signing.segment"
+
+
+def sign_segment_scope(user_id: int, movie_id: int, resolution: str, expires: int) -> str:
+    """
+    Return the HMAC signature for (user, movie_id, resolution, expiry).
+    """
+    value = f"{user_id}:{movie_id}:{resolution}:{expires}"
+    return salted_hmac(SEGMENT_SIGNATURE_SALT, value, algorithm="sha256").hexdigest()
+
+
+def get_signature_expiry() -> int:
+    """
+    Return an expiry rounded up to the next HLS_SIGNED_URL_TTL window.
+    The signature (and thus the rewritten manifest) stays stable within a window,
+    while every URL stays valid for at least one full TTL.
+    """
+    ttl = settings.HLS_SIGNED_URL_TTL
+    return (int(time.time()) // ttl + 2) * ttl
+
+
+def verify_segment_signature(params, movie_id: int, resolution: str):
+    """
+    Validate signed segment query parameters (uid, exp, sig).
+    Returns the signing user's id, or None if the signature is invalid or expired.
+    """
+    try:
+        user_id = int(params.get("uid", ""))
+        expires = int(params.get("exp", ""))
+    except ValueError:
+        return None
+
+    if expires < time.time():
+        return None
+
+    expected = sign_segment_scope(user_id, movie_id, resolution, expires)
+    return user_id if constant_time_compare(expected, params.get("sig", "")) else None
+
+
+class SegmentURLSigner:
+    """
+    Rewrite the segment URIs of an HLS media playlist into short-lived,
+    HMAC-signed URLs scoped to one user, video and resolution.
+    """
+    def __init__(self, user_id: int, movie_id: int, resolution: str):
+        expires = get_signature_expiry()
+        self.signature = sign_segment_scope(user_id, movie_id, resolution, expires)
+        self.query = urlencode({"uid": user_id, "exp": expires, "sig": self.signature})
+
+    def rewrite(self, content: bytes) -> bytes:
+        """
+        Append the signed query to every URI line; tags and comments stay unchanged.
+        """
+        lines = content.decode("utf-8").splitlines()
+        return "\n".join(
+            line if not line or line.startswith("#") else f"{line}/?{self.query}"
+            for line in lines
+        ).encode("utf-8") + b"\n"
@@ -1,8 +1,14 @@
 from django.urls import path
-from .views import VideoListView, VideoPlaylistView, HLSVideoSegmentView
+from .views import VideoListView, VideoCategoryListView, VideoSearchView, VideoProgressView, VideoMasterPlaylistView, VideoPlaylistView, HLSVideoSegmentView, TrickplayIndexView, TrickplaySpriteView
 
 urlpatterns = [
     path('video/', VideoListView.as_view(), name='video-list'),
+    path('video/categories/', VideoCategoryListView.as_view(), name='video-category-list'),
+    path('video/search/', VideoSearchView.as_view(), name='video-search'),
+    path('video/<int:movie_id>/progress/', VideoProgressView.as_view(), name='video-progress'),
+    path('video/<int:movie_id>/master.m3u8', VideoMasterPlaylistView.as_view(), name='video-master-playlist'),
+    path('video/<int:movie_id>/trickplay/thumbnails.vtt', TrickplayIndexView.as_view(), name='video-trickplay-index'),
+    path('video/<int:movie_id>/trickplay/<str:sprite>', TrickplaySpriteView.as_view(), name='video-trickplay-sprite'),
     path('video/<int:movie_id>/<str:resolution>/index.m3u8', VideoPlaylistView.as_view(), name='video-playlist'),
     path('video/<int:movie_id>/<str:resolution>/<str:segment>/', HLSVideoSegmentView.as_view(), name='video-segment'),
 ]
\ No newline at end of file
@@ -1,37 +1,267 @@
 import os
-from django.http import FileResponse, HttpResponse, Http404
+import re
+from django.http import HttpResponse, HttpResponseRedirect, Http404
 from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.contrib.postgres.search import SearchRank
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils.encoding import filepath_to_uri
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from content.models import Video
-from content.api.serializers import VideoListSerializer
-from content.api.permissions import CookieJWTAuthentication
+from content.models import Video, MOVIE_CATEGORY, VIDEO_STATUS
+from content.caching import get_catalog_cache_key, get_catalog_version, read_manifest, video_exists
+from content.progress import get_progress
+from content.search import build_search_query
+from content.storage import get_hls_storage
+from content.tasks import HLS_PROFILES, TRICKPLAY_DIR, TRICKPLAY_INDEX, get_progress_labels
+from content.api.pagination import VideoKeysetPagination, VideoSearchPagination
+from content.api.serializers import VideoListSerializer, VideoListValuesSerializer, get_row_value
+from content.api.permissions import (
+    CookieJWTAuthentication,
+    CookieJWTStatelessAuthentication,
+    SignedSegmentAuthentication,
+)
+from content.api.ranges import build_file_response
+from content.api.signing import SegmentURLSigner
 
 
-class VideoListView(APIView):
+MASTER_PLAYLIST_MAX_AGE = 60 * 60
+TRICKPLAY_SPRITE_MAX_AGE = 24 * 60 * 60
+TRICKPLAY_SPRITE_PATTERN = re.compile(r"sprite_\d+\.jpg")
+
+
+def get_status_filter(request):
+    """
+    Return the ?status= filter of a request, or None.
+    Raises ValidationError for an unknown status.
+    """
+    status_filter = request.query_params.get("status")
+    if status_filter and status_filter not in dict(VIDEO_STATUS):
+        raise ValidationError({"status": "Invalid status."})
+    return status_filter
+
+
+def get_video_queryset(status_filter: str = None, model_fields: list = None):
+    """
+    Build the catalog queryset, loading only the projected columns if given.
+    The search vector is never loaded; it is only used for filtering.
+    """
+    videos = Video.objects.defer("search_vector")
+    if status_filter:
+        videos = videos.filter(status=status_filter)
+    if model_fields:
+        videos = videos.only(*model_fields)
+    return videos
+
+
+class CatalogCacheMixin:
+    """
+    Cache the serialized data of a catalog view per catalog version and URL,
+    and revalidate it via ETag. Views implement `build_data(request)`.
+    """
+    def cached_response(self, request) -> Response:
+        """
+        Return the cached data, or 304 if the catalog has not changed
+        since the client's ETag.
+        """
+        url = f"{request.build_absolute_uri()}|{settings.VIDEO_LIST_PAGINATION}"
+        cache_key = get_catalog_cache_key(get_catalog_version(), url)
+        etag = f'"{cache_key.partition(":")[2]}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(self.get_cached_data(cache_key), status=status.HTTP_200_OK)
+
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_cached_data(self, cache_key: str):
+        """
+        Return the serialized data from the cache, building it on a miss.
+        """
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.build_data(self.request)
+            cache.set(cache_key, data, settings.VIDEO_LIST_CACHE_TIMEOUT)
+        return data
+
+    def get_catalog_queryset(self, request, model_fields: list = None):
+        """
+        Build the filtered catalog queryset; with VIDEO_LIST_FAST_SERIALIZER
+        it yields plain .values() rows instead of model instances.
+        """
+        videos = get_video_queryset(get_status_filter(request), model_fields)
+        if settings.VIDEO_LIST_FAST_SERIALIZER:
+            videos = VideoListValuesSerializer.get_values(videos, model_fields)
+        return videos
+
+    def serialize(self, videos, fields: list = None) -> list:
+        serializer_class = VideoListSerializer
+        if settings.VIDEO_LIST_FAST_SERIALIZER:
+            serializer_class = VideoListValuesSerializer
+        return serializer_class(
+            videos,
+            many=True,
+            fields=fields,
+            context={"request": self.request}
+        ).data
+
+
+class VideoListView(CatalogCacheMixin, APIView):
     """
     API view to list all videos for authenticated users.
     Requires JWT cookie authentication.
+    Responses are cached per catalog version and revalidated via ETag.
     """
     permission_classes = [IsAuthenticated]
     authentication_classes = [CookieJWTAuthentication]
 
     def get(self, request):
         """
-        Retrieve all Video instances, serialize them, 
+        Retrieve Video instances, serialize them, 
         and return as a JSON response with status 200.
+
+        - Paginated by cursor (?cursor=, ?page_size=) unless VIDEO_LIST_PAGINATION is off.
+        - Optionally filters by processing status, e.g. ?status=ready.
+        - Optionally projects fields, e.g. ?fields=id,title,thumbnail_url.
+        - Answers 304 if the catalog has not changed since the client's ETag.
         """
-        videos = Video.objects.all()
-        serializer = VideoListSerializer(
-            videos,
-            many=True,
-            context={"request": request}
-        )
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.cached_response(request)
+
+    def build_data(self, request):
+        """
+        Query and serialize the requested list or page of videos.
+        Raises ValidationError for an unknown status or field.
+        """
+        fields, model_fields = VideoListSerializer.get_projection(request.query_params.get("fields"))
+        videos = self.get_catalog_queryset(request, model_fields)
+
+        if not settings.VIDEO_LIST_PAGINATION:
+            return self.serialize(videos, fields)
+
+        paginator = VideoKeysetPagination()
+        page = paginator.paginate_queryset(videos, request, view=self)
+        return paginator.get_paginated_response(self.serialize(page, fields)).data
+
+
+class VideoCategoryListView(CatalogCacheMixin, APIView):
+    """
+    API view returning the home screen rows: the newest videos per category.
+    Built with a single windowed query and cached per catalog version.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CookieJWTAuthentication]
+    default_limit = 10
+    max_limit = 50
+
+    def get(self, request):
+        """
+        Return one row per non-empty category with its newest ?limit= videos.
+        Supports the same ?status= and ?fields= parameters as the video list.
+        """
+        return self.cached_response(request)
+
+    def build_data(self, request) -> list:
+        """
+        Rank videos per category with ROW_NUMBER() and group them in MOVIE_CATEGORY order.
+        """
+        fields, model_fields = VideoListSerializer.get_projection(request.query_params.get("fields"))
+        if model_fields:
+            model_fields.append("category")
+        videos = self.get_catalog_queryset(request, model_fields).annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=[F("category")],
+                order_by=[F("created_at").desc(), F("id").desc()],
+            )
+        ).filter(row_number__lte=self.get_limit(request)).order_by("category", "row_number")
+        return self.build_rows(videos, fields)
+
+    def build_rows(self, videos, fields: list = None) -> list:
+        rows = {}
+        for video in videos:
+            rows.setdefault(get_row_value(video, "category"), []).append(video)
+        return [
+            {"category": key, "label": label, "videos": self.serialize(rows[key], fields)}
+            for key, label in MOVIE_CATEGORY if key in rows
+        ]
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+
+class VideoSearchView(CatalogCacheMixin, APIView):
+    """
+    API view for full-text search over video titles and descriptions.
+    Backed by a GIN-indexed PostgreSQL search vector and cached per catalog version.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CookieJWTAuthentication]
+
+    def get(self, request):
+        """
+        Return the videos matching ?q=, best match first.
+
+        - Every word is matched as a prefix, so partial input works for type-ahead.
+        - Title matches rank above description matches.
+        - Paginated by ?offset= and ?page_size=; supports ?status= and ?fields=.
+        """
+        return self.cached_response(request)
+
+    def build_data(self, request):
+        """
+        Query, rank and serialize one page of search results.
+        Raises ValidationError if ?q= contains no searchable words.
+        """
+        query = build_search_query(request.query_params.get("q"))
+        if query is None:
+            raise ValidationError({"q": "A search term is required."})
+
+        fields, model_fields = VideoListSerializer.get_projection(request.query_params.get("fields"))
+        videos = self.get_catalog_queryset(request, model_fields).filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        ).order_by("-rank", "-created_at", "-id")
+
+        paginator = VideoSearchPagination()
+        page = paginator.paginate_queryset(videos, request, view=self)
+        return paginator.get_paginated_response(self.serialize(page, fields)).data
+
+
+class VideoProgressView(APIView):
+    """
+    Lightweight polling endpoint for the processing state of a video.
+    Combines the stored status with the live ffmpeg progress from the cache.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CookieJWTAuthentication]
+
+    def get(self, request, movie_id: int):
+        """
+        Return status, stored progress and the live progress of every
+        running encoding job. Raises Http404 if the video does not exist.
+        """
+        fields = ("id", "status", "progress", "renditions", "duration")
+        video = Video.objects.filter(id=movie_id).values(*fields).first()
+        if video is None:
+            raise Http404("Video not found")
+
+        labels = get_progress_labels(video.pop("renditions") or HLS_PROFILES, video.pop("duration"))
+        video["jobs"] = get_progress(movie_id, labels)
+        return Response(video, status=status.HTTP_200_OK)
 
 
 class BaseHLSVideoView(APIView):
@@ -42,31 +272,76 @@ class BaseHLSVideoView(APIView):
     permission_classes = [IsAuthenticated]
     authentication_classes = [CookieJWTAuthentication]
 
-    def get_video_or_404(self, movie_id: int) -> Video:
+    def ensure_video_exists(self, movie_id: int) -> None:
         """
-        Retrieve a Video by ID, or raise Http404 if not found.
+        Raise Http404 if no Video with this ID exists.
+        Uses the cached existence check, so no database query in the steady state.
         """
-        try:
-            return Video.objects.get(id=movie_id)
-        except Video.DoesNotExist:
+        if not video_exists(movie_id):
             raise Http404("Video not found")
 
     def build_video_path(self, movie_id: int, resolution: str, filename: str) -> str:
         """
-        Construct the absolute path to a video file.
+        Construct the absolute path to a video file of the local HLS storage.
         Raises Http404 if the file does not exist.
         """
-        path = os.path.join(
-            settings.MEDIA_ROOT,
-            "videos",
-            str(movie_id),
-            resolution,
-            filename,
-        )
-        if not os.path.exists(path):
+        name, _ = self.stat_video_file(movie_id, resolution, filename)
+        return get_hls_storage().local_path(movie_id, name)
+
+    def stat_video_file(self, movie_id: int, resolution: str, filename: str) -> tuple:
+        """
+        Construct the storage name of a video file (<resolution>/<filename>)
+        and stat it in the HLS storage in one call.
+        Raises Http404 if the file does not exist.
+        """
+        name = f"{resolution}/{filename}" if resolution else filename
+        try:
+            return name, get_hls_storage().stat(movie_id, name)
+        except OSError:
             raise Http404("File not found")
-        return path
-    
+
+    def build_redirect_response(self, movie_id: int, resolution: str, filename: str) -> HttpResponse:
+        """
+        Redirect to a short-lived URL of a remote HLS storage (e.g. a presigned S3 URL),
+        so segment bytes never pass through the workers.
+        """
+        url = get_hls_storage().url(movie_id, f"{resolution}/{filename}")
+        response = HttpResponseRedirect(url)
+        patch_cache_control(response, private=True, no_store=True)
+        return response
+
+    def build_manifest_response(self, request, movie_id: int, resolution: str, filename: str, signer=None,
+                                content_type: str = "application/vnd.apple.mpegurl") -> HttpResponse:
+        """
+        Return an HLS playlist (or another small text index) with ETag and Last-Modified validators.
+        Answers 304 if the client's copy is current, otherwise serves
+        the cached manifest bytes, optionally with signed segment URLs.
+        Raises Http404 if the file cannot be read.
+        """
+        name, stat = self.stat_video_file(movie_id, resolution, filename)
+        signature = f"-{signer.signature[:16]}" if signer else ""
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{signature}"'
+        last_modified = int(stat.st_mtime)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            content = self._read_manifest(name, movie_id, resolution, stat.st_mtime_ns)
+            response = HttpResponse(
+                signer.rewrite(content) if signer else content,
+                content_type=content_type,
+                status=status.HTTP_200_OK,
+            )
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def _read_manifest(self, name: str, movie_id: int, resolution: str, mtime_ns: int) -> bytes:
+        try:
+            return read_manifest(name, movie_id, resolution, mtime_ns)
+        except OSError:
+            raise Http404("Error reading manifest file")
+
 
 class VideoPlaylistView(BaseHLSVideoView):
     """
@@ -76,50 +351,153 @@ class VideoPlaylistView(BaseHLSVideoView):
     def get(self, request, movie_id: int, resolution: str) -> HttpResponse:
         """
         Retrieve and return the HLS playlist file for the requested video.
+        Clients revalidate via ETag/Last-Modified and receive 304 if unchanged.
+        With HLS_SIGNED_SEGMENTS the segment URIs are rewritten to signed URLs.
         Raises Http404 if the video or file is not found or cannot be read.
         """
-        self.get_video_or_404(movie_id)
+        self.ensure_video_exists(movie_id)
+
+        signer = None
+        if settings.HLS_SIGNED_SEGMENTS:
+            signer = SegmentURLSigner(request.user.pk, movie_id, resolution)
 
-        manifest_path = self.build_video_path(
+        response = self.build_manifest_response(
+            request,
             movie_id=movie_id,
             resolution=resolution,
             filename="index.m3u8",
+            signer=signer,
         )
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class VideoMasterPlaylistView(BaseHLSVideoView):
+    """
+    Serve the HLS master playlist (master.m3u8) listing all resolutions of a video.
+    Lets players switch bitrate adaptively instead of picking a fixed resolution.
+    """
+    def get(self, request, movie_id: int) -> HttpResponse:
+        """
+        Retrieve and return the master playlist with private caching headers.
+        Raises Http404 if the video or file is not found or cannot be read.
+        """
+        self.ensure_video_exists(movie_id)
+
+        response = self.build_manifest_response(
+            request,
+            movie_id=movie_id,
+            resolution="",
+            filename="master.m3u8",
+        )
+        patch_cache_control(response, private=True, max_age=MASTER_PLAYLIST_MAX_AGE)
+        return response
 
-        try:
-            with open(manifest_path, "r", encoding="utf-8") as file:
-                return HttpResponse(
-                    file.read(),
-                    content_type="application/vnd.apple.mpegurl",
-                    status=status.HTTP_200_OK,
-                )
-        except OSError:
-            raise Http404("Error reading manifest file")
-        
 
 class HLSVideoSegmentView(BaseHLSVideoView):
     """
     Serve individual HLS video segments (.ts) for authenticated users.
     Inherits authentication and file lookup from BaseHLSVideoView.
+    Supports single and multi-range requests (206 Partial Content).
+    With HLS_SEGMENT_OFFLOAD the bytes are sent by the front proxy instead;
+    a remote HLS storage is redirected to.
+    Signed segment URLs are checked before falling back to the JWT cookie,
+    whose user is taken from the token without a database lookup.
     """
-    def get(self, request, movie_id: int, resolution: str, segment: str) -> FileResponse:
+    authentication_classes = [SignedSegmentAuthentication, CookieJWTStatelessAuthentication]
+
+    def get(self, request, movie_id: int, resolution: str, segment: str) -> HttpResponse:
         """
         Retrieve and return a specific video segment for HLS streaming.
         Raises Http404 if the video or segment file is not found or cannot be read.
         """
-        self.get_video_or_404(movie_id)
+        self.ensure_video_exists(movie_id)
+        if not get_hls_storage().is_local:
+            return self.build_redirect_response(movie_id, resolution, segment)
 
         segment_path = self.build_video_path(
             movie_id=movie_id,
             resolution=resolution,
             filename=segment,
         )
+        return self.build_segment_response(segment_path, request.headers.get("Range"))
+
+    def build_segment_response(self, segment_path: str, range_header: str = None) -> HttpResponse:
+        """
+        Return the segment via the configured offload mode, falling back
+        to streaming it (or only the requested byte ranges) through the worker.
+        """
+        if settings.HLS_SEGMENT_OFFLOAD:
+            return self.build_offload_response(segment_path)
 
         try:
-            return FileResponse(
-                open(segment_path, "rb"),
-                content_type="video/MP2T",
-                status=status.HTTP_200_OK,
-            )
+            return build_file_response(segment_path, "video/MP2T", range_header)
+        except OSError:
+            raise Http404("Error reading segment file")
+
+    def build_offload_response(self, segment_path: str) -> HttpResponse:
+        """
+        Return an empty response that tells the front proxy which file to send.
+
+        - 'nginx': X-Accel-Redirect to the internal location HLS_ACCEL_REDIRECT_PREFIX.
+        - 'sendfile': X-Sendfile with the absolute path (Apache, lighttpd, Caddy).
+        """
+        response = HttpResponse(content_type="video/MP2T", status=status.HTTP_200_OK)
+        mode = settings.HLS_SEGMENT_OFFLOAD
+        if mode == "nginx":
+            relative_path = os.path.relpath(segment_path, settings.MEDIA_ROOT)
+            prefix = settings.HLS_ACCEL_REDIRECT_PREFIX.rstrip("/")
+            response["X-Accel-Redirect"] = f"{prefix}/{filepath_to_uri(relative_path)}"
+        elif mode == "sendfile":
+            response["X-Sendfile"] = segment_path
+        else:
+            raise ImproperlyConfigured(f"Unknown HLS_SEGMENT_OFFLOAD mode: {mode}")
+        return response
+
+
+class TrickplayIndexView(BaseHLSVideoView):
+    """
+    Serve the WebVTT index (thumbnails.vtt) of the scrub-bar preview sprites.
+    Each cue maps a time range to a tile: sprite_<n>.jpg#xywh=x,y,w,h.
+    """
+    def get(self, request, movie_id: int) -> HttpResponse:
+        """
+        Retrieve and return the trickplay index; revalidated via ETag/Last-Modified.
+        Raises Http404 if the video or index is not found or cannot be read.
+        """
+        self.ensure_video_exists(movie_id)
+
+        response = self.build_manifest_response(
+            request,
+            movie_id=movie_id,
+            resolution=TRICKPLAY_DIR,
+            filename=TRICKPLAY_INDEX,
+            content_type="text/vtt",
+        )
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class TrickplaySpriteView(BaseHLSVideoView):
+    """
+    Serve the JPEG sprite sheets referenced by the trickplay index.
+    Sprites never change once written, so clients may cache them.
+    """
+    def get(self, request, movie_id: int, sprite: str) -> HttpResponse:
+        """
+        Retrieve and return one sprite sheet (sprite_<n>.jpg).
+        Raises Http404 for other file names or if the sprite is not found.
+        """
+        self.ensure_video_exists(movie_id)
+        if not TRICKPLAY_SPRITE_PATTERN.fullmatch(sprite):
+            raise Http404("File not found")
+        if not get_hls_storage().is_local:
+            return self.build_redirect_response(movie_id, TRICKPLAY_DIR, sprite)
+
+        sprite_path = self.build_video_path(movie_id, TRICKPLAY_DIR, sprite)
+        try:
+            response = build_file_response(sprite_path, "image/jpeg", request.headers.get("Range"))
         except OSError:
-            raise Http404("Error reading segment file")
\ No newline at end of file
+            raise Http404("Error reading sprite file")
+        patch_cache_control(response, private=True, max_age=TRICKPLAY_SPRITE_MAX_AGE)
+        return response
@@ -0,0 +1,188 @@
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from django.conf import settings
+from django.core.cache import cache
+
+from content.models import Video
+from content.storage import get_hls_storage
+
+
+class LRUCache:
+    """
+    Small thread-safe, size-bounded in-process cache with least-recently-used eviction.
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, predicate) -> None:
+        """
+        Remove every entry whose key matches the predicate.
+        """
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+
+class TTLSet:
+    """
+    Thread-safe in-process set whose members expire after a fixed time-to-live.
+    """
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._expires = {}
+        self._lock = Lock()
+
+    def __contains__(self, member) -> bool:
+        with self._lock:
+            expires = self._expires.get(member)
+            if expires is None or expires < time.monotonic():
+                self._expires.pop(member, None)
+                return False
+            return True
+
+    def add(self, member) -> None:
+        with self._lock:
+            self._expires[member] = time.monotonic() + self.ttl
+
+    def discard(self, member) -> None:
+        with self._lock:
+            self._expires.pop(member, None)
+
+
+manifest_cache = LRUCache(settings.HLS_MANIFEST_CACHE_SIZE)
+existing_videos = TTLSet(settings.VIDEO_EXISTS_LOCAL_TTL)
+
+
+def get_manifest_cache_key(movie_id: int, resolution: str) -> str:
+    """
+    Return the Redis key of a manifest; the master playlist has no resolution.
+    """
+    return f"hls-manifest:{movie_id}:{resolution or 'master'}"
+
+
+def read_manifest(name: str, movie_id: int, resolution: str, mtime_ns: int) -> bytes:
+    """
+    Return the manifest bytes for (movie_id, resolution, mtime).
+
+    - Looks up the in-process LRU first, then Redis, then reads the file
+      videos/<movie_id>/<name> from the HLS storage.
+    - A changed mtime automatically bypasses stale entries.
+    """
+    local_key = (movie_id, resolution, mtime_ns)
+    content = manifest_cache.get(local_key)
+    if content is None:
+        content = _read_shared_manifest(name, movie_id, resolution, mtime_ns)
+        manifest_cache.set(local_key, content)
+    return content
+
+
+def _read_shared_manifest(name: str, movie_id: int, resolution: str, mtime_ns: int) -> bytes:
+    cache_key = get_manifest_cache_key(movie_id, resolution)
+    cached = cache.get(cache_key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    with get_hls_storage().open(movie_id, name) as file:
+        content = file.read()
+    cache.set(cache_key, (mtime_ns, content), settings.HLS_MANIFEST_CACHE_TIMEOUT)
+    return content
+
+
+def invalidate_manifests(movie_id: int, resolutions: list) -> None:
+    """
+    Drop all cached manifests of a video from Redis and the local LRU.
+    """
+    cache.delete_many([
+        get_manifest_cache_key(movie_id, resolution)
+        for resolution in ["", *resolutions]
+    ])
+    manifest_cache.discard(lambda key: key[0] == movie_id)
+
+
+def get_video_exists_cache_key(movie_id: int) -> str:
+    return f"video-exists:{movie_id}"
+
+
+def video_exists(movie_id: int) -> bool:
+    """
+    Check whether a video exists without a database query in the steady state.
+
+    - Looks up the process-local TTL set first, then Redis, then the database.
+    - Redis entries are kept current by the Video post_save/post_delete receivers.
+    """
+    if movie_id in existing_videos:
+        return True
+
+    cache_key = get_video_exists_cache_key(movie_id)
+    exists = cache.get(cache_key)
+    if exists is None:
+        exists = Video.objects.filter(id=movie_id).exists()
+        cache.set(cache_key, exists, settings.VIDEO_EXISTS_CACHE_TIMEOUT)
+
+    if exists:
+        existing_videos.add(movie_id)
+    return exists
+
+
+def mark_video_exists(movie_id: int) -> None:
+    cache.set(get_video_exists_cache_key(movie_id), True, settings.VIDEO_EXISTS_CACHE_TIMEOUT)
+
+
+def forget_video(movie_id: int) -> None:
+    """
+    Mark a deleted video as missing in Redis and drop it from the local set.
+    Other processes stop serving it at the latest after VIDEO_EXISTS_LOCAL_TTL.
+    """
+    cache.set(get_video_exists_cache_key(movie_id), False, settings.VIDEO_EXISTS_CACHE_TIMEOUT)
+    existing_videos.discard(movie_id)
+
+
+CATALOG_VERSION_KEY = "catalog-version"
+
+
+def get_catalog_version() -> int:
+    """
+    Return the current catalog version shared by all workers and nodes.
+    Starts at the current timestamp, so a lost key never reuses an old version.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, int(time.time()), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version() -> None:
+    """
+    Invalidate every cached catalog response at once by moving to a new version.
+    """
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, int(time.time()), None)
+
+
+def get_catalog_cache_key(version: int, url: str) -> str:
+    """
+    Return the cache key of a catalog response for a version and request URL.
+    """
+    digest = hashlib.sha256(url.encode()).hexdigest()[:32]
+    return f"catalog:{version}:{digest}"
@@ -0,0 +1,99 @@
+import re
+from django.conf import settings
+from django.core.checks import Error, register
+
+X264_PRESETS = (
+    'ultrafast', 'superfast', 'veryfast', 'faster', 'fast',
+    'medium', 'slow', 'slower', 'veryslow', 'placebo',
+)
+LADDER_KEYS = ('resolution', 'width', 'height', 'bitrate', 'codecs')
+RESOLUTION_PATTERN = re.compile(r'^\d+p$')
+BITRATE_PATTERN = re.compile(r'^\d+[kM]?$')
+
+
+@register()
+def check_hls_ladder(app_configs, **kwargs):
+    """
+    Validate VIDEOFLIX_HLS_LADDER at startup instead of failing inside an ffmpeg job.
+    """
+    ladder = settings.VIDEOFLIX_HLS_LADDER
+    if not isinstance(ladder, list) or not ladder:
+        return [Error('VIDEOFLIX_HLS_LADDER must be a non-empty list of profiles.', id='content.E001')]
+    errors = [error for index, profile in enumerate(ladder) for error in check_profile(index, profile)]
+    if errors:
+        return errors
+    return check_ladder_order(ladder)
+
+
+def check_profile(index: int, profile) -> list:
+    """
+    Validate a single ladder entry: required keys, sizes, bitrate and encoder overrides.
+    """
+    if not isinstance(profile, dict) or any(key not in profile for key in LADDER_KEYS):
+        return [Error(f'VIDEOFLIX_HLS_LADDER[{index}] needs the keys {", ".join(LADDER_KEYS)}.', id='content.E002')]
+    errors = []
+    if not RESOLUTION_PATTERN.match(str(profile['resolution'])):
+        errors.append(Error(f'VIDEOFLIX_HLS_LADDER[{index}] resolution must look like "720p".', id='content.E003'))
+    if not all(is_even_size(profile[key]) for key in ('width', 'height')):
+        errors.append(Error(f'VIDEOFLIX_HLS_LADDER[{index}] width and height must be positive even integers.', id='content.E004'))
+    if not BITRATE_PATTERN.match(str(profile['bitrate'])):
+        errors.append(Error(f'VIDEOFLIX_HLS_LADDER[{index}] bitrate must look like "2500k".', id='content.E005'))
+    return errors + check_encoder_options(profile, f'VIDEOFLIX_HLS_LADDER[{index}]')
+
+
+def check_ladder_order(ladder: list) -> list:
+    """
+    The ladder is used smallest first (build_ladder, thumbnails), so heights must ascend
+    and resolutions, which are directory names, must be unique.
+    """
+    resolutions = [profile['resolution'] for profile in ladder]
+    heights = [profile['height'] for profile in ladder]
+    errors = []
+    if len(set(resolutions)) != len(resolutions):
+        errors.append(Error('VIDEOFLIX_HLS_LADDER resolutions must be unique.', id='content.E006'))
+    if heights != sorted(set(heights)):
+        errors.append(Error('VIDEOFLIX_HLS_LADDER must be ordered by ascending height.', id='content.E007'))
+    return errors
+
+
+@register()
+def check_hls_encoder(app_configs, **kwargs):
+    """
+    Validate VIDEOFLIX_HLS_ENCODER, including the segment duration used for GOP alignment,
+    which chunks of the chunked mode must start on.
+    """
+    encoder = settings.VIDEOFLIX_HLS_ENCODER
+    errors = check_encoder_options(encoder, 'VIDEOFLIX_HLS_ENCODER')
+    duration = encoder.get('segment_duration')
+    if not isinstance(duration, int) or isinstance(duration, bool) or duration <= 0:
+        errors.append(Error('VIDEOFLIX_HLS_ENCODER segment_duration must be a positive integer.', id='content.E008'))
+    elif settings.HLS_CHUNK_DURATION <= 0 or settings.HLS_CHUNK_DURATION % duration:
+        errors.append(Error('HLS_CHUNK_DURATION must be a multiple of the segment duration.', id='content.E012'))
+    return errors
+
+
+def check_encoder_options(options: dict, name: str) -> list:
+    """
+    Validate the encoder options that may appear globally or as per-profile overrides.
+    """
+    errors = []
+    if 'preset' in options and options['preset'] not in X264_PRESETS:
+        errors.append(Error(f'{name} preset must be one of {", ".join(X264_PRESETS)}.', id='content.E009'))
+    if options.get('crf') is not None and not is_int_between(options['crf'], 0, 51):
+        errors.append(Error(f'{name} crf must be an integer between 0 and 51, or None.', id='content.E010'))
+    for key in ('maxrate_factor', 'bufsize_factor'):
+        if key in options and not is_factor(options[key]):
+            errors.append(Error(f'{name} {key} must be a number of at least 1.', id='content.E011'))
+    return errors
+
+
+def is_even_size(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0 and value % 2 == 0
+
+
+def is_int_between(value, low: int, high: int) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and low <= value <= high
+
+
+def is_factor(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 1
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import shutil
+import uuid
+from django.conf import settings
+
+from content.caching import bump_catalog_version
+from content.models import Video
+from content.storage import get_hls_storage
+from content.tasks import delete_origin_video_file, get_video_root, save_thumbnails
+
+OBJECTS_DIR = 'objects'
+HASH_CHUNK_SIZE = 1024 * 1024
+REUSED_FIELDS = (
+    'duration', 'width', 'height', 'fps', 'video_codec', 'video_bitrate', 'audio_codec',
+    'renditions', 'completed_renditions', 'renditions_done',
+)
+
+
+def compute_content_hash(file) -> str:
+    """
+    Return the SHA-256 hex digest of an uploaded file.
+    The file is read in chunks, so large uploads are never held in memory.
+    """
+    digest = hashlib.sha256()
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_object_root(hls_key: str) -> str:
+    """
+    Return the content-addressed HLS directory: MEDIA_ROOT/videos/objects/<hls_key>.
+    """
+    return os.path.join(settings.MEDIA_ROOT, 'videos', OBJECTS_DIR, hls_key)
+
+
+def assign_hls_key(content_hash: str) -> str:
+    """
+    Pick the HLS storage key of a new upload.
+
+    - Uploads share the key of their content hash, so a ready video's output can be reused.
+    - While an upload of the same content is still processing (or failed),
+      the new one gets a key of its own, so two pipelines never write into one tree.
+    """
+    if Video.objects.filter(hls_key=content_hash).exclude(status='ready').exists():
+        return f'{content_hash}-{uuid.uuid4().hex[:8]}'
+    return content_hash
+
+
+def link_hls_root(video_id: int, hls_key: str) -> None:
+    """
+    Point MEDIA_ROOT/videos/<video_id> at videos/objects/<hls_key>.
+    The link is relative, so the views, nginx offloading and the encoding
+    jobs keep using the per-video path.
+    """
+    os.makedirs(get_object_root(hls_key), exist_ok=True)
+    link = get_video_root(video_id)
+    if not os.path.lexists(link):
+        os.symlink(os.path.join(OBJECTS_DIR, hls_key), link)
+
+
+def find_ready_original(video):
+    """
+    Return a ready video whose HLS output the given video can share, or None.
+    """
+    if not video.hls_key:
+        return None
+    return Video.objects.filter(hls_key=video.hls_key, status='ready').exclude(id=video.id).first()
+
+
+def reuse_hls_output(video, original) -> None:
+    """
+    Serve a duplicate upload from the original's HLS output instead of encoding it.
+
+    - Links the HLS directory and the generated thumbnails of the original.
+    - Copies the probed metadata and marks the video as ready.
+    - Deletes the duplicate upload, as finalize_hls does after encoding.
+    """
+    link_hls_root(video.id, video.hls_key)
+    link_thumbnails(original.id, video.id)
+    metadata = {field: getattr(original, field) for field in REUSED_FIELDS}
+    Video.objects.filter(id=video.id).update(status='ready', progress=100, **metadata)
+    save_thumbnails(video.id)
+    delete_origin_video_file(video.video_file.path)
+    bump_catalog_version()
+
+
+def link_thumbnails(source_id: int, target_id: int) -> None:
+    """
+    Hard-link the generated thumbnails of one video into the thumbnail directory of another.
+    """
+    source = os.path.join(settings.MEDIA_ROOT, 'thumbnail', str(source_id))
+    if os.path.isdir(source):
+        target = os.path.join(settings.MEDIA_ROOT, 'thumbnail', str(target_id))
+        shutil.copytree(source, target, copy_function=os.link, dirs_exist_ok=True)
+
+
+def release_hls_root(video) -> None:
+    """
+    Remove the HLS output of a deleted video.
+
+    - Deletes the video's tree from the HLS storage; with a remote storage the
+      local scratch directory MEDIA_ROOT/videos/<id> is removed as well.
+    - Content-addressed videos only drop their link; the shared directory
+      is removed together with its last reference.
+    """
+    storage = get_hls_storage()
+    storage.delete_tree(video.id)
+    if not storage.is_local:
+        shutil.rmtree(get_video_root(video.id), ignore_errors=True)
+    if video.hls_key and not Video.objects.filter(hls_key=video.hls_key).exclude(id=video.id).exists():
+        shutil.rmtree(get_object_root(video.hls_key), ignore_errors=True)
@@ -0,0 +1,35 @@
+import os
+import subprocess
+
+
+def create_clip(work_dir: str, duration: int) -> str:
+    """
+    Render a synthetic 1080p clip with a test pattern and a sine tone
+    into the work directory and return its path.
+    """
+    path = os.path.join(work_dir, 'source.mp4')
+    subprocess.run([
+        'ffmpeg', '-v', 'error',
+        '-f', 'lavfi', '-i', f'testsrc2=size=1920x1080:rate=30:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:duration={duration}',
+        '-c:v', 'libx264', '-c:a', 'aac', '-shortest', path,
+    ], check=True)
+    return path
+
+
+def list_output_files(root: str) -> list:
+    """
+    Return the paths of all files below an output directory, relative to it and sorted.
+    """
+    return sorted(
+        os.path.relpath(os.path.join(path, name), root)
+        for path, _, files in os.walk(root)
+        for name in files
+    )
+
+
+def get_output_size(root: str) -> int:
+    """
+    Return the total size in bytes of all files below an output directory.
+    """
+    return sum(os.path.getsize(os.path.join(root, name)) for name in list_output_files(root))
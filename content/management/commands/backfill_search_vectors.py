@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from content.caching import bump_catalog_version
+from content.search import backfill_search_vectors
+
+
+class Command(BaseCommand):
+    """
+    Fill the full-text search document of videos that were written without
+    the post_save signal, so they become searchable. Runs at every deploy.
+    """
+    help = "Compute the search document of videos that have none."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help="Recompute every search document, e.g. after changing VIDEO_SEARCH_CONFIG.",
+        )
+
+    def handle(self, *args, **options):
+        count = backfill_search_vectors(options['rebuild'])
+        if count:
+            bump_catalog_version()
+        self.stdout.write(f"{count} search document(s) updated.")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from content.caching import bump_catalog_version
+from content.tasks import backfill_encoded_videos
+
+
+class Command(BaseCommand):
+    """
+    Mark videos that were encoded before processing states existed as ready,
+    with their renditions filled in from the HLS output. Runs at every deploy.
+    """
+    help = "Mark already encoded videos without a processing state as ready."
+
+    def handle(self, *args, **options):
+        count = backfill_encoded_videos()
+        if count:
+            bump_catalog_version()
+        self.stdout.write(f"{count} video(s) marked as ready.")
@@ -0,0 +1,67 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from content.management.benchmark import create_clip, get_output_size
+from content.tasks import HLS_PROFILES, build_hls_command
+
+
+class Command(BaseCommand):
+    """
+    Encode the HLS ladder with several x264 presets (and optionally CRF values)
+    and report encoding speed against the size of the output.
+    """
+    help = "Benchmark encoder presets by encoding speed and HLS output size."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--input', help="Source video (default: synthetic 1080p clip).")
+        parser.add_argument('--duration', type=int, default=20, help="Length of the synthetic clip in seconds.")
+        parser.add_argument('--presets', default='ultrafast,veryfast,medium', help="Comma-separated x264 presets.")
+        parser.add_argument('--crf', default='', help="Comma-separated CRF values (default: capped VBR only).")
+
+    def handle(self, *args, **options):
+        work_dir = tempfile.mkdtemp(prefix='preset-benchmark-')
+        try:
+            source = options['input'] or create_clip(work_dir, options['duration'])
+            duration = self._probe_duration(source)
+            self.stdout.write(f"{'preset':<10} {'crf':>4} {'time':>8} {'speed':>7} {'size':>10}")
+            for preset, crf in self._variants(options):
+                elapsed, size = self._run(source, work_dir, preset, crf)
+                self._report(preset, crf, elapsed, duration / elapsed, size)
+        finally:
+            shutil.rmtree(work_dir)
+
+    def _variants(self, options):
+        presets = [preset.strip() for preset in options['presets'].split(',') if preset.strip()]
+        crfs = [None] + [int(crf) for crf in options['crf'].split(',') if crf.strip()]
+        return [(preset, crf) for preset in presets for crf in crfs]
+
+    def _probe_duration(self, source):
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', source],
+            check=True, capture_output=True, text=True,
+        )
+        return float(result.stdout.strip())
+
+    def _run(self, source, work_dir, preset, crf):
+        """
+        Encode the full ladder with one preset/CRF variant; returns (seconds, bytes).
+        """
+        root = os.path.join(work_dir, f'{preset}-{crf}')
+        for profile in HLS_PROFILES:
+            os.makedirs(os.path.join(root, profile['resolution']))
+        encoder = {**settings.VIDEOFLIX_HLS_ENCODER, 'preset': preset, 'crf': crf}
+        with override_settings(VIDEOFLIX_HLS_ENCODER=encoder):
+            cmd = build_hls_command(source, root, HLS_PROFILES, True)
+        started = time.perf_counter()
+        subprocess.run([cmd[0], '-v', 'error', *cmd[1:]], check=True)
+        return time.perf_counter() - started, get_output_size(root)
+
+    def _report(self, preset, crf, elapsed, speed, size):
+        crf = '-' if crf is None else crf
+        self.stdout.write(f"{preset:<10} {crf:>4} {elapsed:>7.2f}s {speed:>6.2f}x {size / 1e6:>8.2f}MB")
@@ -0,0 +1,71 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+
+from content.management.benchmark import create_clip, list_output_files
+from content.tasks import HLS_PROFILES, AUDIO_BITRATE, build_hls_command
+
+
+class Command(BaseCommand):
+    """
+    Compare the wall time of the former per-profile ffmpeg loop
+    with the single-pass multi-rendition HLS encoding.
+    """
+    help = "Benchmark per-profile HLS encoding against single-pass encoding."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--input', help="Source video (default: synthetic 1080p clip).")
+        parser.add_argument('--duration', type=int, default=20, help="Length of the synthetic clip in seconds.")
+
+    def handle(self, *args, **options):
+        work_dir = tempfile.mkdtemp(prefix='hls-benchmark-')
+        try:
+            source = options['input'] or create_clip(work_dir, options['duration'])
+            loop_root, single_root = self._prepare_roots(work_dir)
+            loop_time = self._measure(self._legacy_commands(source, loop_root))
+            single_time = self._measure([build_hls_command(source, single_root, HLS_PROFILES, True)])
+            self._report(loop_time, single_time, loop_root, single_root)
+        finally:
+            shutil.rmtree(work_dir)
+
+    def _prepare_roots(self, work_dir):
+        roots = [os.path.join(work_dir, 'loop'), os.path.join(work_dir, 'single')]
+        for root in roots:
+            for profile in HLS_PROFILES:
+                os.makedirs(os.path.join(root, profile['resolution']))
+        return roots
+
+    def _legacy_commands(self, source, video_root):
+        """
+        Rebuild the previous behaviour: one full decode and encode per profile.
+        """
+        return [[
+            'ffmpeg',
+            '-i', source,
+            '-vf', f"scale={profile['width']}:{profile['height']}",
+            '-c:v', 'libx264',
+            '-b:v', profile['bitrate'],
+            '-c:a', 'aac',
+            '-b:a', AUDIO_BITRATE,
+            '-start_number', '0',
+            '-hls_time', '5',
+            '-hls_list_size', '0',
+            '-f', 'hls',
+            os.path.join(video_root, profile['resolution'], 'index.m3u8'),
+        ] for profile in HLS_PROFILES]
+
+    def _measure(self, commands):
+        started = time.perf_counter()
+        for cmd in commands:
+            subprocess.run([cmd[0], '-v', 'error', *cmd[1:]], check=True)
+        return time.perf_counter() - started
+
+    def _report(self, loop_time, single_time, loop_root, single_root):
+        self.stdout.write(f"Per-profile loop: {loop_time:.2f}s")
+        self.stdout.write(f"Single pass:      {single_time:.2f}s")
+        self.stdout.write(f"Speedup:          {loop_time / single_time:.2f}x")
+        same_layout = list_output_files(loop_root) == list_output_files(single_root)
+        self.stdout.write(f"Identical output layout: {same_layout}")
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import time
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from content.api.views import HLSVideoSegmentView
+
+
+class Command(BaseCommand):
+    """
+    Measure how long a worker stays busy per segment request with and
+    without X-Accel-Redirect / X-Sendfile offloading.
+    """
+    help = "Benchmark worker occupancy of FileResponse against proxy offloading."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=float, default=2.0, help="Segment size in MB.")
+        parser.add_argument('--client-mbps', type=float, default=20.0, help="Simulated client bandwidth in Mbit/s.")
+        parser.add_argument('--requests', type=int, default=20, help="Requests per mode.")
+
+    def handle(self, *args, **options):
+        media_root = tempfile.mkdtemp(prefix='offload-benchmark-')
+        try:
+            segment_path = self._create_segment(media_root, options['size'])
+            for mode in ['', 'nginx', 'sendfile']:
+                with override_settings(MEDIA_ROOT=media_root, HLS_SEGMENT_OFFLOAD=mode):
+                    occupancy = self._measure(segment_path, options)
+                self.stdout.write(f"{mode or 'FileResponse':<12} {occupancy * 1000:10.2f} ms per request")
+        finally:
+            shutil.rmtree(media_root)
+
+    def _create_segment(self, media_root, size):
+        path = os.path.join(media_root, 'videos', '1', '720p', 'index0.ts')
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as file:
+            file.write(os.urandom(int(size * 1024 * 1024)))
+        return path
+
+    def _measure(self, segment_path, options):
+        """
+        Return the average time a worker spends building and sending one response,
+        draining the body at the simulated client bandwidth.
+        """
+        view = HLSVideoSegmentView()
+        bytes_per_second = options['client_mbps'] * 1_000_000 / 8
+        started = time.perf_counter()
+        for _ in range(options['requests']):
+            response = view.build_segment_response(segment_path)
+            chunks = response.streaming_content if response.streaming else [response.content]
+            for chunk in chunks:
+                time.sleep(len(chunk) / bytes_per_second)
+            response.close()
+        return (time.perf_counter() - started) / options['requests']
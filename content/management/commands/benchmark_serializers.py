@@ -0,0 +1,64 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+
+from content.api.serializers import VideoListSerializer, VideoListValuesSerializer
+from content.models import Video
+
+
+class Command(BaseCommand):
+    """
+    Compare catalog serialization throughput of the DRF ModelSerializer
+    and the .values() based fast path on generated rows.
+    The generated videos are rolled back afterwards.
+    """
+    help = "Benchmark VideoListSerializer against VideoListValuesSerializer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000], help="Catalog sizes to test.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per serializer; the best run is reported.")
+
+    def handle(self, *args, **options):
+        request = APIRequestFactory().get('/api/video/', HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        for rows in options['rows']:
+            with transaction.atomic():
+                self._create_videos(rows)
+                model = self._measure(lambda: self._serialize_models(request), options['repeat'])
+                values = self._measure(lambda: self._serialize_values(request), options['repeat'])
+                transaction.set_rollback(True)
+            self.stdout.write(
+                f"{rows:>7} rows  ModelSerializer {rows / model:10.0f} rows/s  "
+                f"values {rows / values:10.0f} rows/s  ({model / values:.1f}x)"
+            )
+
+    def _create_videos(self, rows):
+        Video.objects.bulk_create(
+            Video(
+                title=f"Benchmark Video {index}",
+                description="Generated by benchmark_serializers",
+                video_file=f"videos/benchmark_{index}.mp4",
+                thumbnail=f"thumbnail/benchmark_{index}.jpg",
+            )
+            for index in range(rows)
+        )
+
+    def _serialize_models(self, request):
+        videos = Video.objects.all()
+        return VideoListSerializer(videos, many=True, context={'request': request}).data
+
+    def _serialize_values(self, request):
+        rows = VideoListValuesSerializer.get_values(Video.objects.all())
+        return VideoListValuesSerializer(rows, context={'request': request}).data
+
+    def _measure(self, serialize, repeat):
+        """
+        Return the fastest wall-clock time of several runs, including the query.
+        """
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            serialize()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
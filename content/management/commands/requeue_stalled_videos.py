@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from content.pipeline import HIGH_QUEUE, find_stalled_videos, get_queue, requeue_video
+
+
+class Command(BaseCommand):
+    """
+    Re-queue videos whose processing stalled, e.g. because the rqworker
+    died mid-encode. Renditions finished before the crash are not encoded again.
+    """
+    help = "Re-queue videos stuck in 'uploaded' or 'transcoding'."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes', type=int, default=settings.HLS_STALLED_AFTER,
+            help="Minutes without status change or progress after which a video counts as stalled.",
+        )
+        parser.add_argument('--include-failed', action='store_true', help="Also re-queue failed videos.")
+        parser.add_argument('--dry-run', action='store_true', help="Only list the stalled videos.")
+
+    def handle(self, *args, **options):
+        videos = find_stalled_videos(options['minutes'], options['include_failed'])
+        queue = get_queue(HIGH_QUEUE)
+        for video in videos:
+            self.stdout.write(f"Video {video.id} ({video.status}): {video.title}")
+            if not options['dry_run']:
+                requeue_video(queue, video)
+        action = "found" if options['dry_run'] else "re-queued"
+        self.stdout.write(f"{len(videos)} stalled video(s) {action}.")
@@ -1,6 +1,9 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from datetime import date
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 MOVIE_CATEGORY = [
     ('action', 'Action'),
@@ -17,13 +20,45 @@ MOVIE_CATEGORY = [
     ('romance', 'Romance')
 ]
 
+VIDEO_STATUS = [
+    ('uploaded', 'Uploaded'),
+    ('transcoding', 'Transcoding'),
+    ('ready', 'Ready'),
+    ('failed', 'Failed')
+]
+
 class Video(models.Model):
     created_at = models.DateField(default=date.today)
     title = models.CharField(max_length=255)
     description = models.CharField(max_length=255)
     video_file = models.FileField(upload_to='videos')
     thumbnail = models.ImageField(upload_to='thumbnail/', blank=True, null=True)
+    thumbnails = models.JSONField(default=list, blank=True)
     category = models.CharField(max_length=30, choices=MOVIE_CATEGORY, default='action')
+    status = models.CharField(max_length=20, choices=VIDEO_STATUS, default='uploaded', db_index=True)
+    progress = models.PositiveSmallIntegerField(default=0)
+    renditions_done = models.PositiveSmallIntegerField(default=0)
+    completed_renditions = models.JSONField(default=list, blank=True)
+    status_changed_at = models.DateTimeField(default=timezone.now, blank=True, null=True)
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+    duration = models.FloatField(blank=True, null=True)
+    width = models.PositiveIntegerField(blank=True, null=True)
+    height = models.PositiveIntegerField(blank=True, null=True)
+    fps = models.FloatField(blank=True, null=True)
+    video_codec = models.CharField(max_length=30, blank=True)
+    video_bitrate = models.PositiveIntegerField(blank=True, null=True)
+    audio_codec = models.CharField(max_length=30, blank=True)
+    renditions = models.JSONField(default=list, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True, editable=False)
+    hls_key = models.CharField(max_length=80, blank=True, db_index=True, editable=False)
+    pipeline_job_id = models.CharField(max_length=64, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='video_created_id_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='video_status_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='video_search_vector_idx'),
+        ]
 
     def __str__(self):
         return self.title
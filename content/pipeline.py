@@ -0,0 +1,249 @@
+import math
+import os
+from datetime import datetime, timedelta
+import django_rq
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rq import Retry
+from rq.exceptions import NoSuchJobError
+from rq.job import Dependency, Job, JobStatus
+
+from content.models import Video
+from content.progress import get_progress
+from content.tasks import (
+    HLS_PROFILES,
+    convert_chunk,
+    convert_rendition,
+    convert_to_hls,
+    finalize_hls,
+    generate_trickplay,
+    get_encoded_profiles,
+    get_pending_profiles,
+    get_progress_labels,
+    get_video_metadata,
+    probe_video,
+    set_video_status,
+    stitch_chunks,
+)
+
+STALLED_STATUSES = ('uploaded', 'transcoding')
+HIGH_QUEUE = 'high'
+THUMBNAIL_QUEUE = 'thumbnails'
+TRANSCODE_QUEUE = 'transcode'
+TRANSCODE_HIGH_QUEUE = 'transcode_high'
+LIVE_JOB_STATUSES = (JobStatus.QUEUED, JobStatus.STARTED, JobStatus.SCHEDULED, JobStatus.DEFERRED)
+
+
+def get_queue(name: str):
+    return django_rq.get_queue(name, autocommit=True)
+
+
+def get_pipeline_queues() -> dict:
+    """
+    Return the queues the HLS pipeline is spread over, keyed by name.
+    Thumbnail regeneration uses the 'thumbnails' queue outside the pipeline.
+    """
+    return {name: get_queue(name) for name in (HIGH_QUEUE, TRANSCODE_HIGH_QUEUE, TRANSCODE_QUEUE)}
+
+
+def get_encoding_queue_name(size: int, duration: float = None) -> str:
+    """
+    Route the encoding jobs of an upload by their cost.
+
+    - Small and short uploads (HLS_HIGH_PRIORITY_MAX_SIZE MB, HLS_HIGH_PRIORITY_MAX_DURATION
+      seconds) go to 'transcode_high', so they are not stuck behind a feature film.
+    - Everything else goes to 'transcode'.
+    - Both are only consumed by the transcode workers (which take 'transcode_high'
+      first), so encodes never hold up the quick jobs on 'high'.
+    """
+    small = size <= settings.HLS_HIGH_PRIORITY_MAX_SIZE * 1024 * 1024
+    short = duration is None or duration <= settings.HLS_HIGH_PRIORITY_MAX_DURATION
+    return TRANSCODE_HIGH_QUEUE if small and short else TRANSCODE_QUEUE
+
+
+def build_retry():
+    """
+    Retry policy of the pipeline jobs: HLS_JOB_RETRIES attempts with exponential
+    backoff starting at HLS_RETRY_INTERVAL seconds (needs rqworker --with-scheduler).
+    """
+    if not settings.HLS_JOB_RETRIES:
+        return None
+    intervals = [settings.HLS_RETRY_INTERVAL * 2 ** attempt for attempt in range(settings.HLS_JOB_RETRIES)]
+    return Retry(max=settings.HLS_JOB_RETRIES, interval=intervals)
+
+
+def enqueue_hls_jobs(queue, source: str, video_id: int, profiles: list = HLS_PROFILES,
+                     duration: float = None, completed: list = ()) -> list:
+    """
+    Enqueue the encoding jobs of a video.
+
+    - With HLS_CHUNKED_ENCODING videos longer than one chunk are split into
+      time ranges (see enqueue_chunk_jobs).
+    - With HLS_PARALLEL_RENDITIONS one job per profile is enqueued (fan-out),
+      so several rqworkers can encode the same upload at once.
+    - Otherwise a single job encodes all profiles in one ffmpeg pass.
+    - Failed jobs are retried with backoff and resume from their finished renditions.
+    """
+    if is_chunked(profiles, duration):
+        return enqueue_chunk_jobs(queue, source, video_id, profiles, duration, completed)
+    if not settings.HLS_PARALLEL_RENDITIONS:
+        return [queue.enqueue(convert_to_hls, source, video_id, retry=build_retry())]
+
+    return [
+        queue.enqueue(convert_rendition, source, video_id, profile['resolution'], retry=build_retry())
+        for profile in profiles
+    ]
+
+
+def is_chunked(profiles: list, duration: float = None) -> bool:
+    """
+    Return whether a video is encoded in chunks: the mode is enabled, the video
+    is longer than one chunk and at least one rendition is actually encoded.
+    """
+    return (
+        settings.HLS_CHUNKED_ENCODING
+        and bool(duration)
+        and duration > settings.HLS_CHUNK_DURATION
+        and bool(get_encoded_profiles(profiles))
+    )
+
+
+def enqueue_chunk_jobs(queue, source: str, video_id: int, profiles: list, duration: float,
+                       completed: list = ()) -> list:
+    """
+    Enqueue the chunked mode of a video.
+
+    - One job per HLS_CHUNK_DURATION time range encodes every encoded rendition,
+      so the encode time of a long movie scales out across workers.
+    - A stitch job depending on all chunks joins them into one playlist per rendition.
+      It also runs (and fails) after a failed chunk, so the fan-in job is never
+      left waiting and can mark the video as failed; it is not retried, as a chunk
+      that failed for good never appears.
+    - No chunk is enqueued once every encoded rendition is finished, e.g. when a
+      video is re-queued after its chunks were stitched.
+    - Stream-copy renditions are remuxed by their own job, as the source keyframes
+      do not line up with the chunk boundaries.
+    """
+    jobs = []
+    if get_pending_profiles(profiles, completed):
+        count = math.ceil(duration / settings.HLS_CHUNK_DURATION)
+        chunks = [queue.enqueue(convert_chunk, source, video_id, index, retry=build_retry()) for index in range(count)]
+        dependency = Dependency(jobs=chunks, allow_failure=True)
+        jobs.append(queue.enqueue(stitch_chunks, video_id, count, depends_on=dependency))
+    return jobs + [
+        queue.enqueue(convert_rendition, source, video_id, profile['resolution'], retry=build_retry())
+        for profile in profiles if profile.get('copy')
+    ]
+
+
+def enqueue_hls_pipeline(queues: dict, source: str, video_id: int, profiles: list = HLS_PROFILES,
+                         encoding_queue: str = TRANSCODE_QUEUE, duration: float = None, completed: list = ()):
+    """
+    Enqueue the full HLS pipeline of a video for the given rendition ladder
+    and return the fan-in job.
+
+    - Encoding and trickplay jobs, which both decode the whole source, go to the
+      given encoding queue, so previews never occupy the quick worker or run
+      into its timeout; the quick fan-in job goes to 'high'.
+    - The fan-in job depends on every encoding job (and the trickplay job,
+      if HLS_TRICKPLAY is enabled) and is the only one that removes the original upload.
+    - It also runs after a failed dependency, so an optional trickplay failure never
+      blocks the video; finalize_hls itself checks that every rendition was encoded.
+    """
+    jobs = enqueue_hls_jobs(queues[encoding_queue], source, video_id, profiles, duration, completed)
+    if settings.HLS_TRICKPLAY:
+        jobs.append(queues[encoding_queue].enqueue(generate_trickplay, source, video_id))
+    return queues[HIGH_QUEUE].enqueue(
+        finalize_hls,
+        source,
+        video_id,
+        depends_on=Dependency(jobs=jobs, allow_failure=True) if jobs else None,
+        retry=build_retry(),
+    )
+
+
+def start_hls_pipeline(source: str, video_id: int) -> None:
+    """
+    First job of every upload: probe the source, store its metadata and
+    rendition ladder, then enqueue the HLS pipeline, routing the encoding
+    jobs by file size and duration. The fan-in job is recorded as the
+    video's pipeline job, as it is the last one to finish.
+    """
+    profiles = probe_video(source, video_id)
+    metadata = get_video_metadata(video_id)
+    encoding_queue = get_encoding_queue_name(os.path.getsize(source), metadata['duration'])
+    final_job = enqueue_hls_pipeline(
+        get_pipeline_queues(), source, video_id, profiles, encoding_queue,
+        metadata['duration'], metadata['completed_renditions'],
+    )
+    record_pipeline_job(video_id, final_job)
+
+
+def enqueue_start_job(queue, source: str, video_id: int) -> None:
+    """
+    Enqueue the first job of the HLS pipeline and record it as the video's pipeline job.
+    """
+    record_pipeline_job(video_id, queue.enqueue(start_hls_pipeline, source, video_id))
+
+
+def record_pipeline_job(video_id: int, job) -> None:
+    Video.objects.filter(id=video_id).update(pipeline_job_id=job.id)
+
+
+def has_live_job(video) -> bool:
+    """
+    Return whether the recorded pipeline job of a video is still queued, running,
+    scheduled for a retry or waiting for its dependencies.
+    Jobs RQ no longer knows about count as finished.
+    """
+    if not video.pipeline_job_id:
+        return False
+    try:
+        job = Job.fetch(video.pipeline_job_id, connection=django_rq.get_connection(HIGH_QUEUE))
+    except NoSuchJobError:
+        return False
+    return job.get_status() in LIVE_JOB_STATUSES
+
+
+def find_stalled_videos(minutes: int, include_failed: bool = False) -> list:
+    """
+    Find videos whose processing has not moved for the given number of minutes,
+    e.g. because the rqworker died mid-encode.
+
+    - Scans 'uploaded' and 'transcoding' videos (and 'failed' ones if requested)
+      by status_changed_at.
+    - Skips videos whose upload is gone or that published ffmpeg progress
+      within that time, so long encodes are not mistaken for stalled ones.
+    - Skips videos whose pipeline job is still alive, e.g. waiting in the queue
+      behind a long transcode, so a pipeline is never started twice.
+    """
+    since = timezone.now() - timedelta(minutes=minutes)
+    statuses = STALLED_STATUSES + (('failed',) if include_failed else ())
+    videos = Video.objects.filter(status__in=statuses).exclude(video_file='').filter(
+        Q(status_changed_at__lt=since) | Q(status_changed_at__isnull=True)
+    )
+    return [
+        video for video in videos
+        if os.path.isfile(video.video_file.path)
+        and not has_recent_progress(video, since)
+        and not has_live_job(video)
+    ]
+
+
+def has_recent_progress(video, since) -> bool:
+    """
+    Return whether any encoding job of the video reported progress after `since`.
+    """
+    labels = get_progress_labels(video.renditions or HLS_PROFILES, video.duration)
+    updates = [datetime.fromisoformat(entry['updated_at']) for entry in get_progress(video.id, labels).values()]
+    return any(updated_at > since for updated_at in updates)
+
+
+def requeue_video(queue, video) -> None:
+    """
+    Reset a stalled video to 'uploaded' and enqueue its pipeline again.
+    Renditions finished before the crash are skipped by the encoding jobs.
+    """
+    set_video_status(video.id, 'uploaded')
+    enqueue_start_job(queue, video.video_file.path, video.id)
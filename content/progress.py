@@ -0,0 +1,105 @@
+import subprocess
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+PROGRESS_CACHE_TIMEOUT = 60 * 60
+
+
+def get_progress_cache_key(video_id: int, label: str) -> str:
+    """
+    Return the cache key holding the live progress of one encoding job.
+    The label is 'all' for single-pass jobs or the resolution for rendition jobs.
+    """
+    return f"transcode-progress:{video_id}:{label}"
+
+
+def get_progress(video_id: int, labels: list) -> dict:
+    """
+    Return the live progress of all known encoding jobs of a video, keyed by label.
+    """
+    keys = {get_progress_cache_key(video_id, label): label for label in labels}
+    return {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+
+
+def parse_number(value: str):
+    """
+    Convert an ffmpeg progress value (e.g. '29.97', '1.53x' or 'N/A') into a float.
+    """
+    try:
+        return float(value.rstrip('x'))
+    except ValueError:
+        return None
+
+
+class ProgressReporter:
+    """
+    Consume the key=value lines of `ffmpeg -progress` as they are written
+    and publish a throttled summary (percent, fps, speed) to the cache.
+    """
+    def __init__(self, video_id: int, label: str, duration: float = None):
+        self.cache_key = get_progress_cache_key(video_id, label)
+        self.duration = duration
+        self.interval = settings.HLS_PROGRESS_INTERVAL
+        self.block = {}
+        self.last_published = None
+
+    def feed(self, line: str) -> None:
+        """
+        Collect one progress line; every block ends with a 'progress' key.
+        """
+        key, _, value = line.strip().partition('=')
+        self.block[key] = value
+        if key == 'progress' and self._should_publish(value == 'end'):
+            self.publish(finished=value == 'end')
+
+    def _should_publish(self, finished: bool) -> bool:
+        if finished or self.last_published is None:
+            return True
+        return time.monotonic() - self.last_published >= self.interval
+
+    def publish(self, finished: bool = False) -> None:
+        """
+        Write the current progress summary to the cache (Redis).
+        """
+        self.last_published = time.monotonic()
+        cache.set(self.cache_key, self.summary(finished), PROGRESS_CACHE_TIMEOUT)
+
+    def summary(self, finished: bool) -> dict:
+        out_time = self._out_time()
+        return {
+            'percent': 100.0 if finished else self._percent(out_time),
+            'fps': parse_number(self.block.get('fps', 'N/A')),
+            'speed': parse_number(self.block.get('speed', 'N/A')),
+            'out_time': round(out_time, 2),
+            'finished': finished,
+            'updated_at': timezone.now().isoformat(),
+        }
+
+    def _out_time(self) -> float:
+        try:
+            return int(self.block.get('out_time_us', '0')) / 1_000_000
+        except ValueError:
+            return 0.0
+
+    def _percent(self, out_time: float):
+        if not self.duration:
+            return None
+        return round(min(out_time / self.duration * 100, 99.9), 1)
+
+
+def run_ffmpeg_with_progress(cmd: list, reporter: ProgressReporter) -> None:
+    """
+    Run an ffmpeg command with `-progress pipe:1` and stream its output
+    into the reporter line by line.
+    Raises CalledProcessError if ffmpeg exits with an error.
+    """
+    progress_cmd = [cmd[0], '-progress', 'pipe:1', '-nostats', *cmd[1:]]
+    with subprocess.Popen(progress_cmd, stdout=subprocess.PIPE, text=True) as process:
+        for line in process.stdout:
+            reporter.feed(line)
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, progress_cmd)
@@ -0,0 +1,55 @@
+import re
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchVector
+
+from content.models import Video
+
+
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 8
+
+
+def build_search_vector() -> SearchVector:
+    """
+    Return the weighted search document of a video: title (A) before description (B).
+    """
+    config = settings.VIDEO_SEARCH_CONFIG
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector("description", weight="B", config=config)
+    )
+
+
+def update_search_vector(video_id: int) -> None:
+    """
+    Store the search document of a video, computed in the database.
+    """
+    Video.objects.filter(id=video_id).update(search_vector=build_search_vector())
+
+
+def backfill_search_vectors(rebuild: bool = False) -> int:
+    """
+    Store the search document of every video that has none, in a single UPDATE,
+    and return the number of updated videos.
+
+    - Covers rows written without post_save: videos created before search existed,
+      bulk_create and queryset updates.
+    - With rebuild every document is recomputed, e.g. after changing VIDEO_SEARCH_CONFIG.
+    """
+    videos = Video.objects.all() if rebuild else Video.objects.filter(search_vector__isnull=True)
+    return videos.update(search_vector=build_search_vector())
+
+
+def build_search_query(text: str):
+    """
+    Turn free user input into a prefix tsquery for type-ahead search.
+
+    - Every word must match; the last characters typed may be incomplete ("adven" -> "adven:*").
+    - Operators and punctuation are stripped, so the raw query is always valid.
+    - Returns None if the input contains no searchable words.
+    """
+    terms = SEARCH_TERM_PATTERN.findall(text or "")[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    raw = " & ".join(f"{term}:*" for term in terms)
+    return SearchQuery(raw, search_type="raw", config=settings.VIDEO_SEARCH_CONFIG)
@@ -1,15 +1,19 @@
 import os
-import django_rq
 import shutil
 from django.dispatch import receiver
 from django.conf import settings
 from django.db.models.signals import post_save, post_delete
 from content.models import Video
-from content.tasks import (
-    convert_to_hls, 
-    delete_origin_video_file,
-    generate_thumbnail
+from content.caching import (
+    bump_catalog_version,
+    forget_video,
+    invalidate_manifests,
+    mark_video_exists
 )
+from content.deduplication import find_ready_original, link_hls_root, release_hls_root, reuse_hls_output
+from content.pipeline import HIGH_QUEUE, THUMBNAIL_QUEUE, enqueue_start_job, get_queue
+from content.search import update_search_vector
+from content.tasks import HLS_PROFILES, TRICKPLAY_DIR, generate_thumbnail
 
 
 @receiver (post_save, sender=Video)
@@ -18,7 +22,17 @@ def video_post_save(sender, instance, created, **kwargs):
     Convert a video file into HLS format using multiple quality profiles.
     Generates segmented playlists (m3u8 + ts files) for adaptive streaming.
     Stores the output under MEDIA_ROOT/videos/<video_id>/<resolution>/.
+    New uploads are probed on the 'high' queue, which then routes the encoding
+    jobs; thumbnail regeneration goes to the 'thumbnails' queue.
+    An upload identical to a ready video reuses its output instead.
+    Also records the video in the existence cache used by the HLS views,
+    refreshes its full-text search document and invalidates the cached
+    catalog responses.
     """
+    mark_video_exists(instance.id)
+    update_search_vector(instance.id)
+    bump_catalog_version()
+
     if not instance.video_file:
         return
 
@@ -26,26 +40,28 @@ def video_post_save(sender, instance, created, **kwargs):
     if not os.path.exists(source):
         return
 
-    queue = django_rq.get_queue("default", autocommit=True)
-
-    if not instance.thumbnail:
-        queue.enqueue(
+    if created:
+        start_processing(instance, source)
+    elif not instance.thumbnail:
+        get_queue(THUMBNAIL_QUEUE).enqueue(
             generate_thumbnail,
             source,
             instance.id
         )
 
-    if created:
-        convert_job = queue.enqueue(
-            convert_to_hls,
-            source,
-            instance.id
-        )
-        queue.enqueue(
-            delete_origin_video_file,
-            source,
-            depends_on=convert_job
-        )
+
+def start_processing(instance, source: str) -> None:
+    """
+    Serve a duplicate upload from the HLS output of a ready original; otherwise
+    link its content-addressed directory and start the HLS pipeline.
+    """
+    original = find_ready_original(instance)
+    if original:
+        reuse_hls_output(instance, original)
+        return
+    if instance.hls_key:
+        link_hls_root(instance.id, instance.hls_key)
+    enqueue_start_job(get_queue(HIGH_QUEUE), source, instance.id)
 
 
 @receiver(post_delete, sender=Video)       
@@ -54,15 +70,27 @@ def auto_delete_files_on_video_delete(sender, instance, **kwargs):
     Triggered after a Video instance is deleted.
     
     - Deletes the associated original video file, if it exists.
-    - Deletes the HLS directory for the video, if it exists.
-    - Deletes the video thumbnail file, if it exists.
+    - Deletes the HLS directory for the video, if it exists; shared content-addressed
+      output is only removed with its last reference.
+    - Deletes the video thumbnail file and the generated thumbnail sizes, if they exist.
+    - Invalidates the cached HLS manifests and existence check of the video.
+    - Invalidates the cached catalog responses.
     """
     if instance.video_file and os.path.isfile(instance.video_file.path):
         os.remove(instance.video_file.path)
 
-    hls_dir = os.path.join(settings.MEDIA_ROOT, 'videos', str(instance.id))
-    if os.path.isdir(hls_dir):
-        shutil.rmtree(hls_dir)
+    release_hls_root(instance)
 
     if instance.thumbnail and os.path.isfile(instance.thumbnail.path):
-        os.remove(instance.thumbnail.path)
\ No newline at end of file
+        os.remove(instance.thumbnail.path)
+
+    thumbnail_dir = os.path.join(settings.MEDIA_ROOT, 'thumbnail', str(instance.id))
+    if os.path.isdir(thumbnail_dir):
+        shutil.rmtree(thumbnail_dir)
+
+    invalidate_manifests(
+        instance.id,
+        [profile['resolution'] for profile in instance.renditions or HLS_PROFILES] + [TRICKPLAY_DIR]
+    )
+    forget_video(instance.id)
+    bump_catalog_version()
\ No newline at end of file
@@ -0,0 +1,244 @@
+import io
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.exceptions import ClientError
+except ImportError:
+    boto3 = None
+
+CONTENT_TYPES = {
+    '.m3u8': 'application/vnd.apple.mpegurl',
+    '.ts': 'video/MP2T',
+    '.vtt': 'text/vtt',
+    '.jpg': 'image/jpeg',
+}
+PLAYLIST_EXTENSIONS = ('.m3u8', '.vtt')
+
+
+class StoredFile(NamedTuple):
+    """
+    Size and modification time of a stored file, named like os.stat_result.
+    """
+    st_size: int
+    st_mtime_ns: int
+
+    @property
+    def st_mtime(self) -> float:
+        return self.st_mtime_ns / 1e9
+
+
+class HLSStorage(ABC):
+    """
+    Interface of the storage holding the HLS tree of every video:
+    videos/<video_id>/<name>, e.g. '720p/index3.ts' or 'master.m3u8'.
+
+    - ffmpeg always encodes into local scratch directories; finished output
+      is handed over with write_rendition and write_file.
+    - Missing files raise FileNotFoundError.
+    """
+    is_local = False
+    supports_links = False
+
+    @abstractmethod
+    def write_rendition(self, video_id: int, local_dir: str, name: str) -> None:
+        """
+        Store a finished local directory as videos/<video_id>/<name>/ and remove the local copy.
+        """
+
+    @abstractmethod
+    def write_file(self, video_id: int, name: str, content: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def open(self, video_id: int, name: str):
+        """
+        Return a readable binary file object of a stored file.
+        """
+
+    @abstractmethod
+    def stat(self, video_id: int, name: str):
+        ...
+
+    @abstractmethod
+    def delete_tree(self, video_id: int) -> None:
+        ...
+
+    def local_path(self, video_id: int, name: str):
+        """
+        Return the absolute path of a stored file, or None if it is not on a local disk.
+        """
+        return None
+
+    def url(self, video_id: int, name: str):
+        """
+        Return a short-lived URL clients can fetch a stored file from directly, or None.
+        """
+        return None
+
+
+class LocalHLSStorage(HLSStorage):
+    """
+    HLS storage on the local filesystem: MEDIA_ROOT/videos/<video_id>/<name>.
+    Renditions are moved into place with one atomic rename each.
+    """
+    is_local = True
+    supports_links = True
+
+    def local_path(self, video_id: int, name: str = '') -> str:
+        return os.path.join(settings.MEDIA_ROOT, 'videos', str(video_id), name)
+
+    def write_rendition(self, video_id: int, local_dir: str, name: str) -> None:
+        target = self.local_path(video_id, name)
+        shutil.rmtree(target, ignore_errors=True)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.rename(local_dir, target)
+
+    def write_file(self, video_id: int, name: str, content: bytes) -> None:
+        """
+        Write a file atomically: readers see either the old or the new content.
+        """
+        path = self.local_path(video_id, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as file:
+            file.write(content)
+        os.replace(file.name, path)
+
+    def open(self, video_id: int, name: str):
+        return open(self.local_path(video_id, name), 'rb')
+
+    def stat(self, video_id: int, name: str):
+        return os.stat(self.local_path(video_id, name))
+
+    def delete_tree(self, video_id: int) -> None:
+        """
+        Remove the tree of a video; a deduplicated video only drops its link.
+        """
+        root = self.local_path(video_id)
+        if os.path.islink(root.rstrip(os.sep)):
+            os.unlink(root.rstrip(os.sep))
+        elif os.path.isdir(root):
+            shutil.rmtree(root)
+
+
+class S3HLSStorage(HLSStorage):
+    """
+    HLS storage in an S3-compatible bucket (AWS S3, MinIO, ...):
+    <HLS_S3_PREFIX>videos/<video_id>/<name>.
+
+    - Files above HLS_S3_MULTIPART_THRESHOLD MB are uploaded in parts, and
+      HLS_S3_UPLOAD_WORKERS files are uploaded in parallel.
+    - Playlists are uploaded after their segments, so they never reference
+      a missing segment.
+    - Segments are served by redirecting to presigned URLs (HLS_S3_URL_TTL).
+    - Requires boto3, which is only installed for this backend.
+    """
+    def __init__(self):
+        if boto3 is None:
+            raise ImproperlyConfigured("HLS_STORAGE_BACKEND 's3' requires boto3 (pip install boto3).")
+        self.bucket = settings.HLS_S3_BUCKET
+        self.prefix = settings.HLS_S3_PREFIX
+        self.client = boto3.client(
+            's3',
+            endpoint_url=settings.HLS_S3_ENDPOINT_URL or None,
+            region_name=settings.HLS_S3_REGION or None,
+        )
+        threshold = settings.HLS_S3_MULTIPART_THRESHOLD * 1024 * 1024
+        self.transfer_config = TransferConfig(multipart_threshold=threshold, multipart_chunksize=threshold)
+
+    def get_key(self, video_id: int, name: str = '') -> str:
+        return f'{self.prefix}videos/{video_id}/{name}'
+
+    def write_rendition(self, video_id: int, local_dir: str, name: str) -> None:
+        files = [
+            os.path.join(path, filename)
+            for path, _, filenames in os.walk(local_dir)
+            for filename in filenames
+        ]
+        playlists = [path for path in files if path.endswith(PLAYLIST_EXTENSIONS)]
+        segments = [path for path in files if path not in playlists]
+        with ThreadPoolExecutor(max_workers=settings.HLS_S3_UPLOAD_WORKERS) as pool:
+            for batch in (segments, playlists):
+                list(pool.map(lambda path: self.upload(video_id, local_dir, name, path), batch))
+        shutil.rmtree(local_dir)
+
+    def upload(self, video_id: int, local_dir: str, name: str, path: str) -> None:
+        """
+        Upload one local file of a rendition with boto3's managed (multipart) transfer.
+        """
+        relative_path = os.path.relpath(path, local_dir).replace(os.sep, '/')
+        content_type = CONTENT_TYPES.get(os.path.splitext(path)[1], 'application/octet-stream')
+        self.client.upload_file(
+            path, self.bucket, self.get_key(video_id, f'{name}/{relative_path}'),
+            ExtraArgs={'ContentType': content_type}, Config=self.transfer_config,
+        )
+
+    def write_file(self, video_id: int, name: str, content: bytes) -> None:
+        content_type = CONTENT_TYPES.get(os.path.splitext(name)[1], 'application/octet-stream')
+        self.client.put_object(Bucket=self.bucket, Key=self.get_key(video_id, name), Body=content,
+                               ContentType=content_type)
+
+    def open(self, video_id: int, name: str):
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.get_key(video_id, name))
+        except ClientError as error:
+            raise FileNotFoundError(name) from error
+        return io.BytesIO(response['Body'].read())
+
+    def stat(self, video_id: int, name: str) -> StoredFile:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=self.get_key(video_id, name))
+        except ClientError as error:
+            raise FileNotFoundError(name) from error
+        return StoredFile(response['ContentLength'], int(response['LastModified'].timestamp() * 1e9))
+
+    def delete_tree(self, video_id: int) -> None:
+        """
+        Delete every object of a video, 1000 keys per request.
+        """
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.get_key(video_id)):
+            objects = [{'Key': item['Key']} for item in page.get('Contents', [])]
+            if objects:
+                self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': objects})
+
+    def url(self, video_id: int, name: str) -> str:
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket, 'Key': self.get_key(video_id, name)},
+            ExpiresIn=settings.HLS_S3_URL_TTL,
+        )
+
+
+HLS_STORAGE_BACKENDS = {
+    'local': LocalHLSStorage,
+    's3': S3HLSStorage,
+}
+
+
+def get_hls_storage() -> HLSStorage:
+    """
+    Return the HLS storage configured by HLS_STORAGE_BACKEND ('local' or 's3').
+    """
+    return build_hls_storage(settings.HLS_STORAGE_BACKEND)
+
+
+@lru_cache
+def build_hls_storage(backend: str) -> HLSStorage:
+    """
+    Create a storage backend once per process, so the S3 client and its
+    connection pool are shared between requests and jobs.
+    """
+    try:
+        return HLS_STORAGE_BACKENDS[backend]()
+    except KeyError:
+        raise ImproperlyConfigured(f"Unknown HLS_STORAGE_BACKEND: {backend}")
@@ -1,51 +1,1006 @@
+import json
+import math
 import os
+import shutil
 import subprocess
+from fractions import Fraction
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rq import get_current_job
+from content.caching import bump_catalog_version
 from content.models import Video
+from content.progress import ProgressReporter, parse_number, run_ffmpeg_with_progress
+from content.storage import get_hls_storage
+
+
+HLS_PROFILES = settings.VIDEOFLIX_HLS_LADDER
+ENCODER_OVERRIDES = ('preset', 'crf', 'maxrate_factor', 'bufsize_factor')
+AUDIO_BITRATE = '128k'
+AUDIO_CODECS = 'mp4a.40.2'
+MASTER_PLAYLIST = 'master.m3u8'
+THUMBNAIL_WIDTHS = [160, 320, 640]
+THUMBNAIL_FORMATS = ['jpg', 'webp']
+THUMBNAIL_OUTPUTS = [(width, fmt) for width in THUMBNAIL_WIDTHS for fmt in THUMBNAIL_FORMATS]
+THUMBNAIL_DEFAULT_WIDTH = 320
+THUMBNAIL_SAMPLE_FRAMES = 120
+TRICKPLAY_DIR = 'trickplay'
+TRICKPLAY_INDEX = 'thumbnails.vtt'
+TRICKPLAY_TILE_WIDTH = 160
+TRICKPLAY_TILE_HEIGHT = 90
+TRICKPLAY_COLUMNS = 10
+TRICKPLAY_ROWS = 10
+AVC_PROFILE_CODECS = {'Constrained Baseline': '42e0', 'Baseline': '4200', 'Main': '4d40', 'High': '6400'}
+STREAM_COPY_BITRATE_TOLERANCE = 1.5
+KEYFRAME_PROBE_SEGMENTS = 3
+CHUNKS_DIR = '.chunks'
+CHUNK_TS_OFFSET = 1
+
+
+def get_video_root(video_id: int) -> str:
+    """
+    Return the HLS output directory of a video: MEDIA_ROOT/videos/<video_id>.
+    """
+    return os.path.join(settings.MEDIA_ROOT, 'videos', str(video_id))
+
+
+def get_progress_labels(profiles: list, duration: float = None) -> list:
+    """
+    Return the progress labels of every encoding job a video can have:
+    'all', one per resolution and, in chunked mode, 'chunk-<n>'.
+    """
+    labels = ['all'] + [profile['resolution'] for profile in profiles]
+    if settings.HLS_CHUNKED_ENCODING and duration:
+        labels += [f'chunk-{index}' for index in range(math.ceil(duration / settings.HLS_CHUNK_DURATION))]
+    return labels
+
+
+def get_staging_root(video_id: int, label: str) -> str:
+    """
+    Return the temporary local directory an encoding job writes into:
+    MEDIA_ROOT/videos/<video_id>/.staging-<label>-<job id>. With the local storage it lives
+    next to the final renditions, so publishing a rendition is a single rename.
+    The job ID keeps two jobs of a video apart; a retry keeps its ID and its directory.
+    """
+    job = get_current_job()
+    suffix = f'-{job.id}' if job else ''
+    return os.path.join(get_video_root(video_id), f'.staging-{label}{suffix}')
+
+
+def get_chunk_root(video_id: int, index: int) -> str:
+    """
+    Return the directory of a finished chunk: MEDIA_ROOT/videos/<video_id>/.chunks/<index>.
+    """
+    return os.path.join(get_video_root(video_id), CHUNKS_DIR, str(index))
+
+
+def probe_source(input_file: str) -> dict:
+    """
+    Probe the source with a single ffprobe call and return its JSON output
+    (format duration and bitrate, plus codec, profile, size, rate and rotation per stream).
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-show_entries',
+        'format=duration,bit_rate:'
+        'stream=codec_type,codec_name,profile,level,pix_fmt,width,height,avg_frame_rate,bit_rate:'
+        'stream_tags=rotate:stream_side_data=rotation',
+        '-of', 'json',
+        input_file,
+    ]
+    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def get_stream(data: dict, codec_type: str) -> dict:
+    """
+    Return the first stream of a type ('video' or 'audio') from ffprobe's output, or {}.
+    """
+    streams = data.get('streams', [])
+    return next((stream for stream in streams if stream.get('codec_type') == codec_type), {})
+
+
+def parse_probe_output(data: dict) -> dict:
+    """
+    Extract the Video metadata fields from ffprobe's JSON output.
+
+    - Width and height are the displayed size: they are swapped for sources rotated
+      by 90 degrees (e.g. portrait phone videos), as ffmpeg autorotates before scaling.
+    - Raises ValueError if the file has no video stream.
+    """
+    video = get_stream(data, 'video')
+    if not video.get('width') or not video.get('height'):
+        raise ValueError('Source has no video stream')
+    video_format = data.get('format', {})
+    width, height = video['width'], video['height']
+    if get_rotation(video) in (90, 270):
+        width, height = height, width
+    return {
+        'duration': parse_number(video_format.get('duration', 'N/A')),
+        'width': width,
+        'height': height,
+        'fps': parse_frame_rate(video.get('avg_frame_rate', '')),
+        'video_codec': video.get('codec_name', ''),
+        'video_bitrate': int(video.get('bit_rate') or video_format.get('bit_rate') or 0) or None,
+        'audio_codec': get_stream(data, 'audio').get('codec_name', ''),
+    }
+
+
+def get_rotation(stream: dict) -> int:
+    """
+    Return the rotation of a video stream in degrees (0, 90, 180 or 270), read from
+    its display matrix side data or, for older files, its 'rotate' tag.
+    """
+    side_data = next((entry for entry in stream.get('side_data_list', []) if 'rotation' in entry), {})
+    rotation = side_data.get('rotation', stream.get('tags', {}).get('rotate', 0))
+    try:
+        return round(float(rotation)) % 360
+    except ValueError:
+        return 0
+
+
+def parse_frame_rate(value: str):
+    """
+    Convert an ffprobe frame rate like '30000/1001' into frames per second, or None.
+    """
+    try:
+        return round(float(Fraction(value)), 3)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def round_even(value: float) -> int:
+    return max(2, round(value / 2) * 2)
+
+
+def fit_profile(profile: dict, width: int, height: int) -> dict:
+    """
+    Scale a source into the profile's box, keeping its aspect ratio and never upscaling.
+    Dimensions are rounded to even numbers as required by yuv420p.
+    """
+    factor = min(profile['width'] / width, profile['height'] / height, 1)
+    return {**profile, 'width': round_even(width * factor), 'height': round_even(height * factor)}
+
+
+def build_ladder(width: int, height: int) -> list:
+    """
+    Pick the renditions of a source from HLS_PROFILES.
+
+    - Keeps every profile whose box the source fills in at least one dimension,
+      so a 480p upload is not upscaled to 720p/1080p.
+    - A source below the smallest profile gets one rendition at its own size.
+    """
+    ladder = [
+        fit_profile(profile, width, height)
+        for profile in HLS_PROFILES
+        if width >= profile['width'] or height >= profile['height']
+    ]
+    if ladder:
+        return ladder
+    rendition = fit_profile(HLS_PROFILES[0], width, height)
+    return [{**rendition, 'resolution': f"{rendition['height']}p"}]
+
+
+def get_avc_codecs(stream: dict):
+    """
+    Return the RFC 6381 codecs string of an H.264 stream (e.g. 'avc1.640028'),
+    or None for profiles HLS players cannot be expected to decode.
+    """
+    prefix = AVC_PROFILE_CODECS.get(stream.get('profile'))
+    level = stream.get('level')
+    if not prefix or not isinstance(level, int) or level <= 0:
+        return None
+    return f'avc1.{prefix}{level:02x}'
+
+
+def is_stream_copy_compliant(stream: dict, bitrate: int, profile: dict) -> bool:
+    """
+    Check whether the source video can be remuxed as-is into a rendition:
+    8-bit 4:2:0 H.264 in a common profile, exactly the rendition size,
+    and a bitrate close to the rendition's target.
+    Rotated sources are never copied, as MPEG-TS cannot carry the rotation.
+    """
+    return (
+        settings.HLS_STREAM_COPY
+        and stream.get('codec_name') == 'h264'
+        and not get_rotation(stream)
+        and stream.get('pix_fmt') == 'yuv420p'
+        and get_avc_codecs(stream) is not None
+        and (stream.get('width'), stream.get('height')) == (profile['width'], profile['height'])
+        and bool(bitrate)
+        and bitrate <= parse_bitrate(profile['bitrate']) * STREAM_COPY_BITRATE_TOLERANCE
+    )
+
+
+def probe_keyframe_times(input_file: str, seconds: float) -> list:
+    """
+    Return the timestamps of the video keyframes in the first seconds of the source.
+    Only keyframes are decoded (-skip_frame nokey), so the probe stays cheap.
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-skip_frame', 'nokey',
+        '-read_intervals', f'%+{seconds}',
+        '-show_entries', 'frame=pts_time',
+        '-of', 'csv=p=0',
+        input_file,
+    ]
+    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    return [float(value) for value in result.stdout.split() if value != 'N/A']
+
+
+def has_segment_keyframes(keyframes: list, until: float, fps) -> bool:
+    """
+    Check that the source has a keyframe on every segment boundary before `until`,
+    i.e. that its keyframe interval divides segment_duration.
+
+    - A copied rendition can only be cut on source keyframes; a 10 s GOP would
+      produce 10 s segments out of step with the encoded renditions.
+    - Boundaries are counted from the first keyframe and matched within one frame,
+      as encoded renditions also key the first frame at or after each boundary.
+    """
+    if not keyframes:
+        return False
+    segment_duration = settings.VIDEOFLIX_HLS_ENCODER['segment_duration']
+    frame = 1 / (fps or 25)
+    start = keyframes[0]
+    boundaries = range(0, math.ceil(until), segment_duration)
+    return all(any(0 <= time - start - boundary < frame for time in keyframes) for boundary in boundaries)
+
+
+def has_aligned_keyframes(input_file: str, duration: float, fps) -> bool:
+    """
+    Probe the first KEYFRAME_PROBE_SEGMENTS segments of the source for aligned keyframes.
+    A source that cannot be probed is not stream copied.
+    """
+    until = settings.VIDEOFLIX_HLS_ENCODER['segment_duration'] * KEYFRAME_PROBE_SEGMENTS
+    if duration:
+        until = min(until, duration)
+    try:
+        keyframes = probe_keyframe_times(input_file, until + 1)
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        return False
+    return has_segment_keyframes(keyframes, until, fps)
+
+
+def apply_stream_copy(ladder: list, stream: dict, bitrate: int, input_file: str,
+                      duration: float = None) -> list:
+    """
+    Mark the top rendition as stream copy if the source already complies.
+
+    - Only the top rendition can match the source size, as the ladder never upscales.
+    - The source keyframes are probed last (only for otherwise compliant sources)
+      and must line up with the segment boundaries.
+    - Bitrate and codecs come from the source, so the master playlist stays accurate.
+    """
+    top = ladder[-1]
+    fps = parse_frame_rate(stream.get('avg_frame_rate', ''))
+    if is_stream_copy_compliant(stream, bitrate, top) and has_aligned_keyframes(input_file, duration, fps):
+        ladder[-1] = {**top, 'copy': True, 'bitrate': str(bitrate), 'codecs': get_avc_codecs(stream)}
+    return ladder
+
+
+def get_video_metadata(video_id: int) -> dict:
+    """
+    Return the probed metadata the encoding jobs need, without touching the source.
+    Videos probed before the adaptive ladder fall back to HLS_PROFILES.
+    """
+    metadata = Video.objects.values('duration', 'audio_codec', 'renditions', 'completed_renditions').get(id=video_id)
+    metadata['renditions'] = metadata['renditions'] or HLS_PROFILES
+    return metadata
+
+
+def get_video_profiles(video_id: int) -> list:
+    return get_video_metadata(video_id)['renditions']
+
+
+def probe_video(input_file: str, video_id: int) -> list:
+    """
+    Probe an upload, store its metadata and rendition ladder on the video
+    and return the ladder. Marks the video as failed if it cannot be probed.
+    """
+    try:
+        data = probe_source(input_file)
+        metadata = parse_probe_output(data)
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        set_video_status(video_id, 'failed')
+        raise
+    ladder = build_ladder(metadata['width'], metadata['height'])
+    ladder = apply_stream_copy(
+        ladder, get_stream(data, 'video'), metadata['video_bitrate'], input_file, metadata['duration']
+    )
+    Video.objects.filter(id=video_id).update(renditions=ladder, **metadata)
+    bump_catalog_version()
+    return ladder
+
+
+def build_filter_graph(profiles: list, thumbnails: bool = False) -> str:
+    """
+    Build a filter graph that decodes the video once and splits it
+    into one scaled output label ([v<index>out]) per encoded profile.
+    Stream-copy profiles need no branch. With thumbnails, one more
+    branch feeds build_thumbnail_filter. Returns '' if nothing is filtered.
+    """
+    encoded = [(index, profile) for index, profile in enumerate(profiles) if not profile.get('copy')]
+    branches = [f'[v{index}]' for index, _ in encoded] + (['[vt]'] if thumbnails else [])
+    if not branches:
+        return ''
+    scales = [
+        f"[v{index}]scale={profile['width']}:{profile['height']}[v{index}out]"
+        for index, profile in encoded
+    ]
+    thumbnail_filter = [build_thumbnail_filter('[vt]')] if thumbnails else []
+    return ';'.join([f"[0:v]split={len(branches)}{''.join(branches)}", *scales, *thumbnail_filter])
+
+
+def build_thumbnail_filter(source: str) -> str:
+    """
+    Pick a representative frame with ffmpeg's thumbnail filter and scale it
+    to every thumbnail width ([t<index>out] per THUMBNAIL_OUTPUTS entry).
+
+    - Downscales first, so the sampled frames buffered by the filter stay small.
+    - Needs no seek, so clips of any length get a thumbnail.
+    """
+    labels = ''.join(f'[t{index}]' for index in range(len(THUMBNAIL_OUTPUTS)))
+    scales = [
+        f'[t{index}]scale={width}:-2[t{index}out]'
+        for index, (width, fmt) in enumerate(THUMBNAIL_OUTPUTS)
+    ]
+    select = f'{source}scale={max(THUMBNAIL_WIDTHS)}:-2,thumbnail={THUMBNAIL_SAMPLE_FRAMES}'
+    return ';'.join([f'{select},split={len(THUMBNAIL_OUTPUTS)}{labels}', *scales])
+
+
+def get_thumbnail_name(video_id: int, width: int, fmt: str) -> str:
+    """
+    Return the storage name of a thumbnail: thumbnail/<video_id>/<width>.<fmt>.
+    """
+    return f'thumbnail/{video_id}/{width}.{fmt}'
+
+
+def build_thumbnail_args(video_id: int) -> list:
+    """
+    Map every thumbnail branch to a single-frame image output
+    and create the thumbnail directory of the video.
+    """
+    os.makedirs(os.path.join(settings.MEDIA_ROOT, 'thumbnail', str(video_id)), exist_ok=True)
+    args = []
+    for index, (width, fmt) in enumerate(THUMBNAIL_OUTPUTS):
+        path = os.path.join(settings.MEDIA_ROOT, get_thumbnail_name(video_id, width, fmt))
+        args += ['-map', f'[t{index}out]', '-frames:v', '1', '-update', '1', path]
+    return args
+
+
+def build_stream_args(profiles: list, has_audio: bool) -> list:
+    """
+    Map every video output (and the source audio) and set the codec per output stream.
+
+    - Encoded profiles use their scaled output and the options of build_encoder_args.
+    - Stream-copy profiles remux the source video untouched (-c:v:<index> copy).
+    """
+    args = []
+    threads = get_encoder_threads(profiles)
+    for index, profile in enumerate(profiles):
+        if profile.get('copy'):
+            args += ['-map', '0:v:0', f'-c:v:{index}', 'copy']
+        else:
+            args += ['-map', f'[v{index}out]', *build_encoder_args(index, profile, threads)]
+        if has_audio:
+            args += ['-map', '0:a:0']
+    return args
+
+
+def get_encoder_options(profile: dict) -> dict:
+    """
+    Return VIDEOFLIX_HLS_ENCODER with the per-profile overrides of a ladder entry applied.
+    """
+    overrides = {key: profile[key] for key in ENCODER_OVERRIDES if key in profile}
+    return {**settings.VIDEOFLIX_HLS_ENCODER, **overrides}
+
+
+def build_encoder_args(index: int, profile: dict, threads: int = 0) -> list:
+    """
+    Build the libx264 options of one output stream.
+
+    - Capped CRF if a crf is configured, otherwise capped VBR at the profile bitrate.
+    - maxrate/bufsize are derived from the profile bitrate in both modes.
+    - threads caps the encoder threads of the stream (0 lets x264 decide).
+    """
+    options = get_encoder_options(profile)
+    bitrate = parse_bitrate(profile['bitrate'])
+    rate = [f'-b:v:{index}', profile['bitrate']]
+    if options['crf'] is not None:
+        rate = [f'-crf:v:{index}', str(options['crf'])]
+    return [
+        f'-c:v:{index}', 'libx264',
+        f'-preset:v:{index}', options['preset'],
+        *rate,
+        f'-maxrate:v:{index}', str(int(bitrate * options['maxrate_factor'])),
+        f'-bufsize:v:{index}', str(int(bitrate * options['bufsize_factor'])),
+        *([f'-threads:v:{index}', str(threads)] if threads else []),
+    ]
+
+
+def build_thread_args() -> list:
+    """
+    Cap the decoder and filter threads of an ffmpeg job at HLS_FFMPEG_THREADS,
+    so several workers can share a host without oversubscribing its cores.
+    """
+    threads = settings.HLS_FFMPEG_THREADS
+    if not threads:
+        return []
+    return ['-threads', str(threads), '-filter_complex_threads', str(threads)]
+
+
+def get_encoder_threads(profiles: list) -> int:
+    """
+    Share HLS_FFMPEG_THREADS between the encoded (not stream-copied) profiles of a job.
+    """
+    encoded = len([profile for profile in profiles if not profile.get('copy')])
+    if not settings.HLS_FFMPEG_THREADS or not encoded:
+        return 0
+    return max(1, settings.HLS_FFMPEG_THREADS // encoded)
+
+
+def build_gop_args() -> list:
+    """
+    Force a keyframe at every segment boundary and suppress scene-cut keyframes,
+    so the segments of all renditions start at the same timestamps.
+    """
+    encoder = settings.VIDEOFLIX_HLS_ENCODER
+    if not encoder['align_gop']:
+        return []
+    return ['-force_key_frames', f"expr:gte(t,n_forced*{encoder['segment_duration']})", '-sc_threshold', '0']
+
+
+def build_var_stream_map(profiles: list, has_audio: bool) -> str:
+    """
+    Group the mapped streams into one HLS variant per profile,
+    named after the resolution so the muxer writes into <resolution>/.
+    """
+    variants = []
+    for index, profile in enumerate(profiles):
+        audio = f',a:{index}' if has_audio else ''
+        variants.append(f"v:{index}{audio},name:{profile['resolution']}")
+    return ' '.join(variants)
+
+
+def build_hls_command(input_file: str, video_root: str, profiles: list, has_audio: bool,
+                      thumbnail_args: list = (), start: int = 0, length: int = None) -> list:
+    """
+    Build a single ffmpeg command that encodes all given profiles in one pass.
+
+    - Decodes the source only once and splits it via filter_complex.
+    - Remuxes stream-copy profiles without re-encoding them.
+    - Writes <video_root>/<resolution>/index.m3u8 and index<n>.ts per profile.
+    - Appends the thumbnail outputs of build_thumbnail_args, if given.
+    - With a length, encodes only that time range from start (chunked mode);
+      timestamps and segment numbers continue where the previous range ends.
+      Every chunk is offset by the same CHUNK_TS_OFFSET seconds, so the B-frame
+      decode delay never makes a timestamp negative; MPEG-TS would otherwise
+      shift the first chunk only and break continuity at its end.
+    """
+    filter_graph = build_filter_graph(profiles, bool(thumbnail_args))
+    segment_duration = settings.VIDEOFLIX_HLS_ENCODER['segment_duration']
+    return [
+        'ffmpeg',
+        *build_thread_args(),
+        *(['-ss', str(start), '-t', str(length)] if length else []),
+        '-i', input_file,
+        *(['-filter_complex', filter_graph] if filter_graph else []),
+        *build_stream_args(profiles, has_audio),
+        *build_gop_args(),
+        '-c:a', 'aac',
+        '-b:a', AUDIO_BITRATE,
+        '-start_number', str(start // segment_duration),
+        *(['-output_ts_offset', str(start + CHUNK_TS_OFFSET)] if length else []),
+        '-hls_time', str(segment_duration),
+        '-hls_list_size', '0',
+        '-hls_segment_filename', os.path.join(video_root, '%v', 'index%d.ts'),
+        '-var_stream_map', build_var_stream_map(profiles, has_audio),
+        '-f', 'hls',
+        os.path.join(video_root, '%v', 'index.m3u8'),
+        *thumbnail_args,
+    ]
+
+
+def set_video_status(video_id: int, status: str, **fields) -> None:
+    """
+    Update the processing status (and optional progress fields) of a video.
+
+    - Uses a queryset update so no post_save signal (and no new jobs) fire,
+      hence the catalog version is bumped explicitly.
+    """
+    Video.objects.filter(id=video_id).update(
+        status=status,
+        status_changed_at=timezone.now(),
+        **fields,
+    )
+    bump_catalog_version()
+
+
+def mark_transcoding(video_id: int) -> None:
+    """
+    Mark a video as transcoding unless a parallel rendition job already failed.
+    """
+    Video.objects.filter(id=video_id).exclude(status='failed').update(
+        status='transcoding',
+        status_changed_at=timezone.now(),
+    )
+    bump_catalog_version()
+
+
+def mark_renditions_done(video_id: int, resolutions: list, total: int) -> None:
+    """
+    Record finished renditions and recompute the progress percentage
+    out of the video's total number of renditions.
+
+    - Locks the row, so parallel rendition jobs do not overwrite each other.
+    - Idempotent: a rendition finished again after a retry is counted once.
+    """
+    with transaction.atomic():
+        video = Video.objects.select_for_update().only('completed_renditions').get(id=video_id)
+        completed = list(dict.fromkeys([*video.completed_renditions, *resolutions]))
+        Video.objects.filter(id=video_id).update(
+            completed_renditions=completed,
+            renditions_done=len(completed),
+            progress=len(completed) * 100 // total,
+        )
+    bump_catalog_version()
+
+
+def has_retries_left() -> bool:
+    """
+    Return whether RQ will retry the current job if it fails now.
+    """
+    job = get_current_job()
+    return bool(job and job.retries_left)
+
+
+def publish_renditions(staging_root: str, video_id: int, profiles: list) -> None:
+    """
+    Hand finished renditions from the staging directory to the HLS storage
+    as videos/<video_id>/<resolution>, so a rendition is never visible half-written
+    (one atomic rename locally, playlists uploaded after their segments on S3).
+    """
+    storage = get_hls_storage()
+    for profile in profiles:
+        storage.write_rendition(video_id, os.path.join(staging_root, profile['resolution']), profile['resolution'])
+    shutil.rmtree(staging_root)
+
+
+def get_profile(profiles: list, resolution: str) -> dict:
+    """
+    Return the profile for a resolution, e.g. '720p', from a ladder.
+    """
+    return next(p for p in profiles if p['resolution'] == resolution)
+
+
+def encode_profiles(input_file: str, video_id: int, profiles: list, label: str = 'all',
+                    thumbnails: bool = False) -> None:
+    """
+    Encode the given profiles of a video in a single ffmpeg run.
+
+    - Idempotent: renditions finished by an earlier attempt are skipped,
+      so a retried or re-queued job resumes instead of starting over.
+    - Marks the video as transcoding and records the finished renditions.
+    - Extracts the thumbnails from the same decode pass if requested.
+    - Takes audio presence and duration from the probed metadata.
+    """
+    metadata = get_video_metadata(video_id)
+    pending = [p for p in profiles if p['resolution'] not in metadata['completed_renditions']]
+    if pending:
+        mark_transcoding(video_id)
+        run_encoding(input_file, video_id, pending, label, metadata, thumbnails)
+        mark_renditions_done(video_id, [p['resolution'] for p in pending], len(metadata['renditions']))
+    if thumbnails:
+        save_thumbnails(video_id)
+
+
+def run_encoding(input_file: str, video_id: int, profiles: list, label: str, metadata: dict,
+                 thumbnails: bool) -> None:
+    """
+    Run ffmpeg for the given profiles inside the job's staging directory
+    and rename every rendition into its final directory on success.
+    """
+    staging_root = prepare_staging(video_id, label, profiles)
+    thumbnail_args = build_thumbnail_args(video_id) if thumbnails else ()
+    cmd = build_hls_command(input_file, staging_root, profiles, bool(metadata['audio_codec']), thumbnail_args)
+    run_staged_ffmpeg(cmd, video_id, staging_root, ProgressReporter(video_id, label, metadata['duration']))
+    publish_renditions(staging_root, video_id, profiles)
+
+
+def prepare_staging(video_id: int, label: str, profiles: list) -> str:
+    """
+    Create an empty staging directory with one folder per profile;
+    leftovers of a crashed attempt are removed first.
+    """
+    staging_root = get_staging_root(video_id, label)
+    shutil.rmtree(staging_root, ignore_errors=True)
+    for profile in profiles:
+        os.makedirs(os.path.join(staging_root, profile['resolution']))
+    return staging_root
+
+
+def run_staged_ffmpeg(cmd: list, video_id: int, staging_root: str, reporter: ProgressReporter) -> None:
+    """
+    Run an ffmpeg command writing into a staging directory.
+
+    - Publishes live progress through the reporter while encoding.
+    - On failure the staging directory is removed; the video is marked as
+      failed only once RQ has no retry left for the job.
+    """
+    try:
+        run_ffmpeg_with_progress(cmd, reporter)
+    except (subprocess.CalledProcessError, OSError):
+        shutil.rmtree(staging_root, ignore_errors=True)
+        if not has_retries_left():
+            set_video_status(video_id, 'failed')
+        raise
 
 
 def convert_to_hls(input_file: str, video_id: int) -> None:
     """
     Convert a video file to HLS format in multiple resolutions.
-    
-    - Generates HLS playlists (.m3u8) and segments for 480p, 720p, and 1080p.
+
+    - Generates HLS playlists (.m3u8) and segments for every rendition of the
+      video's ladder (up to 480p, 720p, and 1080p, never above the source).
     - Saves the output in MEDIA_ROOT/videos/<video_id>/<resolution>/index.m3u8.
-    - Uses ffmpeg with libx264 for video and AAC for audio encoding.
+    - Uses a single ffmpeg run (libx264/AAC) that decodes the source only once.
+    - Extracts the thumbnails in the same run.
+    """
+    encode_profiles(input_file, video_id, get_video_profiles(video_id), thumbnails=True)
+
+
+def convert_rendition(input_file: str, video_id: int, resolution: str) -> None:
+    """
+    Convert a video file to a single HLS rendition.
+
+    - Used as one fan-out job per profile so several workers share an upload.
+    - Writes MEDIA_ROOT/videos/<video_id>/<resolution>/index.m3u8.
+    - The job of the smallest profile also extracts the thumbnails.
+    """
+    profiles = get_video_profiles(video_id)
+    thumbnails = resolution == profiles[0]['resolution']
+    encode_profiles(input_file, video_id, [get_profile(profiles, resolution)], resolution, thumbnails)
+
+
+def get_encoded_profiles(profiles: list) -> list:
+    """
+    Return the profiles that are encoded, i.e. not remuxed by stream copy.
+    """
+    return [profile for profile in profiles if not profile.get('copy')]
+
+
+def get_pending_profiles(profiles: list, completed: list) -> list:
+    """
+    Return the encoded profiles whose rendition has not been finished yet.
+    """
+    return [profile for profile in get_encoded_profiles(profiles) if profile['resolution'] not in completed]
+
+
+def convert_chunk(input_file: str, video_id: int, index: int) -> None:
+    """
+    Encode one time range of every encoded rendition (chunked mode).
+
+    - The range starts at index * HLS_CHUNK_DURATION, a multiple of the segment
+      duration, so keyframes, timestamps and segment numbers line up with the
+      neighbouring chunks.
+    - Writes MEDIA_ROOT/videos/<video_id>/.chunks/<index>/<resolution>/ via a
+      staging directory; a finished chunk is not encoded again.
+    - Only renditions that are not finished yet are encoded, so a re-queued video
+      whose chunks were already stitched is not encoded again.
+    - The first chunk also extracts the thumbnails.
+    """
+    chunk_root = get_chunk_root(video_id, index)
+    if os.path.isdir(chunk_root):
+        return
+    metadata = get_video_metadata(video_id)
+    profiles = get_pending_profiles(metadata['renditions'], metadata['completed_renditions'])
+    if not profiles:
+        return
+    mark_transcoding(video_id)
+    staging_root = prepare_staging(video_id, f'chunk-{index}', profiles)
+    cmd = build_chunk_command(input_file, video_id, index, staging_root, profiles, bool(metadata['audio_codec']))
+    reporter = ProgressReporter(video_id, f'chunk-{index}', settings.HLS_CHUNK_DURATION)
+    run_staged_ffmpeg(cmd, video_id, staging_root, reporter)
+    os.makedirs(os.path.dirname(chunk_root), exist_ok=True)
+    os.rename(staging_root, chunk_root)
+    if index == 0:
+        save_thumbnails(video_id)
+
+
+def build_chunk_command(input_file: str, video_id: int, index: int, output_root: str, profiles: list,
+                        has_audio: bool) -> list:
+    """
+    Build the ffmpeg command of one chunk; only the first chunk writes thumbnails.
+    """
+    thumbnail_args = build_thumbnail_args(video_id) if index == 0 else ()
+    start = index * settings.HLS_CHUNK_DURATION
+    return build_hls_command(
+        input_file, output_root, profiles, has_audio, thumbnail_args, start, settings.HLS_CHUNK_DURATION
+    )
+
+
+def read_playlist_segments(playlist_path: str) -> list:
+    """
+    Return the (#EXTINF line, segment URI) pairs of a media playlist.
+    """
+    with open(playlist_path, encoding='utf-8') as file:
+        lines = [line.strip() for line in file if line.strip()]
+    return [(line, lines[index + 1]) for index, line in enumerate(lines) if line.startswith('#EXTINF')]
+
+
+def build_media_playlist(segments: list) -> str:
+    """
+    Build a VOD media playlist from (#EXTINF line, segment URI) pairs,
+    starting at media sequence 0.
     """
-    profiles = [
-        {'resolution':'480p','scale': '850x480', 'bitrate': '1000k'},
-        {'resolution':'720p','scale': '1280x720', 'bitrate': '2500k'},
-        {'resolution':'1080p','scale': '1920x1080', 'bitrate': '5000k'},
+    target = max(math.ceil(float(extinf[len('#EXTINF:'):].split(',')[0])) for extinf, _ in segments)
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3', f'#EXT-X-TARGETDURATION:{target}', '#EXT-X-MEDIA-SEQUENCE:0']
+    for extinf, uri in segments:
+        lines += [extinf, uri]
+    lines.append('#EXT-X-ENDLIST')
+    return '\n'.join(lines) + '\n'
+
+
+def stitch_rendition(video_id: int, count: int, resolution: str, output_dir: str) -> None:
+    """
+    Link the segments of every chunk of one rendition into output_dir and
+    write a single continuous index.m3u8 for them.
+
+    - Segment names are globally numbered (index<n>.ts), so they never collide.
+    - Hard links keep the chunks intact until the stitch succeeded, so a retry can start over.
+    """
+    segments = []
+    for index in range(count):
+        chunk_dir = os.path.join(get_chunk_root(video_id, index), resolution)
+        chunk_segments = read_playlist_segments(os.path.join(chunk_dir, 'index.m3u8'))
+        for _, uri in chunk_segments:
+            os.link(os.path.join(chunk_dir, uri), os.path.join(output_dir, uri))
+        segments += chunk_segments
+    with open(os.path.join(output_dir, 'index.m3u8'), 'w', encoding='utf-8') as file:
+        file.write(build_media_playlist(segments))
+
+
+def stitch_chunks(video_id: int, count: int) -> None:
+    """
+    Fan-in job of the chunked mode, running once every chunk job has finished.
+
+    - Joins the chunks of every encoded rendition into one index.m3u8.
+    - Publishes the renditions with the same atomic rename as unchunked jobs
+      and records them as finished; the chunk directories are removed.
+    """
+    metadata = get_video_metadata(video_id)
+    profiles = get_pending_profiles(metadata['renditions'], metadata['completed_renditions'])
+    staging_root = prepare_staging(video_id, 'stitch', profiles)
+    for profile in profiles:
+        stitch_rendition(video_id, count, profile['resolution'], os.path.join(staging_root, profile['resolution']))
+    publish_renditions(staging_root, video_id, profiles)
+    mark_renditions_done(video_id, [p['resolution'] for p in profiles], len(metadata['renditions']))
+    shutil.rmtree(os.path.join(get_video_root(video_id), CHUNKS_DIR), ignore_errors=True)
+
+
+def build_trickplay_command(input_file: str, output_dir: str) -> list:
+    """
+    Build an ffmpeg command that samples one frame every HLS_TRICKPLAY_INTERVAL
+    seconds and tiles them into JPEG sprite sheets (sprite_<n>.jpg).
+
+    - Every tile has the same size; other aspect ratios are letterboxed,
+      so the WebVTT coordinates can be computed without probing the sheets.
+    """
+    width, height = TRICKPLAY_TILE_WIDTH, TRICKPLAY_TILE_HEIGHT
+    video_filter = (
+        f'fps=1/{settings.HLS_TRICKPLAY_INTERVAL},'
+        f'scale={width}:{height}:force_original_aspect_ratio=decrease,'
+        f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,'
+        f'tile={TRICKPLAY_COLUMNS}x{TRICKPLAY_ROWS}'
+    )
+    return [
+        'ffmpeg',
+        '-y',
+        *build_thread_args(),
+        '-i', input_file,
+        '-an',
+        '-vf', video_filter,
+        '-q:v', '5',
+        '-start_number', '0',
+        os.path.join(output_dir, 'sprite_%d.jpg'),
     ]
-    video_root = os.path.join(settings.MEDIA_ROOT, 'videos', str(video_id))
 
+
+def format_vtt_timestamp(seconds: float) -> str:
+    """
+    Format seconds as a WebVTT timestamp (HH:MM:SS.mmm).
+    """
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    return f'{hours:02}:{minutes:02}:{milliseconds / 1000:06.3f}'
+
+
+def build_trickplay_vtt(duration: float, sheets: int) -> str:
+    """
+    Build the WebVTT index mapping every interval to its tile:
+    sprite_<n>.jpg#xywh=<x>,<y>,<width>,<height>, relative to the index.
+    """
+    interval = settings.HLS_TRICKPLAY_INTERVAL
+    per_sheet = TRICKPLAY_COLUMNS * TRICKPLAY_ROWS
+    lines = ['WEBVTT', '']
+    for index in range(min(math.ceil(duration / interval), sheets * per_sheet)):
+        sheet, tile = divmod(index, per_sheet)
+        x = tile % TRICKPLAY_COLUMNS * TRICKPLAY_TILE_WIDTH
+        y = tile // TRICKPLAY_COLUMNS * TRICKPLAY_TILE_HEIGHT
+        start, end = index * interval, min((index + 1) * interval, duration)
+        lines.append(f'{format_vtt_timestamp(start)} --> {format_vtt_timestamp(end)}')
+        lines += [f'sprite_{sheet}.jpg#xywh={x},{y},{TRICKPLAY_TILE_WIDTH},{TRICKPLAY_TILE_HEIGHT}', '']
+    return '\n'.join(lines)
+
+
+def generate_trickplay(input_file: str, video_id: int) -> bool:
+    """
+    Pipeline stage next to the encoding jobs that generates scrub-bar previews.
+
+    - Writes videos/<video_id>/trickplay/sprite_<n>.jpg and thumbnails.vtt
+      to the HLS storage via a local staging directory.
+    - Previews are optional: on failure the partial output is removed and
+      False is returned, so the fan-in job still finalizes the video.
+    """
+    duration = get_video_metadata(video_id)['duration']
+    output_dir = os.path.join(prepare_staging(video_id, TRICKPLAY_DIR, []), TRICKPLAY_DIR)
+    os.makedirs(output_dir)
+    try:
+        subprocess.run(build_trickplay_command(input_file, output_dir), check=True)
+    except (subprocess.CalledProcessError, OSError):
+        duration = None
+    if duration:
+        write_trickplay_index(output_dir, duration)
+        get_hls_storage().write_rendition(video_id, output_dir, TRICKPLAY_DIR)
+    shutil.rmtree(os.path.dirname(output_dir))
+    return bool(duration)
+
+
+def write_trickplay_index(output_dir: str, duration: float) -> None:
+    """
+    Write thumbnails.vtt for the sprite sheets ffmpeg produced in output_dir.
+    """
+    sheets = len([name for name in os.listdir(output_dir) if name.startswith('sprite_')])
+    with open(os.path.join(output_dir, TRICKPLAY_INDEX), 'w', encoding='utf-8') as file:
+        file.write(build_trickplay_vtt(duration, sheets))
+
+
+def parse_bitrate(bitrate: str) -> int:
+    """
+    Convert an ffmpeg bitrate like '2500k' or '5M' into bits per second.
+    """
+    units = {'k': 1_000, 'M': 1_000_000}
+    if bitrate[-1] in units:
+        return int(float(bitrate[:-1]) * units[bitrate[-1]])
+    return int(bitrate)
+
+
+def get_peak_bitrate(profile: dict) -> int:
+    """
+    Return the peak video bitrate of a rendition: the encoder's maxrate,
+    or the measured source bitrate of a stream-copy rendition.
+    """
+    bitrate = parse_bitrate(profile['bitrate'])
+    if profile.get('copy'):
+        return bitrate
+    return int(bitrate * get_encoder_options(profile)['maxrate_factor'])
+
+
+def build_stream_inf(profile: dict, has_audio: bool) -> str:
+    """
+    Build the #EXT-X-STREAM-INF tag describing one rendition.
+    BANDWIDTH is the peak bitrate, AVERAGE-BANDWIDTH the target bitrate.
+    """
+    bandwidth = get_peak_bitrate(profile)
+    average = parse_bitrate(profile['bitrate'])
+    codecs = profile['codecs']
+    if has_audio:
+        bandwidth += parse_bitrate(AUDIO_BITRATE)
+        average += parse_bitrate(AUDIO_BITRATE)
+        codecs = f'{codecs},{AUDIO_CODECS}'
+    return (
+        f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},AVERAGE-BANDWIDTH={average},"
+        f"RESOLUTION={profile['width']}x{profile['height']},"
+        f'CODECS="{codecs}"'
+    )
+
+
+def write_master_playlist(video_id: int, profiles: list, has_audio: bool) -> None:
+    """
+    Write videos/<video_id>/master.m3u8 to the HLS storage, referencing every rendition.
+
+    - Lets players switch adaptively between the resolutions.
+    - Renditions are referenced relative as <resolution>/index.m3u8.
+    """
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3']
     for profile in profiles:
-        resolution_dir = os.path.join(video_root, profile['resolution'])
-        os.makedirs(resolution_dir, exist_ok=True)
-        playlist_file = os.path.join(resolution_dir, f"index.m3u8")
-
-        cmd = [
-            'ffmpeg',
-            '-i', input_file,
-            '-vf', f"scale={profile['scale']}",
-            '-c:v', 'libx264',
-            '-b:v', profile['bitrate'],
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-start_number', '0',
-            '-hls_time', '5',
-            '-hls_list_size', '0',         
-            '-f', 'hls',
-            playlist_file,
-        ]
-
-        subprocess.run(cmd, check=True)
+        lines.append(build_stream_inf(profile, has_audio))
+        lines.append(f"{profile['resolution']}/index.m3u8")
+
+    content = '\n'.join(lines) + '\n'
+    get_hls_storage().write_file(video_id, MASTER_PLAYLIST, content.encode('utf-8'))
+
+
+def finalize_hls(source: str, video_id: int) -> None:
+    """
+    Fan-in job that runs once every rendition and trickplay job of a video has
+    finished or failed for good.
+
+    - Marks the video as failed (keeping the upload) if a rendition is missing.
+    - Writes the master playlist of the video's ladder for adaptive bitrate switching.
+    - Marks the video as ready.
+    - Deletes the original uploaded video file last, so a crash in between
+      never leaves an unfinished video without its source.
+    """
+    metadata = get_video_metadata(video_id)
+    if not is_fully_encoded(metadata):
+        set_video_status(video_id, 'failed')
+        return
+    write_master_playlist(video_id, metadata['renditions'], bool(metadata['audio_codec']))
+    set_video_status(video_id, 'ready', progress=100)
+    delete_origin_video_file(source)
+
+
+def is_fully_encoded(metadata: dict) -> bool:
+    """
+    Return whether every rendition of the video's ladder has been published.
+    """
+    completed = set(metadata['completed_renditions'])
+    return all(profile['resolution'] in completed for profile in metadata['renditions'])
+
+
+def backfill_encoded_videos() -> int:
+    """
+    Mark videos encoded before processing states existed as ready and return their number.
+
+    - Such videos default to 'uploaded' with an empty ladder, although their HLS
+      output exists and their upload has already been deleted.
+    - Their ladder is rebuilt from the HLS_PROFILES renditions found in the HLS storage;
+      a missing master playlist is written (the former encoder always added AAC audio).
+    - Videos whose upload is still on disk (fresh uploads waiting for their probe),
+      content-addressed videos and videos without HLS output are left alone.
+    """
+    count = 0
+    videos = Video.objects.filter(status='uploaded', renditions=[], hls_key='')
+    for video_id, video_file in videos.values_list('id', 'video_file'):
+        if video_file and os.path.isfile(os.path.join(settings.MEDIA_ROOT, video_file)):
+            continue
+        profiles = find_stored_renditions(video_id)
+        if not profiles:
+            continue
+        if not has_stored_file(video_id, MASTER_PLAYLIST):
+            write_master_playlist(video_id, profiles, has_audio=True)
+        resolutions = [profile['resolution'] for profile in profiles]
+        count += Video.objects.filter(id=video_id, status='uploaded').update(
+            status='ready', status_changed_at=timezone.now(), progress=100, renditions=profiles,
+            completed_renditions=resolutions, renditions_done=len(resolutions),
+        )
+    return count
+
+
+def find_stored_renditions(video_id: int) -> list:
+    return [profile for profile in HLS_PROFILES if has_stored_file(video_id, f"{profile['resolution']}/index.m3u8")]
+
+
+def has_stored_file(video_id: int, name: str) -> bool:
+    try:
+        get_hls_storage().stat(video_id, name)
+    except FileNotFoundError:
+        return False
+    return True
 
 
 def delete_origin_video_file(source):
     """
     Delete the original uploaded video file from disk.
-    
+
     - Checks if the file exists before removing.
     - Typically used after HLS conversion is complete.
     """
@@ -53,27 +1008,43 @@ def delete_origin_video_file(source):
         os.remove(source)
 
 
-def generate_thumbnail(input_file: str, video_id: int, timestamp: str = "00:00:10") -> None:
+def save_thumbnails(video_id: int) -> None:
     """
-    Generate a thumbnail from a video at a specific timestamp using ffmpeg.
+    Store the generated thumbnails of a video.
+
+    - Records every existing size and format in Video.thumbnails.
+    - Uses the default width as the main thumbnail unless one was uploaded.
     """
-    video = Video.objects.get(id=video_id)
+    thumbnails = []
+    for width in THUMBNAIL_WIDTHS:
+        names = {fmt: get_thumbnail_name(video_id, width, fmt) for fmt in THUMBNAIL_FORMATS}
+        if all(os.path.isfile(os.path.join(settings.MEDIA_ROOT, name)) for name in names.values()):
+            thumbnails.append({'width': width, **names})
 
-    thumbnail_dir = os.path.join(settings.MEDIA_ROOT, "thumbnail")
-    os.makedirs(thumbnail_dir, exist_ok=True)
+    videos = Video.objects.filter(id=video_id)
+    videos.update(thumbnails=thumbnails)
+    videos.filter(Q(thumbnail='') | Q(thumbnail__isnull=True)).update(
+        thumbnail=get_thumbnail_name(video_id, THUMBNAIL_DEFAULT_WIDTH, 'jpg')
+    )
+    bump_catalog_version()
 
-    thumbnail_path = os.path.join(thumbnail_dir, f"thumbnail_{video_id}.jpg")
 
+def generate_thumbnail(input_file: str, video_id: int) -> None:
+    """
+    Generate the thumbnails of a video in a standalone ffmpeg run.
+
+    - Used when a video is saved without thumbnail after its upload;
+      new uploads get their thumbnails from the transcoding pass.
+    - Picks the frame with ffmpeg's thumbnail filter instead of a fixed timestamp.
+    """
     cmd = [
-        "ffmpeg",
-        "-ss", timestamp,
-        "-i", input_file,
-        "-frames:v", "1",
-        "-vf", "scale=320:-1",
-        thumbnail_path,
+        'ffmpeg',
+        '-y',
+        *build_thread_args(),
+        '-i', input_file,
+        '-filter_complex', build_thumbnail_filter('[0:v]'),
+        *build_thumbnail_args(video_id),
     ]
 
     subprocess.run(cmd, check=True)
-
-    video.thumbnail.name = f"thumbnail/thumbnail_{video_id}.jpg"
-    video.save(update_fields=["thumbnail"])
\ No newline at end of file
+    save_thumbnails(video_id)
@@ -0,0 +1,217 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from content.models import Video
+from content.pipeline import enqueue_hls_jobs
+from content.tasks import (
+    HLS_PROFILES,
+    build_hls_command,
+    build_media_playlist,
+    convert_chunk,
+    convert_rendition,
+    get_video_root,
+    read_playlist_segments,
+    stitch_chunks,
+)
+from content.tests.utils import FakeQueue
+
+TS_PACKET_SIZE = 188
+VIDEO_STREAM_ID = 0xE0
+AUDIO_STREAM_ID = 0xC0
+FRAME_DURATION = 1 / 25
+
+
+def read_pes_timestamps(path: str) -> dict:
+    """
+    Return the presentation timestamps (seconds) of an MPEG-TS file per PES stream ID,
+    read straight from the packet headers, so no ffprobe is needed.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    timestamps = {}
+    for offset in range(0, len(data) - TS_PACKET_SIZE + 1, TS_PACKET_SIZE):
+        packet = data[offset:offset + TS_PACKET_SIZE]
+        if not packet[1] & 0x40:
+            continue
+        start = 5 + packet[4] if packet[3] & 0x20 else 4
+        pes = packet[start:]
+        if pes[:3] != b"\x00\x00\x01" or not pes[7] & 0x80:
+            continue
+        pts = (pes[9] >> 1 & 7) << 30 | pes[10] << 22 | pes[11] >> 1 << 15 | pes[12] << 7 | pes[13] >> 1
+        timestamps.setdefault(pes[3], []).append(pts / 90000)
+    return timestamps
+
+
+@override_settings(HLS_CHUNKED_ENCODING=True, HLS_CHUNK_DURATION=300)
+class ChunkedPipelineTest(SimpleTestCase):
+    """
+    Test suite for splitting long videos into chunk jobs and the chunk commands.
+    """
+    def test_long_video_is_split_into_chunks(self):
+        """
+        Test that one job per chunk is enqueued and the stitch job depends on all of them.
+        """
+        queue = FakeQueue()
+        jobs = enqueue_hls_jobs(queue, "/tmp/source.mp4", 1, HLS_PROFILES, 700)
+        chunks = queue.jobs[:-1]
+
+        self.assertEqual([job.args[2] for job in chunks], [0, 1, 2])
+        self.assertEqual(jobs, [queue.jobs[-1]])
+        self.assertEqual(jobs[0].args, (1, 3))
+        self.assertEqual(jobs[0].kwargs["depends_on"].dependencies, chunks)
+        self.assertTrue(jobs[0].kwargs["depends_on"].allow_failure)
+        self.assertNotIn("retry", jobs[0].kwargs)
+
+    def test_finished_video_is_not_chunked_again(self):
+        """
+        Test that a re-queued video whose renditions were already stitched gets
+        no chunk or stitch jobs, only its stream-copy job.
+        """
+        profiles = [*HLS_PROFILES[:2], {**HLS_PROFILES[2], "copy": True}]
+        completed = [profile["resolution"] for profile in HLS_PROFILES[:2]]
+        queue = FakeQueue()
+        jobs = enqueue_hls_jobs(queue, "/tmp/source.mp4", 1, profiles, 700, completed)
+
+        self.assertEqual([job.func for job in jobs], [convert_rendition])
+        self.assertEqual(queue.jobs, jobs)
+
+    def test_stream_copy_rendition_is_not_chunked(self):
+        """
+        Test that a stream-copy rendition is remuxed by its own job next to the stitch job.
+        """
+        profiles = [HLS_PROFILES[0], {**HLS_PROFILES[1], "copy": True}]
+        queue = FakeQueue()
+        jobs = enqueue_hls_jobs(queue, "/tmp/source.mp4", 1, profiles, 700)
+
+        self.assertEqual(jobs[1].func, convert_rendition)
+        self.assertEqual(jobs[1].args[2], profiles[1]["resolution"])
+
+    @override_settings(HLS_PARALLEL_RENDITIONS=False)
+    def test_short_video_is_not_chunked(self):
+        queue = FakeQueue()
+        enqueue_hls_jobs(queue, "/tmp/source.mp4", 1, HLS_PROFILES, 200)
+
+        self.assertEqual(len(queue.jobs), 1)
+
+    def test_chunk_command_continues_timestamps_and_numbering(self):
+        """
+        Test that a chunk seeks to its range and continues timestamps and segment numbers.
+        """
+        cmd = build_hls_command("/tmp/in.mp4", "/tmp/out", HLS_PROFILES, True, (), 300, 300)
+
+        self.assertEqual(cmd[cmd.index("-ss") + 1], "300")
+        self.assertEqual(cmd[cmd.index("-t") + 1], "300")
+        self.assertLess(cmd.index("-ss"), cmd.index("-i"))
+        self.assertEqual(cmd[cmd.index("-output_ts_offset") + 1], "301")
+        self.assertEqual(cmd[cmd.index("-start_number") + 1], "60")
+
+    def test_chunks_share_timestamp_offset(self):
+        """
+        Test that the first chunk gets the same timestamp headroom as every later one.
+        """
+        cmd = build_hls_command("/tmp/in.mp4", "/tmp/out", HLS_PROFILES, True, (), 0, 300)
+
+        self.assertEqual(cmd[cmd.index("-output_ts_offset") + 1], "1")
+
+    def test_media_playlist(self):
+        """
+        Test that the stitched playlist starts at sequence 0 and covers the longest segment.
+        """
+        playlist = build_media_playlist([("#EXTINF:5.000000,", "index0.ts"), ("#EXTINF:5.200000,", "index1.ts")])
+
+        self.assertIn("#EXT-X-TARGETDURATION:6\n#EXT-X-MEDIA-SEQUENCE:0\n", playlist)
+        self.assertTrue(playlist.endswith("index1.ts\n#EXT-X-ENDLIST\n"))
+
+
+@override_settings(HLS_CHUNKED_ENCODING=True, HLS_CHUNK_DURATION=10)
+class ChunkedEncodingTest(TestCase):
+    """
+    Test suite encoding and stitching real chunks with ffmpeg.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: temporary MEDIA_ROOT and a probed 24 second test video.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._old_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self._temp_media
+
+        self.video = Video.objects.create(
+            title="Test Video", duration=24, audio_codec="aac", renditions=HLS_PROFILES[:1]
+        )
+
+    def tearDown(self):
+        """
+        Clean up temporary media and restore original MEDIA_ROOT.
+        """
+        settings.MEDIA_ROOT = self._old_media_root
+        shutil.rmtree(self._temp_media)
+
+    def _encode_chunks(self) -> str:
+        """
+        Helper method to encode a 24 second test video in three chunks, stitch them
+        and return the directory of the stitched rendition.
+        """
+        source = os.path.join(self._temp_media, "source.mp4")
+        subprocess.run([
+            "ffmpeg", "-v", "error",
+            "-f", "lavfi", "-i", "testsrc2=size=640x360:rate=25:duration=24",
+            "-f", "lavfi", "-i", "sine=duration=24",
+            "-c:v", "libx264", "-c:a", "aac", "-shortest", source,
+        ], check=True)
+
+        for index in range(3):
+            convert_chunk(source, self.video.id, index)
+        stitch_chunks(self.video.id, 3)
+        return os.path.join(get_video_root(self.video.id), HLS_PROFILES[0]["resolution"])
+
+    @mock.patch("content.tasks.run_ffmpeg_with_progress")
+    def test_finished_renditions_are_not_chunked_again(self, run):
+        """
+        Test that a chunk job of a video whose renditions were already stitched
+        (and whose chunk directories are gone) encodes nothing.
+        """
+        Video.objects.filter(id=self.video.id).update(completed_renditions=[HLS_PROFILES[0]["resolution"]])
+
+        convert_chunk("/tmp/source.mp4", self.video.id, 0)
+
+        run.assert_not_called()
+        self.assertFalse(os.path.exists(os.path.join(get_video_root(self.video.id), ".chunks")))
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg is not installed")
+    def test_chunks_are_stitched_into_one_playlist(self):
+        """
+        Test that three chunks become one continuous playlist with globally numbered segments.
+        """
+        rendition_dir = self._encode_chunks()
+        self.video.refresh_from_db()
+
+        segments = read_playlist_segments(os.path.join(rendition_dir, "index.m3u8"))
+        self.assertEqual([uri for _, uri in segments], [f"index{n}.ts" for n in range(len(segments))])
+        self.assertEqual(sorted(os.listdir(rendition_dir)), sorted(["index.m3u8"] + [uri for _, uri in segments]))
+        self.assertEqual(sorted(os.listdir(get_video_root(self.video.id))), [HLS_PROFILES[0]["resolution"]])
+        self.assertEqual(self.video.progress, 100)
+        self.assertEqual(len(self.video.thumbnails), 3)
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg is not installed")
+    def test_timestamps_continue_across_chunks(self):
+        """
+        Test that video timestamps run on frame by frame across chunk boundaries
+        (segments 1/2 and 3/4) and audio never jumps back. An audio PES carries
+        several AAC frames, so only its order can be checked.
+        """
+        rendition_dir = self._encode_chunks()
+        segments = read_playlist_segments(os.path.join(rendition_dir, "index.m3u8"))
+        timestamps = [read_pes_timestamps(os.path.join(rendition_dir, uri)) for _, uri in segments]
+
+        for previous, current in zip(timestamps, timestamps[1:]):
+            video_step = min(current[VIDEO_STREAM_ID]) - max(previous[VIDEO_STREAM_ID])
+            audio_step = min(current[AUDIO_STREAM_ID]) - max(previous[AUDIO_STREAM_ID])
+            self.assertAlmostEqual(video_step, FRAME_DURATION, places=3)
+            self.assertGreater(audio_step, 0)
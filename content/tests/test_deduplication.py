@@ -0,0 +1,100 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from django.contrib.admin.sites import AdminSite
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from content.admin import VideoAdmin
+from content.deduplication import assign_hls_key, compute_content_hash, get_object_root, link_hls_root
+from content.models import Video
+from content.tasks import HLS_PROFILES, get_video_root
+
+CONTENT = b"identical upload" * 1000
+CONTENT_HASH = hashlib.sha256(CONTENT).hexdigest()
+
+
+class DeduplicationTest(TestCase):
+    """
+    Test suite for content-hash deduplication of uploads and the shared HLS storage.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: temporary MEDIA_ROOT and a ready video
+        whose HLS output lives in content-addressed storage.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._media_settings = override_settings(MEDIA_ROOT=self._temp_media)
+        self._media_settings.enable()
+        os.makedirs(os.path.join(self._temp_media, "videos"))
+
+        self.original = Video.objects.create(
+            title="Original",
+            status="ready",
+            duration=42,
+            renditions=HLS_PROFILES[:1],
+            content_hash=CONTENT_HASH,
+            hls_key=CONTENT_HASH,
+        )
+        link_hls_root(self.original.id, CONTENT_HASH)
+        with open(os.path.join(get_video_root(self.original.id), "master.m3u8"), "w") as file:
+            file.write("#EXTM3U\n")
+
+    def tearDown(self):
+        """
+        Clean up temporary media and restore original MEDIA_ROOT.
+        The setting is overridden (not assigned), so the file storage follows it.
+        """
+        self._media_settings.disable()
+        shutil.rmtree(self._temp_media)
+
+    def _upload_duplicate(self):
+        """
+        Helper method to save an identical upload through the admin.
+        """
+        video = Video(title="Duplicate", video_file=SimpleUploadedFile("duplicate.mp4", CONTENT))
+        VideoAdmin(Video, AdminSite()).save_model(None, video, None, False)
+        video.refresh_from_db()
+        return video
+
+    def test_content_hash_is_streamed(self):
+        upload = SimpleUploadedFile("video.mp4", CONTENT)
+
+        self.assertEqual(compute_content_hash(upload), CONTENT_HASH)
+
+    def test_processing_duplicate_gets_own_key(self):
+        """
+        Test that content still being processed is not shared with a new upload.
+        """
+        Video.objects.filter(id=self.original.id).update(status="transcoding")
+
+        self.assertNotEqual(assign_hls_key(CONTENT_HASH), CONTENT_HASH)
+        self.assertTrue(assign_hls_key(CONTENT_HASH).startswith(CONTENT_HASH))
+
+    def test_duplicate_reuses_ready_output(self):
+        """
+        Test that an identical upload is linked to the original's output, marked
+        ready with its metadata and not kept on disk.
+        """
+        video = self._upload_duplicate()
+
+        self.assertEqual(video.status, "ready")
+        self.assertEqual(video.hls_key, CONTENT_HASH)
+        self.assertEqual(video.duration, 42)
+        self.assertTrue(os.path.islink(get_video_root(video.id)))
+        self.assertTrue(os.path.isfile(os.path.join(get_video_root(video.id), "master.m3u8")))
+        self.assertFalse(os.path.exists(video.video_file.path))
+
+    def test_shared_output_is_reference_counted(self):
+        """
+        Test that the shared directory survives until its last video is deleted.
+        """
+        video = self._upload_duplicate()
+
+        self.original.delete()
+        self.assertFalse(os.path.lexists(get_video_root(self.original.id)))
+        self.assertTrue(os.path.isfile(os.path.join(get_video_root(video.id), "master.m3u8")))
+
+        video.delete()
+        self.assertFalse(os.path.exists(get_object_root(CONTENT_HASH)))
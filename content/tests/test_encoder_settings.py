@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from content.checks import check_hls_encoder, check_hls_ladder
+from content.tasks import HLS_PROFILES, build_encoder_args, build_gop_args, build_hls_command, build_stream_inf
+
+ENCODER = {
+    "preset": "veryfast",
+    "crf": None,
+    "maxrate_factor": 1.5,
+    "bufsize_factor": 2,
+    "segment_duration": 4,
+    "align_gop": True,
+}
+
+
+@override_settings(VIDEOFLIX_HLS_ENCODER=ENCODER)
+class EncoderOptionsTest(SimpleTestCase):
+    """
+    Test suite for the encoder options built from VIDEOFLIX_HLS_ENCODER.
+    """
+    def test_capped_vbr_by_default(self):
+        """
+        Test that without a crf the profile bitrate is used, capped by maxrate and bufsize.
+        """
+        args = build_encoder_args(1, HLS_PROFILES[1])
+
+        self.assertEqual(args, [
+            "-c:v:1", "libx264", "-preset:v:1", "veryfast", "-b:v:1", "2500k",
+            "-maxrate:v:1", "3750000", "-bufsize:v:1", "5000000",
+        ])
+
+    def test_profile_overrides_global_options(self):
+        """
+        Test that per-profile preset and crf override the global encoder options.
+        """
+        profile = {**HLS_PROFILES[0], "preset": "slow", "crf": 23}
+        args = build_encoder_args(0, profile)
+
+        self.assertIn("slow", args)
+        self.assertIn("-crf:v:0", args)
+        self.assertNotIn("-b:v:0", args)
+
+    def test_gop_aligned_to_segment_duration(self):
+        """
+        Test that keyframes are forced at the segment duration, which is also the hls_time.
+        """
+        cmd = build_hls_command("/tmp/in.mp4", "/tmp/out", HLS_PROFILES, True)
+
+        self.assertIn("expr:gte(t,n_forced*4)", cmd)
+        self.assertEqual(cmd[cmd.index("-sc_threshold") + 1], "0")
+        self.assertEqual(cmd[cmd.index("-hls_time") + 1], "4")
+
+    def test_gop_alignment_can_be_disabled(self):
+        """
+        Test that no keyframe options are added when align_gop is off.
+        """
+        with override_settings(VIDEOFLIX_HLS_ENCODER={**ENCODER, "align_gop": False}):
+            self.assertEqual(build_gop_args(), [])
+
+    def test_stream_inf_reports_peak_and_average(self):
+        """
+        Test that BANDWIDTH is the capped peak rate and AVERAGE-BANDWIDTH the target rate.
+        """
+        tag = build_stream_inf(HLS_PROFILES[0], False)
+
+        self.assertIn("BANDWIDTH=1500000,AVERAGE-BANDWIDTH=1000000,", tag)
+
+    @override_settings(HLS_FFMPEG_THREADS=4)
+    def test_threads_are_capped_per_job(self):
+        """
+        Test that decoder and filter threads are capped and the encoders share the cap.
+        """
+        profiles = [HLS_PROFILES[0], HLS_PROFILES[1], {**HLS_PROFILES[2], "copy": True}]
+        cmd = build_hls_command("/tmp/in.mp4", "/tmp/out", profiles, True)
+
+        self.assertEqual(cmd[1:5], ["-threads", "4", "-filter_complex_threads", "4"])
+        self.assertEqual(cmd[cmd.index("-threads:v:0") + 1], "2")
+        self.assertNotIn("-threads:v:2", cmd)
+
+
+class EncoderSettingsCheckTest(SimpleTestCase):
+    """
+    Test suite for the system checks validating the ladder and encoder settings.
+    """
+    def test_default_settings_pass(self):
+        """
+        Test that the shipped defaults produce no errors.
+        """
+        self.assertEqual(check_hls_ladder(None), [])
+        self.assertEqual(check_hls_encoder(None), [])
+
+    def test_empty_ladder_rejected(self):
+        with override_settings(VIDEOFLIX_HLS_LADDER=[]):
+            self.assertEqual([error.id for error in check_hls_ladder(None)], ["content.E001"])
+
+    def test_invalid_profile_rejected(self):
+        """
+        Test that missing keys, odd sizes and bad bitrates are reported per profile.
+        """
+        ladder = [
+            {"resolution": "480p", "width": 851, "height": 480, "bitrate": "fast", "codecs": "avc1.64001f"},
+            {"resolution": "720p", "width": 1280},
+        ]
+        with override_settings(VIDEOFLIX_HLS_LADDER=ladder):
+            ids = [error.id for error in check_hls_ladder(None)]
+
+        self.assertEqual(ids, ["content.E004", "content.E005", "content.E002"])
+
+    def test_unordered_ladder_rejected(self):
+        with override_settings(VIDEOFLIX_HLS_LADDER=list(reversed(settings.VIDEOFLIX_HLS_LADDER))):
+            self.assertEqual([error.id for error in check_hls_ladder(None)], ["content.E007"])
+
+    def test_invalid_encoder_rejected(self):
+        """
+        Test that an unknown preset, an out-of-range crf and a zero segment duration are reported.
+        """
+        encoder = {**ENCODER, "preset": "turbo", "crf": 60, "segment_duration": 0}
+        with override_settings(VIDEOFLIX_HLS_ENCODER=encoder):
+            ids = sorted(error.id for error in check_hls_encoder(None))
+
+        self.assertEqual(ids, ["content.E008", "content.E009", "content.E010"])
+
@@ -0,0 +1,108 @@
+from django.test import SimpleTestCase, override_settings
+
+from content.pipeline import enqueue_hls_pipeline, get_encoding_queue_name
+from content.tasks import (
+    HLS_PROFILES,
+    convert_rendition,
+    convert_to_hls,
+    finalize_hls,
+    generate_trickplay,
+)
+from content.tests.utils import FakeQueue
+
+
+class HLSPipelineTest(SimpleTestCase):
+    """
+    Test suite for the HLS job pipeline (fan-out encoding and fan-in finalization).
+    """
+    def setUp(self):
+        """
+        Prepare fresh fake queues for every test; encoding jobs land on 'transcode'.
+        """
+        self.queues = {name: FakeQueue() for name in ("high", "thumbnails", "transcode_high", "transcode")}
+        self.queue = self.queues["transcode"]
+
+    @override_settings(HLS_PARALLEL_RENDITIONS=False, HLS_TRICKPLAY=False)
+    def test_single_pass_pipeline(self):
+        """
+        Test that a single encoding job is enqueued and finalize depends on it.
+        """
+        final_job = enqueue_hls_pipeline(self.queues, "/tmp/source.mp4", 1)
+
+        self.assertEqual(len(self.queue.jobs), 1)
+        self.assertEqual(self.queue.jobs[0].func, convert_to_hls)
+        self.assertEqual(self.queues["high"].jobs, [final_job])
+        self.assertEqual(final_job.func, finalize_hls)
+        self.assertEqual(final_job.kwargs["depends_on"].dependencies, [self.queue.jobs[0]])
+
+    @override_settings(HLS_PARALLEL_RENDITIONS=False, HLS_TRICKPLAY=True)
+    def test_trickplay_stage_runs_next_to_encoding(self):
+        """
+        Test that the trickplay job is enqueued on the encoding queue beside
+        the encoding job, not on the quick thumbnails queue, and finalize waits for both.
+        """
+        final_job = enqueue_hls_pipeline(self.queues, "/tmp/source.mp4", 1)
+
+        self.assertEqual([job.func for job in self.queue.jobs], [convert_to_hls, generate_trickplay])
+        self.assertEqual(self.queues["thumbnails"].jobs, [])
+        self.assertEqual(final_job.kwargs["depends_on"].dependencies, self.queue.jobs)
+
+    @override_settings(HLS_PARALLEL_RENDITIONS=False, HLS_TRICKPLAY=True)
+    def test_finalize_runs_after_failed_trickplay(self):
+        """
+        Test that a failed trickplay job cannot block the fan-in job:
+        its dependency allows failures.
+        """
+        final_job = enqueue_hls_pipeline(self.queues, "/tmp/source.mp4", 1)
+
+        self.assertTrue(final_job.kwargs["depends_on"].allow_failure)
+
+    @override_settings(HLS_PARALLEL_RENDITIONS=True, HLS_TRICKPLAY=False)
+    def test_parallel_pipeline_fans_out_per_profile(self):
+        """
+        Test that one job per profile is enqueued and finalize depends on all of them.
+        """
+        final_job = enqueue_hls_pipeline(self.queues, "/tmp/source.mp4", 1)
+        rendition_jobs = self.queue.jobs
+
+        self.assertEqual(len(rendition_jobs), len(HLS_PROFILES))
+        self.assertTrue(all(job.func == convert_rendition for job in rendition_jobs))
+        self.assertEqual(
+            [job.args[2] for job in rendition_jobs],
+            [profile["resolution"] for profile in HLS_PROFILES],
+        )
+        self.assertEqual(final_job.kwargs["depends_on"].dependencies, rendition_jobs)
+
+    @override_settings(HLS_PARALLEL_RENDITIONS=True, HLS_TRICKPLAY=False)
+    def test_parallel_pipeline_follows_ladder(self):
+        """
+        Test that only the renditions of the video's ladder are enqueued.
+        """
+        enqueue_hls_pipeline(self.queues, "/tmp/source.mp4", 1, HLS_PROFILES[:1])
+
+        self.assertEqual(len(self.queue.jobs), 1)
+        self.assertEqual(self.queue.jobs[0].args[2], HLS_PROFILES[0]["resolution"])
+
+    @override_settings(HLS_PARALLEL_RENDITIONS=False, HLS_TRICKPLAY=False)
+    def test_encoding_queue_can_be_chosen(self):
+        """
+        Test that the encoding jobs go to the queue picked for the upload.
+        """
+        final_job = enqueue_hls_pipeline(self.queues, "/tmp/source.mp4", 1, encoding_queue="transcode_high")
+
+        self.assertEqual([job.func for job in self.queues["transcode_high"].jobs], [convert_to_hls])
+        self.assertEqual(self.queues["high"].jobs, [final_job])
+        self.assertEqual(self.queue.jobs, [])
+
+    @override_settings(HLS_HIGH_PRIORITY_MAX_SIZE=100, HLS_HIGH_PRIORITY_MAX_DURATION=300)
+    def test_encoding_priority_by_size_and_duration(self):
+        """
+        Test that only small and short uploads are routed to the priority encoding queue,
+        and no encode ever lands on the quick 'high' queue.
+        """
+        megabyte = 1024 * 1024
+
+        self.assertEqual(get_encoding_queue_name(50 * megabyte, 120), "transcode_high")
+        self.assertEqual(get_encoding_queue_name(50 * megabyte), "transcode_high")
+        self.assertEqual(get_encoding_queue_name(500 * megabyte, 120), "transcode")
+        self.assertEqual(get_encoding_queue_name(50 * megabyte, 3600), "transcode")
@@ -0,0 +1,200 @@
+import os
+import shutil
+import tempfile
+import unittest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.models import Video
+from content.storage import HLSStorage, LocalHLSStorage, build_hls_storage, get_hls_storage
+from content.tasks import HLS_PROFILES, write_master_playlist
+
+try:
+    import boto3
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+
+User = get_user_model()
+BUCKET = "videoflix-hls"
+
+
+def write_local_rendition(root: str, segment_size: int = 16) -> str:
+    """
+    Helper function to create a finished local rendition: two segments and their playlist.
+    """
+    os.makedirs(root)
+    for name in ("index0.ts", "index1.ts"):
+        with open(os.path.join(root, name), "wb") as file:
+            file.write(b"\x47" * segment_size)
+    with open(os.path.join(root, "index.m3u8"), "w") as file:
+        file.write("#EXTM3U\nindex0.ts\nindex1.ts\n")
+    return root
+
+
+class LocalHLSStorageTest(SimpleTestCase):
+    """
+    Test suite for the HLS storage on the local filesystem.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: temporary MEDIA_ROOT and a local storage.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._old_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self._temp_media
+        self.storage = LocalHLSStorage()
+
+    def tearDown(self):
+        """
+        Clean up temporary media and restore original MEDIA_ROOT.
+        """
+        settings.MEDIA_ROOT = self._old_media_root
+        shutil.rmtree(self._temp_media)
+
+    def test_rendition_replaces_previous_output(self):
+        """
+        Test that a rendition is moved into place and replaces an older one completely.
+        """
+        os.makedirs(self.storage.local_path(1, "720p"))
+        open(self.storage.local_path(1, "720p/stale.ts"), "wb").close()
+        staging = write_local_rendition(os.path.join(self._temp_media, "staging"))
+
+        self.storage.write_rendition(1, staging, "720p")
+
+        self.assertEqual(sorted(os.listdir(self.storage.local_path(1, "720p"))), ["index.m3u8", "index0.ts", "index1.ts"])
+        self.assertFalse(os.path.exists(staging))
+
+    def test_file_roundtrip_and_delete(self):
+        self.storage.write_file(1, "master.m3u8", b"#EXTM3U\n")
+
+        with self.storage.open(1, "master.m3u8") as file:
+            self.assertEqual(file.read(), b"#EXTM3U\n")
+        self.assertEqual(self.storage.stat(1, "master.m3u8").st_size, 8)
+
+        self.storage.delete_tree(1)
+        with self.assertRaises(FileNotFoundError):
+            self.storage.stat(1, "master.m3u8")
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """
+        Test that a backend missing part of the interface fails when it is built,
+        not on the first upload.
+        """
+        class PartialStorage(HLSStorage):
+            def write_file(self, video_id, name, content):
+                pass
+
+        with self.assertRaises(TypeError):
+            PartialStorage()
+
+
+@unittest.skipUnless(mock_aws, "boto3 and moto are not installed")
+@override_settings(
+    HLS_STORAGE_BACKEND="s3",
+    HLS_S3_BUCKET=BUCKET,
+    HLS_S3_ENDPOINT_URL="",
+    HLS_S3_REGION="us-east-1",
+    HLS_S3_PREFIX="hls/",
+    HLS_S3_MULTIPART_THRESHOLD=5,
+)
+class S3HLSStorageTest(APITestCase):
+    """
+    Test suite for the S3-compatible HLS storage against a mocked S3 (moto).
+    Covers uploads, reads, deletion and the redirecting HLS views.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: mocked S3 bucket, temporary MEDIA_ROOT as
+        scratch space, test user and video, and authenticate the test client.
+        """
+        self._mock = mock_aws()
+        self._mock.start()
+        build_hls_storage.cache_clear()
+        self.s3 = boto3.client("s3", region_name="us-east-1")
+        self.s3.create_bucket(Bucket=BUCKET)
+
+        self._temp_media = tempfile.mkdtemp()
+        self._old_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self._temp_media
+
+        self.user = User.objects.create_user(username="testuser", password="secret")
+        self.video = Video.objects.create(title="Test Video")
+        self.client.force_authenticate(user=self.user)
+        self.storage = get_hls_storage()
+
+    def tearDown(self):
+        """
+        Stop the S3 mock, clean up temporary media and restore original MEDIA_ROOT.
+        """
+        build_hls_storage.cache_clear()
+        self._mock.stop()
+        settings.MEDIA_ROOT = self._old_media_root
+        shutil.rmtree(self._temp_media)
+
+    def _upload_rendition(self, segment_size: int = 16):
+        """
+        Helper method to upload a rendition of the sample video through the storage.
+        """
+        staging = write_local_rendition(os.path.join(self._temp_media, "staging"), segment_size)
+        self.storage.write_rendition(self.video.id, staging, "720p")
+
+    def test_rendition_is_uploaded_with_content_types(self):
+        """
+        Test that every file lands under the prefixed video key with its content type
+        and the local staging copy is removed.
+        """
+        self._upload_rendition()
+
+        prefix = f"hls/videos/{self.video.id}/720p/"
+        keys = [item["Key"] for item in self.s3.list_objects_v2(Bucket=BUCKET)["Contents"]]
+        self.assertEqual(sorted(keys), [prefix + name for name in ("index.m3u8", "index0.ts", "index1.ts")])
+        self.assertEqual(self.s3.head_object(Bucket=BUCKET, Key=prefix + "index0.ts")["ContentType"], "video/MP2T")
+        self.assertFalse(os.path.exists(os.path.join(self._temp_media, "staging")))
+
+    def test_large_segment_is_uploaded_in_parts(self):
+        self._upload_rendition(segment_size=6 * 1024 * 1024)
+
+        head = self.s3.head_object(Bucket=BUCKET, Key=f"hls/videos/{self.video.id}/720p/index0.ts")
+        self.assertTrue(head["ETag"].strip('"').endswith("-2"))
+
+    def test_delete_tree_removes_every_object(self):
+        self._upload_rendition()
+        write_master_playlist(self.video.id, HLS_PROFILES[:1], has_audio=False)
+
+        self.storage.delete_tree(self.video.id)
+
+        self.assertNotIn("Contents", self.s3.list_objects_v2(Bucket=BUCKET))
+        with self.assertRaises(FileNotFoundError):
+            self.storage.stat(self.video.id, "master.m3u8")
+
+    def test_playlist_is_read_from_bucket(self):
+        """
+        Test that playlists are served by the API with their validators.
+        """
+        self._upload_rendition()
+        url = reverse("video-playlist", kwargs={"movie_id": self.video.id, "resolution": "720p"})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"#EXTM3U\nindex0.ts\nindex1.ts\n")
+        self.assertIn("ETag", response)
+
+    def test_segment_redirects_to_presigned_url(self):
+        """
+        Test that segment bytes are not proxied but redirected to a presigned URL.
+        """
+        self._upload_rendition()
+        url = reverse("video-segment", kwargs={"movie_id": self.video.id, "resolution": "720p", "segment": "index0.ts"})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertIn(f"/hls/videos/{self.video.id}/720p/index0.ts?", response["Location"])
+        self.assertIn("Signature", response["Location"])
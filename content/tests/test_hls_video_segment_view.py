@@ -3,9 +3,11 @@ import shutil
 import tempfile
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
 from content.models import Video
 
@@ -111,4 +113,96 @@ class HLSVideoSegmentViewTest(APITestCase):
         )
 
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(HLS_SEGMENT_OFFLOAD="nginx", HLS_ACCEL_REDIRECT_PREFIX="/protected-media/")
+    def test_get_segment_nginx_offload(self):
+        """
+        Test that nginx offload returns an empty response with an X-Accel-Redirect
+        header pointing to the internal media location.
+        """
+        self._create_segment()
+
+        url = reverse(
+            "video-segment",
+            kwargs={
+                "movie_id": self.video.id,
+                "resolution": "720p",
+                "segment": "segment1.ts",
+            },
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            f"/protected-media/videos/{self.video.id}/720p/segment1.ts"
+        )
+        self.assertEqual(response.content, b"")
+
+    @override_settings(HLS_SEGMENT_OFFLOAD="sendfile")
+    def test_get_segment_sendfile_offload(self):
+        """
+        Test that sendfile offload returns the absolute segment path in X-Sendfile.
+        """
+        self._create_segment()
+
+        url = reverse(
+            "video-segment",
+            kwargs={
+                "movie_id": self.video.id,
+                "resolution": "720p",
+                "segment": "segment1.ts",
+            },
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response["X-Sendfile"],
+            os.path.join(settings.MEDIA_ROOT, "videos", str(self.video.id), "720p", "segment1.ts")
+        )
+
+    def test_get_segment_without_database_queries(self):
+        """
+        Test that once the video existence is cached, serving a segment with the
+        access token cookie players send needs no database query at all.
+        """
+        self._create_segment()
+        self.client.force_authenticate(user=None)
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+
+        url = reverse(
+            "video-segment",
+            kwargs={
+                "movie_id": self.video.id,
+                "resolution": "720p",
+                "segment": "segment1.ts",
+            },
+        )
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_segment_after_video_deleted(self):
+        """
+        Test that deleting a video invalidates the cached existence check.
+        """
+        self._create_segment()
+
+        url = reverse(
+            "video-segment",
+            kwargs={
+                "movie_id": self.video.id,
+                "resolution": "720p",
+                "segment": "segment1.ts",
+            },
+        )
+        self.client.get(url)
+        self.video.delete()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,156 @@
+import os
+import shutil
+import tempfile
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.api.ranges import MAX_RANGES
+from content.models import Video
+
+
+User = get_user_model()
+
+SEGMENT_DATA = b"0123456789abcdefghij"
+
+
+class SegmentRangeRequestTest(APITestCase):
+    """
+    Test suite for HTTP Range support in HLSVideoSegmentView.
+    Covers single ranges, suffix ranges, multiple ranges and unsatisfiable ranges.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: temporary MEDIA_ROOT with a known segment,
+        test user and video, and authenticate the test client.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._old_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self._temp_media
+
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="secret"
+        )
+
+        self.video = Video.objects.create(
+            title="Test Video"
+        )
+
+        self.client.force_authenticate(user=self.user)
+        self._create_segment()
+        self.url = reverse(
+            "video-segment",
+            kwargs={
+                "movie_id": self.video.id,
+                "resolution": "720p",
+                "segment": "segment1.ts",
+            },
+        )
+
+    def tearDown(self):
+        """
+        Clean up temporary media and restore original MEDIA_ROOT.
+        """
+        settings.MEDIA_ROOT = self._old_media_root
+        shutil.rmtree(self._temp_media)
+
+    def _create_segment(self):
+        """
+        Helper method to create a segment file with known content.
+        """
+        base_path = os.path.join(settings.MEDIA_ROOT, "videos", str(self.video.id), "720p")
+        os.makedirs(base_path, exist_ok=True)
+        with open(os.path.join(base_path, "segment1.ts"), "wb") as f:
+            f.write(SEGMENT_DATA)
+
+    def _body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_full_segment_advertises_ranges(self):
+        """
+        Test that a request without Range returns the whole file and Accept-Ranges.
+        """
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(self._body(response), SEGMENT_DATA)
+
+    def test_single_range(self):
+        """
+        Test that a single range returns 206 with only the requested bytes.
+        """
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], "bytes 2-5/20")
+        self.assertEqual(response["Content-Length"], "4")
+        self.assertEqual(self._body(response), b"2345")
+
+    def test_open_and_suffix_ranges(self):
+        """
+        Test open-ended (bytes=15-) and suffix (bytes=-3) ranges.
+        """
+        open_ended = self.client.get(self.url, HTTP_RANGE="bytes=15-")
+        suffix = self.client.get(self.url, HTTP_RANGE="bytes=-3")
+
+        self.assertEqual(self._body(open_ended), b"fghij")
+        self.assertEqual(suffix["Content-Range"], "bytes 17-19/20")
+        self.assertEqual(self._body(suffix), b"hij")
+
+    def test_multiple_ranges(self):
+        """
+        Test that multiple ranges return a multipart/byteranges body
+        with a correct Content-Length.
+        """
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-1,10-12")
+        body = self._body(response)
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertTrue(response["Content-Type"].startswith("multipart/byteranges; boundary="))
+        self.assertEqual(int(response["Content-Length"]), len(body))
+        self.assertIn(b"Content-Range: bytes 0-1/20\r\n\r\n01\r\n", body)
+        self.assertIn(b"Content-Range: bytes 10-12/20\r\n\r\nabc\r\n", body)
+
+    def test_overlapping_ranges_are_merged(self):
+        """
+        Test that overlapping and adjacent ranges are coalesced into one range,
+        so no byte is sent twice.
+        """
+        response = self.client.get(self.url, HTTP_RANGE="bytes=4-6,0-3,2-5")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], "bytes 0-6/20")
+        self.assertEqual(self._body(response), b"0123456")
+
+    def test_too_many_ranges_return_full_file(self):
+        """
+        Test that a header with more than MAX_RANGES ranges is ignored
+        and the full file is returned.
+        """
+        header = "bytes=" + ",".join("0-0" for _ in range(MAX_RANGES + 1))
+        response = self.client.get(self.url, HTTP_RANGE=header)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._body(response), SEGMENT_DATA)
+
+    def test_unsatisfiable_range(self):
+        """
+        Test that a range beyond the end of the file returns 416.
+        """
+        response = self.client.get(self.url, HTTP_RANGE="bytes=50-60")
+
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], "bytes */20")
+
+    def test_malformed_range_is_ignored(self):
+        """
+        Test that a malformed Range header falls back to the full file.
+        """
+        response = self.client.get(self.url, HTTP_RANGE="items=0-1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._body(response), SEGMENT_DATA)
@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+from urllib.parse import parse_qs
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.api.signing import sign_segment_scope
+from content.models import Video
+
+
+User = get_user_model()
+
+MANIFEST = "#EXTM3U\n#EXT-X-TARGETDURATION:5\n#EXTINF:5.0,\nindex0.ts\n#EXT-X-ENDLIST\n"
+
+
+@override_settings(HLS_SIGNED_SEGMENTS=True)
+class SignedSegmentURLTest(APITestCase):
+    """
+    Test suite for signed segment URLs: manifest rewriting in VideoPlaylistView
+    and signature checks in HLSVideoSegmentView.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: temporary MEDIA_ROOT with a manifest and a segment,
+        test user and video, and authenticate the test client.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._old_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self._temp_media
+
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="secret"
+        )
+
+        self.video = Video.objects.create(
+            title="Test Video"
+        )
+
+        self._create_files()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        """
+        Clean up temporary media and restore original MEDIA_ROOT.
+        """
+        settings.MEDIA_ROOT = self._old_media_root
+        shutil.rmtree(self._temp_media)
+
+    def _create_files(self):
+        """
+        Helper method to write a fake manifest and segment for 720p.
+        """
+        base_path = os.path.join(settings.MEDIA_ROOT, "videos", str(self.video.id), "720p")
+        os.makedirs(base_path)
+        with open(os.path.join(base_path, "index.m3u8"), "w", encoding="utf-8") as f:
+            f.write(MANIFEST)
+        with open(os.path.join(base_path, "index0.ts"), "wb") as f:
+            f.write(b"fake ts data")
+
+    def _get_signed_query(self):
+        """
+        Helper method to fetch the playlist and return the signed query of the segment.
+        """
+        url = reverse("video-playlist", kwargs={"movie_id": self.video.id, "resolution": "720p"})
+        content = self.client.get(url).content.decode()
+        segment_line = next(line for line in content.splitlines() if line.startswith("index0.ts"))
+        return {key: value[0] for key, value in parse_qs(segment_line.split("?", 1)[1]).items()}
+
+    def _segment_url(self, resolution="720p"):
+        return reverse(
+            "video-segment",
+            kwargs={"movie_id": self.video.id, "resolution": resolution, "segment": "index0.ts"},
+        )
+
+    def test_playlist_contains_signed_segment_urls(self):
+        """
+        Test that segment URIs are rewritten with uid, exp and sig parameters.
+        """
+        query = self._get_signed_query()
+
+        self.assertEqual(query["uid"], str(self.user.id))
+        self.assertIn("exp", query)
+        self.assertIn("sig", query)
+
+    def test_signed_segment_without_cookie(self):
+        """
+        Test that a valid signature grants access without any other authentication
+        and without database queries.
+        """
+        query = self._get_signed_query()
+        self.client.force_authenticate(user=None)
+        self.client.get(self._segment_url(), query)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self._segment_url(), query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_tampered_signature_is_rejected(self):
+        """
+        Test that a modified signature is rejected with 401 Unauthorized.
+        """
+        query = self._get_signed_query()
+        query["sig"] = "0" * len(query["sig"])
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self._segment_url(), query)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_signature_is_scoped_to_resolution(self):
+        """
+        Test that a signature for 720p cannot be used for another resolution.
+        """
+        query = self._get_signed_query()
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self._segment_url("1080p"), query)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_signature_is_rejected(self):
+        """
+        Test that a correctly signed but expired URL is rejected.
+        """
+        expires = 1000
+        query = {
+            "uid": self.user.id,
+            "exp": expires,
+            "sig": sign_segment_scope(self.user.id, self.video.id, "720p", expires),
+        }
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self._segment_url(), query)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,212 @@
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+
+from content.tasks import (
+    HLS_PROFILES,
+    apply_stream_copy,
+    build_hls_command,
+    build_ladder,
+    get_stream,
+    has_segment_keyframes,
+    is_stream_copy_compliant,
+    parse_probe_output,
+)
+
+
+FFPROBE_OUTPUT = {
+    "streams": [
+        {
+            "codec_type": "video",
+            "codec_name": "h264",
+            "profile": "High",
+            "level": 31,
+            "pix_fmt": "yuv420p",
+            "width": 1280,
+            "height": 720,
+            "avg_frame_rate": "30000/1001",
+            "bit_rate": "2800000",
+        },
+        {"codec_type": "audio", "codec_name": "aac"},
+    ],
+    "format": {"duration": "12.345000"},
+}
+ROTATED_PHONE_STREAM = {
+    "codec_type": "video",
+    "codec_name": "h264",
+    "profile": "High",
+    "level": 40,
+    "pix_fmt": "yuv420p",
+    "width": 1920,
+    "height": 1080,
+    "avg_frame_rate": "30/1",
+    "bit_rate": "5000000",
+    "side_data_list": [{"side_data_type": "Display Matrix", "rotation": -90}],
+}
+ALIGNED_KEYFRAMES = [0.0, 2.502, 5.005, 7.508, 10.01]
+
+
+class SourceProbingTest(SimpleTestCase):
+    """
+    Test suite for ffprobe parsing and the adaptive rendition ladder.
+    """
+    def test_parse_probe_output(self):
+        """
+        Test that duration, dimensions, frame rate and codecs are extracted.
+        """
+        metadata = parse_probe_output(FFPROBE_OUTPUT)
+
+        self.assertEqual(metadata, {
+            "duration": 12.345,
+            "width": 1280,
+            "height": 720,
+            "fps": 29.97,
+            "video_codec": "h264",
+            "video_bitrate": 2800000,
+            "audio_codec": "aac",
+        })
+
+    def test_parse_probe_output_without_audio_or_video(self):
+        """
+        Test that a missing audio stream is allowed but a missing video stream is not.
+        """
+        video_only = {"streams": FFPROBE_OUTPUT["streams"][:1], "format": {}}
+
+        self.assertEqual(parse_probe_output(video_only)["audio_codec"], "")
+        self.assertIsNone(parse_probe_output(video_only)["duration"])
+        with self.assertRaises(ValueError):
+            parse_probe_output({"streams": FFPROBE_OUTPUT["streams"][1:]})
+
+    def test_rotated_source_is_probed_as_portrait(self):
+        """
+        Test that a 1920x1080 phone video rotated by 90 degrees (display matrix
+        or legacy 'rotate' tag) gets a portrait size and ladder.
+        """
+        legacy_tag = {**ROTATED_PHONE_STREAM, "side_data_list": [], "tags": {"rotate": "90"}}
+
+        for stream in (ROTATED_PHONE_STREAM, legacy_tag):
+            metadata = parse_probe_output({"streams": [stream], "format": {}})
+            self.assertEqual((metadata["width"], metadata["height"]), (1080, 1920))
+        ladder = build_ladder(1080, 1920)
+        self.assertTrue(all(profile["height"] > profile["width"] for profile in ladder))
+
+    @override_settings(HLS_STREAM_COPY=True)
+    def test_rotated_source_is_never_stream_copied(self):
+        """
+        Test that a rotated source is re-encoded even if it matches a rendition,
+        as the rotation would be lost in the MPEG-TS output.
+        """
+        profile = HLS_PROFILES[2]
+        upright = {**ROTATED_PHONE_STREAM, "side_data_list": []}
+
+        self.assertTrue(is_stream_copy_compliant(upright, 5000000, profile))
+        self.assertFalse(is_stream_copy_compliant(ROTATED_PHONE_STREAM, 5000000, profile))
+
+    def test_ladder_skips_renditions_above_source(self):
+        """
+        Test that a 480p source is not upscaled to 720p or 1080p.
+        """
+        ladder = build_ladder(854, 480)
+
+        self.assertEqual([profile["resolution"] for profile in ladder], ["480p"])
+        self.assertEqual((ladder[0]["width"], ladder[0]["height"]), (850, 478))
+
+    def test_ladder_keeps_aspect_ratio(self):
+        """
+        Test that a 2.4:1 source is scaled into each box without distortion.
+        """
+        ladder = build_ladder(1920, 800)
+
+        self.assertEqual(
+            [(profile["width"], profile["height"]) for profile in ladder],
+            [(850, 354), (1280, 534), (1920, 800)],
+        )
+        self.assertEqual(ladder[2]["bitrate"], HLS_PROFILES[2]["bitrate"])
+
+    def test_ladder_for_small_source(self):
+        """
+        Test that a source below the smallest profile gets one rendition at its own size.
+        """
+        ladder = build_ladder(640, 360)
+
+        self.assertEqual(len(ladder), 1)
+        self.assertEqual(ladder[0]["resolution"], "360p")
+        self.assertEqual((ladder[0]["width"], ladder[0]["height"]), (640, 360))
+
+    @override_settings(HLS_STREAM_COPY=True)
+    @mock.patch("content.tasks.probe_keyframe_times", return_value=ALIGNED_KEYFRAMES)
+    def test_compliant_source_is_stream_copied(self, probe):
+        """
+        Test that a compliant 720p H.264 source is remuxed as the 720p rendition
+        with its own bitrate and codecs, while 480p is still encoded.
+        """
+        ladder = apply_stream_copy(
+            build_ladder(1280, 720), get_stream(FFPROBE_OUTPUT, "video"), 2800000, "/tmp/source.mp4", 12.345
+        )
+
+        self.assertNotIn("copy", ladder[0])
+        self.assertEqual(ladder[1]["copy"], True)
+        self.assertEqual(ladder[1]["codecs"], "avc1.64001f")
+        self.assertEqual(ladder[1]["bitrate"], "2800000")
+
+        cmd = " ".join(build_hls_command("/tmp/source.mp4", "/tmp/out", ladder, True))
+        self.assertIn("-map 0:v:0 -c:v:1 copy", cmd)
+        self.assertIn("-c:v:0 libx264", cmd)
+        self.assertIn("split=1[v0]", cmd)
+
+    @override_settings(HLS_STREAM_COPY=True)
+    @mock.patch("content.tasks.probe_keyframe_times", return_value=ALIGNED_KEYFRAMES)
+    def test_non_compliant_sources_are_encoded(self, probe):
+        """
+        Test that a high-bitrate or 10-bit source is re-encoded without probing its keyframes.
+        """
+        stream = get_stream(FFPROBE_OUTPUT, "video")
+        high_bitrate = apply_stream_copy(build_ladder(1280, 720), stream, 12000000, "/tmp/source.mp4")
+        ten_bit = apply_stream_copy(
+            build_ladder(1280, 720), {**stream, "pix_fmt": "yuv420p10le"}, 2800000, "/tmp/source.mp4"
+        )
+
+        self.assertNotIn("copy", high_bitrate[-1])
+        self.assertNotIn("copy", ten_bit[-1])
+        probe.assert_not_called()
+
+    @override_settings(HLS_STREAM_COPY=True, VIDEOFLIX_HLS_ENCODER={"segment_duration": 5})
+    @mock.patch("content.tasks.probe_keyframe_times", return_value=[0.0, 10.01])
+    def test_long_gop_source_is_encoded(self, probe):
+        """
+        Test that a source with a 10 s keyframe interval is re-encoded, as its
+        copied segments would be 10 s long.
+        """
+        ladder = apply_stream_copy(
+            build_ladder(1280, 720), get_stream(FFPROBE_OUTPUT, "video"), 2800000, "/tmp/source.mp4", 60
+        )
+
+        self.assertNotIn("copy", ladder[-1])
+        self.assertEqual(probe.call_args.args, ("/tmp/source.mp4", 16))
+
+    @override_settings(VIDEOFLIX_HLS_ENCODER={"segment_duration": 5})
+    def test_keyframe_interval_must_divide_segment_duration(self):
+        """
+        Test that keyframe intervals of 1, 2.5 and 5 s fit 5 s segments, while
+        2 and 10 s do not, and that short sources only need their own boundaries.
+        """
+        def every(interval, until=15):
+            return [index * interval for index in range(int(until / interval) + 1)]
+
+        for interval in (1, 2.5, 5):
+            self.assertTrue(has_segment_keyframes(every(interval), 15, 25), interval)
+        for interval in (2, 10):
+            self.assertFalse(has_segment_keyframes(every(interval), 15, 25), interval)
+        self.assertTrue(has_segment_keyframes([1.4, 6.4], 8, 25))
+        self.assertFalse(has_segment_keyframes([], 8, 25))
+
+    @override_settings(HLS_STREAM_COPY=True)
+    @mock.patch("content.tasks.probe_keyframe_times", return_value=ALIGNED_KEYFRAMES)
+    def test_copy_only_command_has_no_filter_graph(self, probe):
+        """
+        Test that a single stream-copy rendition needs no decoding at all.
+        """
+        stream = {**get_stream(FFPROBE_OUTPUT, "video"), "width": 640, "height": 360}
+        ladder = apply_stream_copy(build_ladder(640, 360), stream, 800000, "/tmp/source.mp4")
+
+        cmd = build_hls_command("/tmp/source.mp4", "/tmp/out", ladder, True)
+        self.assertNotIn("-filter_complex", cmd)
@@ -0,0 +1,109 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from django.conf import settings
+from django.test import TestCase
+
+from content.models import Video
+from content.tasks import (
+    HLS_PROFILES,
+    THUMBNAIL_OUTPUTS,
+    build_hls_command,
+    build_thumbnail_args,
+    generate_thumbnail,
+    get_thumbnail_name,
+    save_thumbnails,
+)
+
+
+class ThumbnailPipelineTest(TestCase):
+    """
+    Test suite for the multi-size thumbnail pipeline.
+    Covers the shared decode pass, stored thumbnail sizes and short clips.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: temporary MEDIA_ROOT and a test video.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._old_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self._temp_media
+
+        self.video = Video.objects.create(
+            title="Test Video"
+        )
+
+    def tearDown(self):
+        """
+        Clean up temporary media and restore original MEDIA_ROOT.
+        """
+        settings.MEDIA_ROOT = self._old_media_root
+        shutil.rmtree(self._temp_media)
+
+    def _create_thumbnails(self):
+        """
+        Helper method to write empty files for every thumbnail size and format.
+        """
+        build_thumbnail_args(self.video.id)
+        for width, fmt in THUMBNAIL_OUTPUTS:
+            name = get_thumbnail_name(self.video.id, width, fmt)
+            open(os.path.join(settings.MEDIA_ROOT, name), "wb").close()
+
+    def test_hls_command_extracts_thumbnails_in_same_pass(self):
+        """
+        Test that the thumbnail outputs share the single decode of the HLS command.
+        """
+        cmd = build_hls_command(
+            "/tmp/source.mp4", "/tmp/out", HLS_PROFILES, True, build_thumbnail_args(self.video.id)
+        )
+        filter_graph = cmd[cmd.index("-filter_complex") + 1]
+
+        self.assertEqual(cmd.count("-i"), 1)
+        self.assertIn(f"split={len(HLS_PROFILES) + 1}", filter_graph)
+        self.assertIn("thumbnail=", filter_graph)
+        self.assertEqual(cmd.count("-frames:v"), len(THUMBNAIL_OUTPUTS))
+
+    def test_save_thumbnails(self):
+        """
+        Test that all sizes are recorded and the default size becomes the main thumbnail.
+        """
+        self._create_thumbnails()
+
+        save_thumbnails(self.video.id)
+        self.video.refresh_from_db()
+
+        self.assertEqual([thumbnail["width"] for thumbnail in self.video.thumbnails], [160, 320, 640])
+        self.assertEqual(self.video.thumbnails[0]["webp"], f"thumbnail/{self.video.id}/160.webp")
+        self.assertEqual(self.video.thumbnail.name, f"thumbnail/{self.video.id}/320.jpg")
+
+    def test_uploaded_thumbnail_is_kept(self):
+        """
+        Test that an uploaded thumbnail is not replaced by a generated one.
+        """
+        Video.objects.filter(id=self.video.id).update(thumbnail="thumbnail/custom.jpg")
+        self._create_thumbnails()
+
+        save_thumbnails(self.video.id)
+        self.video.refresh_from_db()
+
+        self.assertEqual(self.video.thumbnail.name, "thumbnail/custom.jpg")
+        self.assertEqual(len(self.video.thumbnails), 3)
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg is not installed")
+    def test_generate_thumbnail_for_short_clip(self):
+        """
+        Test that a clip shorter than 10 seconds still gets every thumbnail.
+        """
+        source = os.path.join(self._temp_media, "short.mp4")
+        subprocess.run(
+            ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "testsrc=duration=2:size=640x360:rate=25", source],
+            check=True,
+        )
+
+        generate_thumbnail(source, self.video.id)
+        self.video.refresh_from_db()
+
+        self.assertEqual(len(self.video.thumbnails), 3)
+        self.assertTrue(os.path.isfile(os.path.join(settings.MEDIA_ROOT, self.video.thumbnail.name)))
@@ -0,0 +1,231 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from content.models import Video
+from content.pipeline import build_retry, find_stalled_videos, requeue_video, start_hls_pipeline
+from content.tasks import (
+    HLS_PROFILES,
+    MASTER_PLAYLIST,
+    backfill_encoded_videos,
+    convert_rendition,
+    convert_to_hls,
+    finalize_hls,
+    get_staging_root,
+    get_video_root,
+)
+from content.tests.utils import FakeQueue
+
+
+def fake_ffmpeg(cmd, reporter):
+    """
+    Stand-in for run_ffmpeg_with_progress that writes a playlist per output stream.
+    """
+    output = cmd[cmd.index("-hls_segment_filename") + 1]
+    for entry in cmd[cmd.index("-var_stream_map") + 1].split():
+        resolution = entry.split("name:")[1]
+        with open(output.replace("%v", resolution).replace("%d.ts", ".m3u8"), "w") as file:
+            file.write("#EXTM3U\n")
+
+
+def failing_ffmpeg(cmd, reporter):
+    fake_ffmpeg(cmd, reporter)
+    raise subprocess.CalledProcessError(1, cmd)
+
+
+class TranscodingRecoveryTest(TestCase):
+    """
+    Test suite for idempotent, resumable transcoding and stalled video recovery.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: temporary MEDIA_ROOT and a probed test video.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._media_settings = override_settings(MEDIA_ROOT=self._temp_media)
+        self._media_settings.enable()
+
+        self.video = Video.objects.create(title="Test Video", renditions=HLS_PROFILES, duration=10)
+
+    def tearDown(self):
+        """
+        Clean up temporary media and restore original MEDIA_ROOT.
+        The setting is overridden (not assigned), so the file storage follows it.
+        """
+        self._media_settings.disable()
+        shutil.rmtree(self._temp_media)
+
+    def _playlist(self, resolution):
+        return os.path.join(get_video_root(self.video.id), resolution, "index.m3u8")
+
+    @mock.patch("content.tasks.run_ffmpeg_with_progress", side_effect=fake_ffmpeg)
+    def test_renditions_are_moved_into_place_and_recorded(self, run):
+        """
+        Test that every rendition is renamed out of the staging directory and recorded.
+        """
+        convert_rendition("/tmp/source.mp4", self.video.id, "720p")
+        self.video.refresh_from_db()
+
+        self.assertTrue(os.path.isfile(self._playlist("720p")))
+        self.assertEqual(os.listdir(get_video_root(self.video.id)), ["720p"])
+        self.assertEqual(self.video.completed_renditions, ["720p"])
+        self.assertEqual(self.video.progress, 33)
+
+    @mock.patch("content.tasks.run_ffmpeg_with_progress", side_effect=fake_ffmpeg)
+    def test_finished_renditions_are_skipped(self, run):
+        """
+        Test that a retried job only encodes the renditions that are still missing,
+        and finished renditions are counted once.
+        """
+        Video.objects.filter(id=self.video.id).update(completed_renditions=["480p"])
+
+        convert_to_hls("/tmp/source.mp4", self.video.id)
+        convert_rendition("/tmp/source.mp4", self.video.id, "720p")
+        self.video.refresh_from_db()
+
+        cmd = run.call_args_list[0].args[0]
+        self.assertEqual(run.call_count, 1)
+        self.assertIn("v:0,name:720p v:1,name:1080p", cmd)
+        self.assertEqual(self.video.completed_renditions, ["480p", "720p", "1080p"])
+        self.assertEqual(self.video.progress, 100)
+
+    @mock.patch("content.tasks.get_current_job")
+    @mock.patch("content.tasks.run_ffmpeg_with_progress", side_effect=failing_ffmpeg)
+    def test_failure_cleans_up_and_waits_for_retries(self, run, get_current_job):
+        """
+        Test that partial output is removed and the video is only marked as failed
+        once RQ has no retry left.
+        """
+        get_current_job.return_value = mock.Mock(retries_left=2)
+        with self.assertRaises(subprocess.CalledProcessError):
+            convert_rendition("/tmp/source.mp4", self.video.id, "720p")
+        self.video.refresh_from_db()
+
+        self.assertEqual(os.listdir(get_video_root(self.video.id)), [])
+        self.assertEqual(self.video.status, "transcoding")
+
+        get_current_job.return_value = mock.Mock(retries_left=0)
+        with self.assertRaises(subprocess.CalledProcessError):
+            convert_rendition("/tmp/source.mp4", self.video.id, "720p")
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.status, "failed")
+
+    def test_finalize_requires_every_rendition(self):
+        """
+        Test that the fan-in job, which also runs after failed dependencies,
+        marks an incompletely encoded video as failed and keeps its upload.
+        """
+        source = os.path.join(settings.MEDIA_ROOT, "source.mp4")
+        open(source, "wb").close()
+        Video.objects.filter(id=self.video.id).update(completed_renditions=["480p", "720p"])
+
+        finalize_hls(source, self.video.id)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.status, "failed")
+        self.assertTrue(os.path.isfile(source))
+
+        Video.objects.filter(id=self.video.id).update(completed_renditions=["480p", "720p", "1080p"])
+        finalize_hls(source, self.video.id)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.status, "ready")
+        self.assertFalse(os.path.isfile(source))
+
+    def test_retry_backs_off_exponentially(self):
+        """
+        Test that retry intervals double from HLS_RETRY_INTERVAL and retries can be disabled.
+        """
+        with self.settings(HLS_JOB_RETRIES=3, HLS_RETRY_INTERVAL=10):
+            self.assertEqual(build_retry().intervals, [10, 20, 40])
+        with self.settings(HLS_JOB_RETRIES=0):
+            self.assertIsNone(build_retry())
+
+    def test_stalled_videos_are_requeued(self):
+        """
+        Test that only videos stuck in processing with their upload still on disk
+        are found, and that they are reset and enqueued again.
+        """
+        source = "videos/source.mp4"
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, "videos"))
+        open(os.path.join(settings.MEDIA_ROOT, source), "wb").close()
+        stale = timezone.now() - timedelta(hours=2)
+        fresh = Video.objects.create(title="Fresh", status="transcoding")
+        gone = Video.objects.create(title="Gone")
+        Video.objects.filter(id__in=[self.video.id, fresh.id]).update(video_file=source)
+        Video.objects.filter(id__in=[self.video.id, gone.id]).update(status_changed_at=stale)
+        Video.objects.filter(id=self.video.id).update(status="transcoding")
+        Video.objects.filter(id=gone.id).update(video_file="videos/missing.mp4")
+
+        stalled = find_stalled_videos(60)
+        queue = FakeQueue()
+        requeue_video(queue, stalled[0])
+        self.video.refresh_from_db()
+
+        self.assertEqual([video.id for video in stalled], [self.video.id])
+        self.assertEqual(self.video.status, "uploaded")
+        self.assertEqual(queue.jobs[0].func, start_hls_pipeline)
+        self.assertEqual(self.video.pipeline_job_id, queue.jobs[0].id)
+
+    @mock.patch("content.pipeline.Job.fetch")
+    def test_queued_videos_are_not_requeued(self, fetch):
+        """
+        Test that a video whose pipeline job is still waiting in the queue is not
+        taken for stalled, while one whose job finished or expired is.
+        """
+        source = "videos/source.mp4"
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, "videos"))
+        open(os.path.join(settings.MEDIA_ROOT, source), "wb").close()
+        stale = timezone.now() - timedelta(hours=2)
+        Video.objects.filter(id=self.video.id).update(
+            video_file=source, status_changed_at=stale, pipeline_job_id="job-1"
+        )
+
+        fetch.return_value = mock.Mock(get_status=mock.Mock(return_value="queued"))
+        self.assertEqual(find_stalled_videos(60), [])
+
+        fetch.return_value = mock.Mock(get_status=mock.Mock(return_value="finished"))
+        self.assertEqual([video.id for video in find_stalled_videos(60)], [self.video.id])
+
+    @mock.patch("content.tasks.get_current_job")
+    def test_staging_directory_is_unique_per_job(self, get_current_job):
+        """
+        Test that two jobs of one video never share (and wipe) a staging directory.
+        """
+        get_current_job.return_value = mock.Mock(id="job-1")
+        first = get_staging_root(self.video.id, "all")
+        get_current_job.return_value = mock.Mock(id="job-2")
+
+        self.assertNotEqual(first, get_staging_root(self.video.id, "all"))
+        self.assertTrue(first.endswith(".staging-all-job-1"))
+
+    def test_previously_encoded_videos_are_marked_ready(self):
+        """
+        Test that a video encoded before processing states existed is marked ready
+        with the renditions found on disk, while a fresh upload is left alone.
+        """
+        legacy = Video.objects.create(title="Legacy", video_file="videos/deleted.mp4")
+        fresh = Video.objects.create(title="Fresh", video_file="videos/fresh.mp4")
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, "videos"))
+        open(os.path.join(settings.MEDIA_ROOT, "videos/fresh.mp4"), "wb").close()
+        for video in (legacy, fresh):
+            for profile in HLS_PROFILES[:2]:
+                rendition_dir = os.path.join(get_video_root(video.id), profile["resolution"])
+                os.makedirs(rendition_dir)
+                open(os.path.join(rendition_dir, "index.m3u8"), "w").close()
+
+        self.assertEqual(backfill_encoded_videos(), 1)
+        legacy.refresh_from_db()
+        fresh.refresh_from_db()
+
+        self.assertEqual(legacy.status, "ready")
+        self.assertEqual(legacy.renditions, HLS_PROFILES[:2])
+        self.assertEqual(legacy.completed_renditions, [profile["resolution"] for profile in HLS_PROFILES[:2]])
+        self.assertEqual(legacy.progress, 100)
+        self.assertTrue(os.path.isfile(os.path.join(get_video_root(legacy.id), MASTER_PLAYLIST)))
+        self.assertEqual(fresh.status, "uploaded")
+        self.assertEqual(backfill_encoded_videos(), 0)
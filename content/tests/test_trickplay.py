@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.models import Video
+from content.tasks import build_trickplay_vtt, format_vtt_timestamp
+
+
+User = get_user_model()
+
+
+@override_settings(HLS_TRICKPLAY_INTERVAL=5)
+class TrickplayIndexBuilderTest(SimpleTestCase):
+    """
+    Test suite for the WebVTT index mapping time ranges to sprite tiles.
+    """
+    def test_vtt_timestamp(self):
+        """
+        Test that seconds are formatted as HH:MM:SS.mmm.
+        """
+        self.assertEqual(format_vtt_timestamp(3725.5), "01:02:05.500")
+
+    def test_cues_map_to_tiles(self):
+        """
+        Test that cues walk the 10x10 grid and continue on the next sheet.
+        """
+        vtt = build_trickplay_vtt(duration=503, sheets=2)
+        cues = vtt.split("\n\n")[1:]
+
+        self.assertTrue(vtt.startswith("WEBVTT\n"))
+        self.assertIn("00:00:05.000 --> 00:00:10.000\nsprite_0.jpg#xywh=160,0,160,90", cues[1])
+        self.assertIn("sprite_0.jpg#xywh=0,90,160,90", cues[10])
+        self.assertIn("00:08:20.000 --> 00:08:23.000\nsprite_1.jpg#xywh=0,0,160,90", cues[100])
+
+    def test_cues_limited_to_existing_sheets(self):
+        """
+        Test that no cue references a sprite sheet that was not written.
+        """
+        vtt = build_trickplay_vtt(duration=1000, sheets=1)
+
+        self.assertNotIn("sprite_1.jpg", vtt)
+
+
+class TrickplayViewTest(APITestCase):
+    """
+    Test suite for TrickplayIndexView and TrickplaySpriteView.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: temporary MEDIA_ROOT with an index and a sprite,
+        test user and video, and authenticate the test client.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._old_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self._temp_media
+
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="secret"
+        )
+
+        self.video = Video.objects.create(
+            title="Test Video"
+        )
+
+        self._create_files()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        """
+        Clean up temporary media and restore original MEDIA_ROOT.
+        """
+        settings.MEDIA_ROOT = self._old_media_root
+        shutil.rmtree(self._temp_media)
+
+    def _create_files(self):
+        """
+        Helper method to write a fake trickplay index and sprite sheet.
+        """
+        base_path = os.path.join(settings.MEDIA_ROOT, "videos", str(self.video.id), "trickplay")
+        os.makedirs(base_path)
+        with open(os.path.join(base_path, "thumbnails.vtt"), "w", encoding="utf-8") as f:
+            f.write(build_trickplay_vtt(duration=10, sheets=1))
+        with open(os.path.join(base_path, "sprite_0.jpg"), "wb") as f:
+            f.write(b"fake jpeg data")
+
+    def _sprite_url(self, sprite):
+        return reverse("video-trickplay-sprite", kwargs={"movie_id": self.video.id, "sprite": sprite})
+
+    def test_get_trickplay_index(self):
+        """
+        Test that the WebVTT index is served and revalidated via ETag.
+        """
+        url = reverse("video-trickplay-index", kwargs={"movie_id": self.video.id})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/vtt")
+        self.assertTrue(response.content.startswith(b"WEBVTT"))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_sprite(self):
+        """
+        Test that a sprite sheet is served as a cacheable JPEG.
+        """
+        response = self.client.get(self._sprite_url("sprite_0.jpg"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("max-age", response["Cache-Control"])
+        self.assertEqual(b"".join(response.streaming_content), b"fake jpeg data")
+
+    def test_other_file_names_are_rejected(self):
+        """
+        Test that only sprite_<n>.jpg names are served from the trickplay directory.
+        """
+        other_path = os.path.join(settings.MEDIA_ROOT, "videos", str(self.video.id), "trickplay", "other.jpg")
+        open(other_path, "wb").close()
+
+        response = self.client.get(self._sprite_url("other.jpg"))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_trickplay_unauthenticated(self):
+        """
+        Test that an unauthenticated user cannot access the sprites.
+        Expects response status 401 Unauthorized.
+        """
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self._sprite_url("sprite_0.jpg"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,66 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.models import Video
+
+
+User = get_user_model()
+
+class VideoCategoryListViewTest(APITestCase):
+    """
+    Test suite for VideoCategoryListView returning the newest videos per category.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: create a test user, videos in two categories,
+        and authenticate the test client.
+        """
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="secret"
+        )
+
+        self.comedies = [
+            Video.objects.create(title=f"Comedy {day}", category="comedy", created_at=date(2024, 1, day))
+            for day in (1, 2, 3)
+        ]
+        self.action = Video.objects.create(title="Action", category="action", status="ready")
+
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("video-category-list")
+
+    def test_get_categories_newest_first(self):
+        """
+        Test that rows follow MOVIE_CATEGORY order and only contain the newest videos.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"limit": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["category"] for row in response.data], ["action", "comedy"])
+        self.assertEqual(response.data[1]["label"], "Comedy")
+        self.assertEqual(
+            [video["id"] for video in response.data[1]["videos"]],
+            [self.comedies[2].id, self.comedies[1].id]
+        )
+
+    def test_get_categories_filtered_and_projected(self):
+        """
+        Test that ?status= and ?fields= are applied to every row.
+        """
+        response = self.client.get(self.url, {"status": "ready", "fields": "id,title"})
+
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["videos"], [{"id": self.action.id, "title": "Action"}])
+
+    def test_get_categories_unauthenticated(self):
+        """
+        Test that an unauthenticated user cannot access the category rows.
+        """
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
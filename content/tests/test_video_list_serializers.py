@@ -0,0 +1,65 @@
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from content.api.serializers import VideoListSerializer, VideoListValuesSerializer
+from content.models import Video
+
+
+class VideoListValuesSerializerTest(TestCase):
+    """
+    Test suite for VideoListValuesSerializer to ensure it renders exactly
+    the same output as VideoListSerializer.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: one video with files and one without,
+        and a request to build absolute URLs against.
+        """
+        Video.objects.create(
+            title="With Files",
+            description="Has a thumbnail",
+            video_file="videos/clip one.mp4",
+            thumbnail="thumbnail/clip.jpg",
+            thumbnails=[
+                {"width": 320, "jpg": "thumbnail/1/320.jpg", "webp": "thumbnail/1/320.webp"},
+                {"width": 160, "jpg": "thumbnail/1/160.jpg", "webp": "thumbnail/1/160.webp"},
+            ],
+        )
+        Video.objects.create(title="Without Files")
+        self.request = APIRequestFactory().get("/api/video/")
+
+    def _render_both(self, fields=None, model_fields=None):
+        """
+        Helper method to serialize the catalog with both serializers.
+        """
+        queryset = Video.objects.order_by("id")
+        context = {"request": self.request}
+        expected = VideoListSerializer(queryset, many=True, fields=fields, context=context).data
+        rows = VideoListValuesSerializer.get_values(queryset, model_fields)
+        actual = VideoListValuesSerializer(rows, fields=fields, context=context).data
+        return expected, actual
+
+    def test_output_matches_model_serializer(self):
+        """
+        Test that all fields, including absolute file URLs and missing files, match.
+        """
+        expected, actual = self._render_both()
+
+        self.assertEqual([dict(item) for item in expected], actual)
+        self.assertEqual(actual[0]["thumbnail_url"], "http://testserver/media/thumbnail/clip.jpg")
+        self.assertEqual(actual[0]["thumbnails"][0], {
+            "width": 160,
+            "jpg": "http://testserver/media/thumbnail/1/160.jpg",
+            "webp": "http://testserver/media/thumbnail/1/160.webp",
+        })
+        self.assertEqual(actual[1]["thumbnails"], [])
+
+    def test_projection_matches_model_serializer(self):
+        """
+        Test that a field projection renders the same subset in both serializers.
+        """
+        fields, model_fields = VideoListSerializer.get_projection("id,title,thumbnail_url")
+        expected, actual = self._render_both(fields, model_fields)
+
+        self.assertEqual([dict(item) for item in expected], actual)
+        self.assertEqual(set(actual[0]), {"id", "title", "thumbnail_url"})
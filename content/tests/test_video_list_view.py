@@ -0,0 +1,165 @@
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.models import Video
+
+
+User = get_user_model()
+
+class VideoListViewTest(APITestCase):
+    """
+    Test suite for VideoListView to ensure proper listing of videos.
+    Covers authenticated and unauthenticated access scenarios.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: create a test user, a sample video,
+        and authenticate the test client.
+        """
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="secret"
+        )
+
+        self.video = Video.objects.create(
+            title="Test Video"
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+    def test_get_video_list_authenticated(self):
+        """
+        Test that an authenticated user can retrieve the list of videos.
+        Checks response status 200 and that the returned video matches the test video.
+        """
+        url = reverse("video-list")
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.video.id)
+        self.assertIsNone(response.data["next"])
+
+    def test_get_video_list_unauthenticated(self):
+        """
+        Test that an unauthenticated user cannot access the video list.
+        Expects response status 401 Unauthorized.
+        """
+        self.client.force_authenticate(user=None)
+
+        url = reverse("video-list")
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_video_list_filtered_by_status(self):
+        """
+        Test that ?status=ready only returns videos whose HLS output is ready.
+        """
+        ready_video = Video.objects.create(title="Ready Video", status="ready")
+
+        url = reverse("video-list")
+        response = self.client.get(url, {"status": "ready"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([video["id"] for video in results], [ready_video.id])
+        self.assertEqual(results[0]["status"], "ready")
+
+    def test_get_video_list_invalid_status(self):
+        """
+        Test that an unknown status filter is rejected with 400 Bad Request.
+        """
+        url = reverse("video-list")
+        response = self.client.get(url, {"status": "unknown"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_video_list_cursor_pagination(self):
+        """
+        Test that pages follow (created_at, id) newest first and that following
+        the next cursors returns every video exactly once.
+        """
+        for day in (1, 2, 2, 3):
+            Video.objects.create(title=f"Video {day}", created_at=date(2024, 1, day))
+        expected = list(
+            Video.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        url = reverse("video-list")
+        seen = []
+        response = self.client.get(url, {"page_size": 2})
+        while True:
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen += [video["id"] for video in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(seen, expected)
+
+    def test_get_video_list_invalid_cursor(self):
+        """
+        Test that a malformed cursor returns 404 Not Found.
+        """
+        url = reverse("video-list")
+        response = self.client.get(url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_video_list_field_projection(self):
+        """
+        Test that ?fields= only returns the requested fields and rejects unknown ones.
+        """
+        url = reverse("video-list")
+        response = self.client.get(url, {"fields": "id,title,thumbnail_url"})
+        invalid = self.client.get(url, {"fields": "id,secret"})
+
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "title", "thumbnail_url"}
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(VIDEO_LIST_PAGINATION=False)
+    def test_get_video_list_unpaginated(self):
+        """
+        Test that the previous unpaginated list shape is returned when pagination is disabled.
+        """
+        url = reverse("video-list")
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["id"], self.video.id)
+
+    def test_get_video_list_not_modified(self):
+        """
+        Test that revalidating with the returned ETag yields 304 Not Modified
+        while the catalog is unchanged.
+        """
+        url = reverse("video-list")
+        response = self.client.get(url)
+
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_video_list_invalidated_on_change(self):
+        """
+        Test that saving or deleting a video changes the ETag and refreshes the cached list.
+        """
+        url = reverse("video-list")
+        first = self.client.get(url)
+
+        new_video = Video.objects.create(title="New Video")
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data["results"][0]["id"], new_video.id)
+
+        new_video.delete()
+        third = self.client.get(url, HTTP_IF_NONE_MATCH=second["ETag"])
+        self.assertEqual(len(third.data["results"]), 1)
@@ -0,0 +1,95 @@
+import os
+import shutil
+import tempfile
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.models import Video
+from content.tasks import HLS_PROFILES, write_master_playlist
+
+
+User = get_user_model()
+
+class VideoMasterPlaylistViewTest(APITestCase):
+    """
+    Test suite for VideoMasterPlaylistView and the master playlist generation.
+    Covers playlist content, caching headers and missing file scenarios.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: create temporary MEDIA_ROOT, test user, sample video,
+        and authenticate the test client.
+        """
+        self._temp_media = tempfile.mkdtemp()
+        self._old_media_root = settings.MEDIA_ROOT
+        settings.MEDIA_ROOT = self._temp_media
+
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="secret"
+        )
+
+        self.video = Video.objects.create(
+            title="Test Video"
+        )
+
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse(
+            "video-master-playlist",
+            kwargs={"movie_id": self.video.id},
+        )
+
+    def tearDown(self):
+        """
+        Restore original MEDIA_ROOT and remove temporary files.
+        """
+        settings.MEDIA_ROOT = self._old_media_root
+        shutil.rmtree(self._temp_media)
+
+    def _create_master_playlist(self):
+        """
+        Helper method to write the master playlist for the sample video.
+        """
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, "videos", str(self.video.id)))
+        write_master_playlist(self.video.id, HLS_PROFILES, has_audio=True)
+
+    def test_get_master_playlist_success(self):
+        """
+        Test that the master playlist lists every resolution with its stream attributes
+        and is served with private caching headers.
+        """
+        self._create_master_playlist()
+
+        response = self.client.get(self.url)
+        content = response.content.decode()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/vnd.apple.mpegurl")
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+        self.assertIn(
+            '#EXT-X-STREAM-INF:BANDWIDTH=3878000,AVERAGE-BANDWIDTH=2628000,'
+            'RESOLUTION=1280x720,CODECS="avc1.64001f,mp4a.40.2"',
+            content,
+        )
+        for profile in HLS_PROFILES:
+            self.assertIn(f"{profile['resolution']}/index.m3u8", content)
+
+    def test_get_master_playlist_file_not_found(self):
+        """
+        Test that requesting a master playlist that was not generated returns 404 Not Found.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_master_playlist_unauthenticated(self):
+        """
+        Test that an unauthenticated user cannot access the master playlist.
+        """
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -112,4 +112,54 @@ class VideoPlaylistViewTest(APITestCase):
         )
 
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_playlist_not_modified(self):
+        """
+        Test that a playlist is served with ETag and Last-Modified validators
+        and that revalidating with If-None-Match returns 304 Not Modified.
+        """
+        self._create_manifest()
+
+        url = reverse(
+            "video-playlist",
+            kwargs={
+                "movie_id": self.video.id,
+                "resolution": "720p",
+            },
+        )
+
+        response = self.client.get(url)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        revalidated = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    def test_get_playlist_changed_after_rewrite(self):
+        """
+        Test that rewriting a manifest bypasses the cached copy and changes the ETag.
+        """
+        self._create_manifest()
+
+        url = reverse(
+            "video-playlist",
+            kwargs={
+                "movie_id": self.video.id,
+                "resolution": "720p",
+            },
+        )
+        first = self.client.get(url)
+
+        manifest_path = os.path.join(
+            settings.MEDIA_ROOT, "videos", str(self.video.id), "720p", "index.m3u8"
+        )
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            f.write("#EXTM3U\n#EXT-X-ENDLIST")
+        os.utime(manifest_path, ns=(0, os.stat(manifest_path).st_mtime_ns + 10**9))
+
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertIn("#EXT-X-ENDLIST", second.content.decode())
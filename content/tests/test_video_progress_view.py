@@ -0,0 +1,113 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.models import Video
+from content.progress import ProgressReporter
+
+
+User = get_user_model()
+
+FFMPEG_PROGRESS_BLOCK = [
+    "frame=250\n",
+    "fps=49.8\n",
+    "out_time_us=5000000\n",
+    "speed=1.66x\n",
+]
+
+
+class VideoProgressViewTest(APITestCase):
+    """
+    Test suite for VideoProgressView and the ffmpeg progress parsing.
+    Covers live progress from the cache, missing videos and authentication.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: create a test user and a transcoding video,
+        clear the cache and authenticate the test client.
+        """
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="secret"
+        )
+
+        self.video = Video.objects.create(
+            title="Test Video",
+            status="transcoding"
+        )
+
+        self.client.force_authenticate(user=self.user)
+
+    def _feed_progress(self, label, state):
+        """
+        Helper method to feed one ffmpeg progress block into a reporter.
+        """
+        reporter = ProgressReporter(self.video.id, label, duration=20.0)
+        for line in FFMPEG_PROGRESS_BLOCK + [f"progress={state}\n"]:
+            reporter.feed(line)
+
+    def test_get_progress_running_job(self):
+        """
+        Test that the live percent, fps and speed of a running job are returned.
+        """
+        self._feed_progress("720p", "continue")
+
+        url = reverse("video-progress", kwargs={"movie_id": self.video.id})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "transcoding")
+        job = response.data["jobs"]["720p"]
+        self.assertEqual(job["percent"], 25.0)
+        self.assertEqual(job["fps"], 49.8)
+        self.assertEqual(job["speed"], 1.66)
+        self.assertFalse(job["finished"])
+
+    def test_get_progress_finished_job(self):
+        """
+        Test that a finished job reports 100 percent.
+        """
+        self._feed_progress("all", "end")
+
+        url = reverse("video-progress", kwargs={"movie_id": self.video.id})
+        response = self.client.get(url)
+
+        self.assertEqual(response.data["jobs"]["all"]["percent"], 100.0)
+        self.assertTrue(response.data["jobs"]["all"]["finished"])
+
+    @override_settings(HLS_CHUNKED_ENCODING=True, HLS_CHUNK_DURATION=300)
+    def test_get_progress_chunk_jobs(self):
+        """
+        Test that the chunk jobs of the chunked mode are reported by their label.
+        """
+        Video.objects.filter(id=self.video.id).update(duration=700)
+        self._feed_progress("chunk-2", "continue")
+
+        url = reverse("video-progress", kwargs={"movie_id": self.video.id})
+        response = self.client.get(url)
+
+        self.assertEqual(list(response.data["jobs"]), ["chunk-2"])
+
+    def test_get_progress_video_not_found(self):
+        """
+        Test that polling a non-existent video returns 404 Not Found.
+        """
+        url = reverse("video-progress", kwargs={"movie_id": 9999})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_progress_unauthenticated(self):
+        """
+        Test that an unauthenticated user cannot poll the progress.
+        """
+        self.client.force_authenticate(user=None)
+
+        url = reverse("video-progress", kwargs={"movie_id": self.video.id})
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
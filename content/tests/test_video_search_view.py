@@ -0,0 +1,116 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from content.models import Video
+
+
+User = get_user_model()
+
+
+class VideoSearchViewTest(APITestCase):
+    """
+    Test suite for VideoSearchView.
+    Covers prefix matching, ranking, pagination and invalid input.
+    """
+    def setUp(self):
+        """
+        Prepare test environment: create a test user, videos matching by title
+        and by description, and authenticate the test client.
+        """
+        self.user = User.objects.create_user(
+            username="testuser",
+            password="secret"
+        )
+
+        self.title_match = Video.objects.create(
+            title="Mountain Adventure",
+            description="A long hike"
+        )
+        self.description_match = Video.objects.create(
+            title="Weekend Trip",
+            description="An adventure in the city"
+        )
+        Video.objects.create(
+            title="Cooking Show",
+            description="Pasta and pizza"
+        )
+
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("video-search")
+
+    def test_prefix_search_ranks_title_first(self):
+        """
+        Test that an incomplete word matches and title matches rank above description matches.
+        """
+        response = self.client.get(self.url, {"q": "adven"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [video["id"] for video in response.data["results"]]
+        self.assertEqual(ids, [self.title_match.id, self.description_match.id])
+
+    def test_all_words_must_match(self):
+        """
+        Test that multiple words narrow the result down and punctuation is ignored.
+        """
+        response = self.client.get(self.url, {"q": "adventure & cit!"})
+
+        ids = [video["id"] for video in response.data["results"]]
+        self.assertEqual(ids, [self.description_match.id])
+
+    def test_search_is_paginated(self):
+        """
+        Test that ?page_size= limits the page and the next link continues by offset.
+        """
+        response = self.client.get(self.url, {"q": "adventure", "page_size": 1})
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIn("offset=1", response.data["next"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["id"], self.description_match.id)
+        self.assertIsNone(response.data["next"])
+
+    def test_search_reflects_updated_title(self):
+        """
+        Test that the search document is refreshed when a video is saved.
+        """
+        self.description_match.title = "Jungle Safari"
+        self.description_match.save()
+
+        response = self.client.get(self.url, {"q": "jungle"})
+        self.assertEqual(response.data["results"][0]["id"], self.description_match.id)
+
+    def test_backfill_makes_bulk_created_videos_searchable(self):
+        """
+        Test that videos written without post_save are found once the search documents are backfilled.
+        """
+        video = Video.objects.bulk_create([Video(title="Desert Expedition", description="Sand")])[0]
+
+        response = self.client.get(self.url, {"q": "desert"})
+        self.assertEqual(response.data["results"], [])
+
+        call_command("backfill_search_vectors", stdout=StringIO())
+        response = self.client.get(self.url, {"q": "desert"})
+        self.assertEqual([result["id"] for result in response.data["results"]], [video.id])
+
+    def test_empty_query(self):
+        """
+        Test that a query without searchable words returns 400 Bad Request.
+        """
+        response = self.client.get(self.url, {"q": " !? "})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_unauthenticated(self):
+        """
+        Test that an unauthenticated user cannot search.
+        Expects response status 401 Unauthorized.
+        """
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url, {"q": "adventure"})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
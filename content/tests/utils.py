@@ -0,0 +1,29 @@
+import uuid
+
+
+class FakeJob(str):
+    """
+    Job recorded by FakeQueue. It is its own job ID, so it can be passed to
+    depends_on and rq's Dependency like a real job.
+    """
+    def __new__(cls, func, args: tuple, kwargs: dict):
+        job = super().__new__(cls, uuid.uuid4().hex)
+        job.func, job.args, job.kwargs = func, args, kwargs
+        return job
+
+    @property
+    def id(self) -> str:
+        return str(self)
+
+
+class FakeQueue:
+    """
+    Minimal stand-in for an RQ queue that records every enqueued job.
+    """
+    def __init__(self):
+        self.jobs = []
+
+    def enqueue(self, func, *args, **kwargs):
+        job = FakeJob(func, args, kwargs)
+        self.jobs.append(job)
+        return job
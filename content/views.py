@@ -1,3 +1,21 @@
-from django.shortcuts import render
+import mimetypes
+import os
+from django.utils._os import safe_join
+from django.views.static import serve
 
-# Create your views here.
+from content.api.ranges import build_file_response
+
+
+def serve_media(request, path, document_root=None, show_indexes=False):
+    """
+    Serve MEDIA_ROOT files in development with HTTP Range support,
+    so uploaded source videos can be seeked without downloading them again.
+    Falls back to Django's static serve view for regular requests.
+    """
+    range_header = request.headers.get("Range")
+    full_path = safe_join(document_root, path)
+    if not range_header or not os.path.isfile(full_path):
+        return serve(request, path, document_root, show_indexes)
+
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    return build_file_response(full_path, content_type, range_header)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 from datetime import timedelta
 from pathlib import Path
+import json
 import os
 from dotenv import load_dotenv
 
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'django_rq',
     'rest_framework',
@@ -113,15 +115,73 @@ CACHES = {
     }
 }
 
+RQ_CONNECTION = {
+    'HOST': os.environ.get("REDIS_HOST", default="redis"),
+    'PORT': os.environ.get("REDIS_PORT", default=6379),
+    'DB': os.environ.get("REDIS_DB", default=0),
+}
+
 RQ_QUEUES = {
-    'default': {
-        'HOST': os.environ.get("REDIS_HOST", default="redis"),
-        'PORT': os.environ.get("REDIS_PORT", default=6379),
-        'DB': os.environ.get("REDIS_DB", default=0),
-        'DEFAULT_TIMEOUT': 900,
-    },
+    'default': {**RQ_CONNECTION, 'DEFAULT_TIMEOUT': 900},
+    'high': {**RQ_CONNECTION, 'DEFAULT_TIMEOUT': 900},
+    'thumbnails': {**RQ_CONNECTION, 'DEFAULT_TIMEOUT': 900},
+    'transcode_high': {**RQ_CONNECTION, 'DEFAULT_TIMEOUT': int(os.environ.get("TRANSCODE_JOB_TIMEOUT", 6 * 60 * 60))},
+    'transcode': {**RQ_CONNECTION, 'DEFAULT_TIMEOUT': int(os.environ.get("TRANSCODE_JOB_TIMEOUT", 6 * 60 * 60))},
+}
+
+VIDEO_LIST_PAGINATION = os.environ.get("VIDEO_LIST_PAGINATION", "True") == "True"
+VIDEO_LIST_FAST_SERIALIZER = os.environ.get("VIDEO_LIST_FAST_SERIALIZER", "True") == "True"
+VIDEO_LIST_CACHE_TIMEOUT = int(os.environ.get("VIDEO_LIST_CACHE_TIMEOUT", 10 * 60))
+VIDEO_SEARCH_CONFIG = os.environ.get("VIDEO_SEARCH_CONFIG", "english")
+
+VIDEOFLIX_HLS_LADDER = [
+    {"resolution": "480p", "width": 850, "height": 480, "bitrate": "1000k", "codecs": "avc1.64001f"},
+    {"resolution": "720p", "width": 1280, "height": 720, "bitrate": "2500k", "codecs": "avc1.64001f"},
+    {"resolution": "1080p", "width": 1920, "height": 1080, "bitrate": "5000k", "codecs": "avc1.640028"},
+]
+if os.environ.get("VIDEOFLIX_HLS_LADDER"):
+    VIDEOFLIX_HLS_LADDER = json.loads(os.environ["VIDEOFLIX_HLS_LADDER"])
+
+VIDEOFLIX_HLS_ENCODER = {
+    "preset": os.environ.get("HLS_ENCODER_PRESET", "medium"),
+    "crf": int(os.environ["HLS_ENCODER_CRF"]) if os.environ.get("HLS_ENCODER_CRF") else None,
+    "maxrate_factor": float(os.environ.get("HLS_MAXRATE_FACTOR", 1.5)),
+    "bufsize_factor": float(os.environ.get("HLS_BUFSIZE_FACTOR", 2)),
+    "segment_duration": int(os.environ.get("HLS_SEGMENT_DURATION", 5)),
+    "align_gop": os.environ.get("HLS_ALIGN_GOP", "True") == "True",
 }
 
+HLS_PARALLEL_RENDITIONS = os.environ.get("HLS_PARALLEL_RENDITIONS", "False") == "True"
+HLS_CHUNKED_ENCODING = os.environ.get("HLS_CHUNKED_ENCODING", "False") == "True"
+HLS_CHUNK_DURATION = int(os.environ.get("HLS_CHUNK_DURATION", 5 * 60))
+HLS_STREAM_COPY = os.environ.get("HLS_STREAM_COPY", "True") == "True"
+HLS_DEDUPLICATION = os.environ.get("HLS_DEDUPLICATION", "True") == "True"
+HLS_FFMPEG_THREADS = int(os.environ.get("HLS_FFMPEG_THREADS", 0))
+HLS_HIGH_PRIORITY_MAX_SIZE = int(os.environ.get("HLS_HIGH_PRIORITY_MAX_SIZE", 200))
+HLS_HIGH_PRIORITY_MAX_DURATION = int(os.environ.get("HLS_HIGH_PRIORITY_MAX_DURATION", 5 * 60))
+HLS_PROGRESS_INTERVAL = float(os.environ.get("HLS_PROGRESS_INTERVAL", 2))
+HLS_JOB_RETRIES = int(os.environ.get("HLS_JOB_RETRIES", 3))
+HLS_RETRY_INTERVAL = int(os.environ.get("HLS_RETRY_INTERVAL", 30))
+HLS_STALLED_AFTER = int(os.environ.get("HLS_STALLED_AFTER", 60))
+HLS_TRICKPLAY = os.environ.get("HLS_TRICKPLAY", "True") == "True"
+HLS_TRICKPLAY_INTERVAL = int(os.environ.get("HLS_TRICKPLAY_INTERVAL", 5))
+HLS_MANIFEST_CACHE_SIZE = int(os.environ.get("HLS_MANIFEST_CACHE_SIZE", 512))
+HLS_MANIFEST_CACHE_TIMEOUT = int(os.environ.get("HLS_MANIFEST_CACHE_TIMEOUT", 60 * 60))
+VIDEO_EXISTS_LOCAL_TTL = float(os.environ.get("VIDEO_EXISTS_LOCAL_TTL", 30))
+VIDEO_EXISTS_CACHE_TIMEOUT = int(os.environ.get("VIDEO_EXISTS_CACHE_TIMEOUT", 24 * 60 * 60))
+HLS_SIGNED_SEGMENTS = os.environ.get("HLS_SIGNED_SEGMENTS", "False") == "True"
+HLS_SIGNED_URL_TTL = int(os.environ.get("HLS_SIGNED_URL_TTL", 3 * 60 * 60))
+HLS_SEGMENT_OFFLOAD = os.environ.get("HLS_SEGMENT_OFFLOAD", "")
+HLS_ACCEL_REDIRECT_PREFIX = os.environ.get("HLS_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+HLS_STORAGE_BACKEND = os.environ.get("HLS_STORAGE_BACKEND", "local")
+HLS_S3_BUCKET = os.environ.get("HLS_S3_BUCKET", "")
+HLS_S3_ENDPOINT_URL = os.environ.get("HLS_S3_ENDPOINT_URL", "")
+HLS_S3_REGION = os.environ.get("HLS_S3_REGION", "")
+HLS_S3_PREFIX = os.environ.get("HLS_S3_PREFIX", "")
+HLS_S3_MULTIPART_THRESHOLD = int(os.environ.get("HLS_S3_MULTIPART_THRESHOLD", 8))
+HLS_S3_UPLOAD_WORKERS = int(os.environ.get("HLS_S3_UPLOAD_WORKERS", 8))
+HLS_S3_URL_TTL = int(os.environ.get("HLS_S3_URL_TTL", 60 * 60))
+
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.getenv("EMAIL_HOST")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", 587))